@@ -0,0 +1,212 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+import exportacion
+import instrumentacion
+import motor_diseno
+import optimizacion
+import resultados
+
+# Modo por lotes (línea de comandos) del diseño de aisladores LRB.
+# Lee un cuadro de aisladores (una fila por columna del edificio) desde CSV o JSONL,
+# aplica la misma lógica que "Calcular Diseño" + "Realizar Verificación" y escribe los
+# resultados con exportacion.EscritorResultados (el mismo esquema en CSV, JSONL o NPZ, que
+# exportacion.cargar_resultados lee de vuelta). Se procesa por bloques, de modo que la
+# memoria es constante sin importar el tamaño del cuadro. No importa tkinter ni matplotlib.
+
+COLUMNAS_REQUERIDAS = ("carga_ton", "desplazamiento_max_mm", "S1", "SDS", "SD1", "TL")
+COLUMNAS_OPCIONALES = {"diametro_aislador_mm": 0.0, "altura_caucho_mm": 0.0}
+
+# Con --limites: columnas adicionales con las demandas extremas y el límite de propiedades
+# que gobierna cada comprobación (claves de motor_diseno.verificar_limites con el prefijo "limites_")
+COLUMNAS_LIMITES = (
+    ("desplazamiento_total_max_limites_mm", "limites_desplazamiento_maximo"),
+    ("limite_desplazamiento", "limites_limite_desplazamiento"),
+    ("cortante_max_limites_kN", "limites_cortante_maximo"),
+    ("limite_cortante", "limites_limite_cortante"),
+    ("coef_amortiguamiento_min_limites_porc", "limites_amortiguamiento_minimo"),
+    ("limite_deformacion", "limites_limite_deformacion"),
+    ("limite_amortiguamiento", "limites_limite_amortiguamiento"),
+    ("cumple_amortiguamiento_limites", "limites_cumple_amortiguamiento"),
+    ("cumple_general_limites", "limites_cumple_general"),
+)
+
+TAMANO_BLOQUE = 4096
+
+
+def detectar_formato(ruta, formato=None):
+    if formato:
+        return formato
+    extension = os.path.splitext(ruta or "")[1].lower()
+    if extension == ".npz":
+        return "npz"
+    return "jsonl" if extension in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def leer_filas(archivo, formato):
+    # Generador de diccionarios, una fila a la vez
+    if formato == "csv":
+        yield from csv.DictReader(archivo)
+    else:
+        for linea in archivo:
+            linea = linea.strip()
+            if linea:
+                yield json.loads(linea)
+
+
+def agrupar_en_bloques(filas, tamano=TAMANO_BLOQUE):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def convertir_bloque(bloque, fila_inicial):
+    # Convierte un bloque de filas en arreglos de entrada para el motor de diseño
+    faltantes = [c for c in COLUMNAS_REQUERIDAS if c not in bloque[0]]
+    if faltantes:
+        raise ValueError(f"Faltan las columnas requeridas: {', '.join(faltantes)}")
+
+    entradas = {}
+    for columna in COLUMNAS_REQUERIDAS + tuple(COLUMNAS_OPCIONALES):
+        valores = np.empty(len(bloque))
+        for i, fila in enumerate(bloque):
+            valor = fila.get(columna)
+            if valor in (None, ""):
+                if columna not in COLUMNAS_OPCIONALES:
+                    raise ValueError(f"Fila {fila_inicial + i}: falta el valor de '{columna}'")
+                valor = COLUMNAS_OPCIONALES[columna]
+            try:
+                valores[i] = float(valor)
+            except (TypeError, ValueError):
+                raise ValueError(f"Fila {fila_inicial + i}: valor no numérico en '{columna}': {valor!r}")
+        entradas[columna] = valores
+    return entradas
+
+
+def expandir(resultado, inverso):
+    # Lleva un diccionario de resultados de las filas únicas a todas las filas del bloque
+    return {clave: np.asarray(valores)[inverso] if np.ndim(valores) else valores
+            for clave, valores in resultado.items()}
+
+
+def procesar_bloque(entradas, optimizar=False, limites=False):
+    # Un edificio típico tiene pocas decenas de combinaciones distintas de carga y
+    # parámetros sísmicos: cada combinación se diseña una sola vez y se replica
+    columnas = COLUMNAS_REQUERIDAS + tuple(COLUMNAS_OPCIONALES)
+    tabla = np.column_stack([entradas[c] for c in columnas])
+    unicas, inverso = np.unique(tabla, axis=0, return_inverse=True)
+    if len(unicas) < len(tabla):
+        diseno, verificacion = procesar_bloque(dict(zip(columnas, unicas.T)), optimizar, limites)
+        inverso = inverso.ravel()
+        return expandir(diseno, inverso), expandir(verificacion, inverso)
+
+    if optimizar:
+        # Búsqueda en el catálogo completo; ignora las dimensiones indicadas en el cuadro
+        diseno = optimizacion.optimizar_aisladores(
+            entradas["carga_ton"], entradas["desplazamiento_max_mm"],
+            entradas["S1"], entradas["SDS"], entradas["SD1"], entradas["TL"]
+        )
+    else:
+        diseno = motor_diseno.disenar_aisladores(
+            entradas["carga_ton"], entradas["desplazamiento_max_mm"],
+            entradas["S1"], entradas["SDS"], entradas["SD1"], entradas["TL"],
+            diametro_aislador=entradas["diametro_aislador_mm"],
+            altura_caucho=entradas["altura_caucho_mm"]
+        )
+    verificacion = motor_diseno.verificar_aisladores(diseno)
+    if limites:
+        # Propiedades nominales, superiores e inferiores en una sola pasada (eje adicional)
+        por_limites = motor_diseno.verificar_limites(motor_diseno.analizar_limites(diseno))
+        verificacion.update(("limites_" + clave, valores) for clave, valores in por_limites.items())
+    return diseno, verificacion
+
+
+def columnas_limites(verificacion):
+    # Columnas adicionales de --limites (los límites que gobiernan, por nombre)
+    nombres_limites = np.array(motor_diseno.LIMITES)
+    return {nombre: nombres_limites[verificacion[clave]] if nombre.startswith("limite_") else verificacion[clave]
+            for nombre, clave in COLUMNAS_LIMITES}
+
+
+def procesar_cuadro(entrada, salida, formato_entrada="csv", tamano_bloque=TAMANO_BLOQUE,
+                    optimizar=False, limites=False):
+    # Procesa el cuadro completo en flujo hacia salida (un exportacion.EscritorResultados);
+    # devuelve el número de aisladores procesados. La columna id se incluye si alguna fila
+    # del primer bloque la tiene (en CSV, si está en el encabezado); las filas sin id la dejan vacía.
+    con_id = None
+    total = 0
+    for bloque in agrupar_en_bloques(leer_filas(entrada, formato_entrada), tamano_bloque):
+        entradas = convertir_bloque(bloque, total + 1)
+        diseno, verificacion = procesar_bloque(entradas, optimizar, limites)
+        if con_id is None:
+            con_id = any("id" in fila for fila in bloque)
+        elif not con_id and any("id" in fila for fila in bloque):
+            raise ValueError(f"Fila {total + 1}: la columna 'id' debe aparecer desde el primer bloque de filas")
+        ids = [fila.get("id", "") for fila in bloque] if con_id else None
+        salida.escribir(resultados.ResultadoDiseno.desde_diseno(diseno, verificacion), ids,
+                        columnas_limites(verificacion) if limites else None)
+        total += len(bloque)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Diseño por lotes de aisladores LRB según ASCE 7-16 (sin interfaz gráfica)."
+    )
+    parser.add_argument("entrada", help="Cuadro de aisladores en CSV o JSONL ('-' para entrada estándar)")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo de resultados ('-' para salida estándar)")
+    parser.add_argument("--formato-entrada", choices=("csv", "jsonl"))
+    parser.add_argument("--formato-salida", choices=exportacion.FORMATOS,
+                        help="Mismo esquema en los tres formatos; npz: columnas binarias (ver exportacion.py)")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Filas procesadas por bloque")
+    parser.add_argument("--optimizar", action="store_true",
+                        help="Buscar el aislador más económico del catálogo en lugar del primer diámetro que cumple")
+    parser.add_argument("--limites", action="store_true",
+                        help="Agregar el análisis con propiedades de límite superior e inferior (ASCE 7 §17.2.8.4)")
+    parser.add_argument("--perfil", metavar="RUTA",
+                        help="Tiempos por etapa: tabla ('-' para error estándar) o traza de Chrome si RUTA es .json")
+    args = parser.parse_args(argv)
+    if args.perfil:
+        instrumentacion.activar()
+
+    formato_entrada = detectar_formato(None if args.entrada == "-" else args.entrada, args.formato_entrada)
+    formato_salida = detectar_formato(None if args.salida == "-" else args.salida, args.formato_salida)
+
+    if formato_salida == "npz" and args.salida == "-":
+        print("Error: la salida NPZ requiere un archivo (-o cuadro.npz)", file=sys.stderr)
+        return 1
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, newline="", encoding="utf-8")
+    try:
+        salida = exportacion.EscritorResultados(sys.stdout if args.salida == "-" else args.salida, formato_salida)
+        try:
+            total = procesar_cuadro(entrada, salida, formato_entrada, args.bloque, args.optimizar, args.limites)
+        except BaseException:
+            salida.descartar()
+            raise
+        salida.cerrar()
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+
+    print(f"{total} aisladores procesados", file=sys.stderr)
+    if args.perfil:
+        instrumentacion.volcar(args.perfil, instrumentacion.desactivar())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,54 @@
-import math
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+import time
+_INICIO_IMPORTACION = time.perf_counter()
 import json
 import os
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import sys
 import numpy as np
+import motor_diseno
+import histeresis
+import instrumentacion
+import cache_resultados
+import grafo_diseno
+import trabajos
+import graficos
+import resultados
+
+# Tkinter se carga bajo demanda (ver cargar_interfaz) y matplotlib solo al abrir la
+# pestaña de histéresis, para que importar el módulo o usar el modo por lotes sea rápido.
+tk = None
+ttk = None
+messagebox = None
+
+# Presupuesto de arranque (segundos), reportado con la opción --tiempos
+PRESUPUESTO_IMPORTACION = 0.3
+PRESUPUESTO_PRIMERA_VENTANA = 1.5
+
+# Pausa (ms) tras la última pulsación antes de recalcular en vivo
+RETARDO_ACTUALIZACION_MS = 300
+
+# Nodos del grafo de diseño que alimentan generar_info_etabs, en el orden de sus argumentos
+NODOS_INFO_ETABS = (
+    "diametro", "altura_total", "altura_caucho", "fuerza_fluencia",
+    "rigidez_horizontal", "rigidez_vertical", "diametro_nucleo",
+    "coef_amortiguamiento", "carga_kN", "desplazamiento_max_mm",
+    "num_capas", "espesor_capa", "periodo_aislado", "desplazamiento_total",
+    "S1", "SDS", "SD1", "TL", "BD",
+)
+
+
+def texto_verificacion(cumple, general=False):
+    # Texto mostrado (y exportado) para una comprobación del registro de resultados
+    if general:
+        return "CUMPLE TODOS LOS REQUISITOS ✓" if cumple else "NO CUMPLE ALGUNOS REQUISITOS ✗"
+    return "CUMPLE ✓" if cumple else "NO CUMPLE ✗"
+
+
+def cargar_interfaz():
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, messagebox as _messagebox
+        tk, ttk, messagebox = tkinter, _ttk, _messagebox
 
 class AisladorSismicoASCE7App:
     def __init__(self, root):
@@ -49,9 +92,62 @@ class AisladorSismicoASCE7App:
         self.fig = None
         self.canvas = None
         
+        # Caché de resultados (memoria + disco): entradas repetidas responden sin recalcular
+        self.cache = cache_resultados.CacheResultados()
+        
+        # Grafo de dependencias de la cadena de diseño: entradas y salidas asociadas
+        self.grafo_diseno = grafo_diseno.crear_grafo_diseno(cache=self.cache)
+        self.entradas_grafo = {
+            "carga_ton": self.carga_var,
+            "desplazamiento_max_mm": self.desplazamiento_var,
+            "S1": self.s1_var,
+            "SDS": self.sds_var,
+            "SD1": self.sd1_var,
+            "TL": self.tl_var,
+            "diametro_aislador": self.diametro_aislador_var,
+            "altura_caucho_indicada": self.altura_caucho_var,
+        }
+        self.salidas_grafo = {
+            "diametro": (self.diametro_calculado_var, "{:.1f}"),
+            "altura_total": (self.altura_total_var, "{:.1f}"),
+            "altura_caucho": (self.altura_caucho_calc_var, "{:.1f}"),
+            "fuerza_fluencia": (self.fuerza_fluencia_var, "{:.1f}"),
+            "rigidez_horizontal": (self.rigidez_horizontal_var, "{:.1f}"),
+            "rigidez_vertical": (self.rigidez_vertical_var, "{:.1f}"),
+            "diametro_nucleo": (self.diametro_nucleo_var, "{:.1f}"),
+            "coef_amortiguamiento": (self.coef_amortiguamiento_var, "{:.1f}"),
+            "num_capas": (self.num_capas_var, "{}"),
+            "espesor_capa": (self.espesor_capa_var, "{:.1f}"),
+            "periodo_aislado": (self.periodo_aislado_var, "{:.2f}"),
+            "desplazamiento_total": (self.desplazamiento_total_var, "{:.1f}"),
+        }
+        self._actualizacion_pendiente = None
+        self.etiquetas_verificacion = {}
+        self._cambiados_grafo = set()
+        self._mostrar_todo = False
+        self.resultado = None  # resultados.ResultadoDiseno del último diseño
+        
+        # Trabajos del motor fuera del hilo de la interfaz (resultados vía root.after)
+        self.ejecutor = trabajos.EjecutorTrabajos(self.root.after, al_cambiar_estado=self._actualizar_estado_trabajos)
+        self._progreso_animado = False
+        for variable in self.entradas_grafo.values():
+            variable.trace_add("write", self._al_modificar_entrada)
+        
         self.create_widgets()
     
     def create_widgets(self):
+        # Barra de estado de los trabajos en segundo plano (se empaqueta antes que las
+        # pestañas para que siempre quede visible al pie de la ventana)
+        barra_estado = ttk.Frame(self.root)
+        barra_estado.pack(side='bottom', fill='x', padx=10, pady=(0, 5))
+        self.estado_trabajos_var = tk.StringVar()
+        self.barra_progreso = ttk.Progressbar(barra_estado, mode='determinate', length=200, maximum=1.0)
+        self.barra_progreso.pack(side=tk.LEFT, padx=5)
+        ttk.Label(barra_estado, textvariable=self.estado_trabajos_var).pack(side=tk.LEFT, padx=5)
+        self.boton_cancelar = ttk.Button(barra_estado, text="Cancelar", command=self.cancelar_trabajos,
+                                         state='disabled')
+        self.boton_cancelar.pack(side=tk.RIGHT, padx=5)
+        
         # Crear notebook (pestañas)
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill='both', expand=True, padx=10, pady=10)
@@ -67,6 +163,7 @@ class AisladorSismicoASCE7App:
         # Pestaña de gráficos
         tab_graficos = ttk.Frame(notebook)
         notebook.add(tab_graficos, text='Curva de Histéresis')
+        self.tab_graficos = tab_graficos
         
         # Configurar el diseño de la pestaña de diseño
         self.setup_diseno_tab(tab_diseno)
@@ -74,8 +171,44 @@ class AisladorSismicoASCE7App:
         # Configurar el diseño de la pestaña de verificación
         self.setup_verificacion_tab(tab_verificacion)
         
-        # Configurar el diseño de la pestaña de gráficos
-        self.setup_graficos_tab(tab_graficos)
+        # La pestaña de gráficos (y matplotlib) se configura al abrirla por primera vez
+        notebook.bind("<<NotebookTabChanged>>", self._al_cambiar_pestana)
+    
+    def _actualizar_estado_trabajos(self, en_curso):
+        # Progreso determinado si el trabajo informa avance; animación si no
+        if not en_curso:
+            self.barra_progreso.stop()
+            self._progreso_animado = False
+            self.barra_progreso.configure(mode='determinate', value=0)
+            self.estado_trabajos_var.set("")
+            self.boton_cancelar.state(['disabled'])
+            return
+        
+        self.estado_trabajos_var.set(", ".join(t.descripcion for t in en_curso) + "...")
+        self.boton_cancelar.state(['!disabled'])
+        progreso = en_curso[-1].progreso
+        if progreso is None:
+            if not self._progreso_animado:
+                self.barra_progreso.configure(mode='indeterminate')
+                self.barra_progreso.start(15)
+                self._progreso_animado = True
+        else:
+            if self._progreso_animado:
+                self.barra_progreso.stop()
+                self._progreso_animado = False
+            self.barra_progreso.configure(mode='determinate', value=progreso)
+    
+    def cancelar_trabajos(self):
+        self._mostrar_todo = False
+        self.ejecutor.cancelar()
+    
+    def _al_cambiar_pestana(self, event):
+        if event.widget.select() == str(self.tab_graficos):
+            self.asegurar_graficos()
+    
+    def asegurar_graficos(self):
+        if self.fig is None:
+            self.setup_graficos_tab(self.tab_graficos)
     
     def setup_diseno_tab(self, parent):
         # Frame principal con scrollbar
@@ -196,7 +329,7 @@ class AisladorSismicoASCE7App:
         ttk.Label(results_right, textvariable=self.desplazamiento_total_var, font=("Arial", 9, "bold")).grid(row=1, column=1, sticky=tk.W, pady=2, padx=5)
         
         ttk.Label(results_right, text="Estado diseño:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        ttk.Label(results_right, textvariable=self.verif_general_var, font=("Arial", 9, "bold")).grid(row=2, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(results_right, textvariable=self.verif_general_var, font=("Arial", 9, "bold"))).grid(row=2, column=1, sticky=tk.W, pady=2, padx=5)
         
         # Área de texto para información ASCE 7
         ttk.Label(scrollable_frame, text="Información para ETABS/SAP2000 según ASCE 7:", 
@@ -263,23 +396,23 @@ class AisladorSismicoASCE7App:
         
         # Verificaciones izquierda
         ttk.Label(verif_left, text="Esfuerzo de compresión:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        ttk.Label(verif_left, textvariable=self.verif_esfuerzo_var, font=("Arial", 9, "bold")).grid(row=0, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(verif_left, textvariable=self.verif_esfuerzo_var, font=("Arial", 9, "bold"))).grid(row=0, column=1, sticky=tk.W, pady=2, padx=5)
         
         ttk.Label(verif_left, text="Deformación por cortante:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        ttk.Label(verif_left, textvariable=self.verif_deformacion_var, font=("Arial", 9, "bold")).grid(row=1, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(verif_left, textvariable=self.verif_deformacion_var, font=("Arial", 9, "bold"))).grid(row=1, column=1, sticky=tk.W, pady=2, padx=5)
         
         ttk.Label(verif_left, text="Estabilidad global:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        ttk.Label(verif_left, textvariable=self.verif_estabilidad_var, font=("Arial", 9, "bold")).grid(row=2, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(verif_left, textvariable=self.verif_estabilidad_var, font=("Arial", 9, "bold"))).grid(row=2, column=1, sticky=tk.W, pady=2, padx=5)
         
         # Verificaciones derecha
         ttk.Label(verif_right, text="Estabilidad al volteo:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        ttk.Label(verif_right, textvariable=self.verif_volteo_var, font=("Arial", 9, "bold")).grid(row=0, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(verif_right, textvariable=self.verif_volteo_var, font=("Arial", 9, "bold"))).grid(row=0, column=1, sticky=tk.W, pady=2, padx=5)
         
         ttk.Label(verif_right, text="Amortiguamiento efectivo:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        ttk.Label(verif_right, textvariable=self.verif_amortiguamiento_var, font=("Arial", 9, "bold")).grid(row=1, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(verif_right, textvariable=self.verif_amortiguamiento_var, font=("Arial", 9, "bold"))).grid(row=1, column=1, sticky=tk.W, pady=2, padx=5)
         
         ttk.Label(verif_right, text="Estado general:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        ttk.Label(verif_right, textvariable=self.verif_general_var, font=("Arial", 9, "bold")).grid(row=2, column=1, sticky=tk.W, pady=2, padx=5)
+        self._registrar_etiqueta(ttk.Label(verif_right, textvariable=self.verif_general_var, font=("Arial", 9, "bold"))).grid(row=2, column=1, sticky=tk.W, pady=2, padx=5)
         
         # Área de texto para detalles de verificación
         ttk.Label(scrollable_frame, text="Detalles de Verificación ASCE 7:", 
@@ -294,6 +427,11 @@ class AisladorSismicoASCE7App:
         
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
     
+    def _registrar_etiqueta(self, etiqueta):
+        # Etiquetas de verificación por variable, para colorearlas según el resultado
+        self.etiquetas_verificacion.setdefault(str(etiqueta.cget("textvariable")), []).append(etiqueta)
+        return etiqueta
+    
     def setup_graficos_tab(self, parent):
         # Frame principal
         main_frame = ttk.Frame(parent)
@@ -309,10 +447,14 @@ class AisladorSismicoASCE7App:
         graph_frame = ttk.Frame(main_frame)
         graph_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Crear figura de matplotlib
-        self.fig, self.ax = plt.subplots(figsize=(10, 6))
+        # Crear figura de matplotlib (importado bajo demanda)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.fig = Figure(figsize=(10, 6))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.grafico = graficos.GraficoHisteresis(self.fig, self.ax, self.canvas)
         
         # Botones para el gráfico
         button_frame = ttk.Frame(main_frame)
@@ -329,258 +471,146 @@ class AisladorSismicoASCE7App:
     
     def calcular(self):
         try:
-            # Obtener valores de entrada
-            carga_ton = self.carga_var.get()
-            diametro_aislador = self.diametro_aislador_var.get()
-            altura_caucho = self.altura_caucho_var.get()
-            desplazamiento_max_mm = self.desplazamiento_var.get()
-            S1 = self.s1_var.get()
-            SDS = self.sds_var.get()
-            SD1 = self.sd1_var.get()
-            TL = self.tl_var.get()
-            
-            # Convertir unidades
-            carga_kN = carga_ton * 9.81  # Convertir toneladas a kN
-            desplazamiento_max_m = desplazamiento_max_mm / 1000.0
-            
-            # Parámetros de diseño según ASCE 7-16, Capítulo 17
-            esfuerzo_admisible = 11.0  # MPa (máximo según ASCE 7-17 para carga de servicio)
-            relacion_forma = 8.0  # Relación de forma típica (S = D/(4t))
-            modulo_corte = 0.8  # MPa (módulo de corte del elastómero)
-            modulo_compresion = 2000.0  # MPa (módulo de compresión volumétrico)
-            esfuerzo_fluencia_plomo = 10.0  # MPa (esfuerzo de fluencia del plomo)
-            espesor_placa_acero = 3.0  # mm (espesor típico de placas de acero)
-            
-            # Factores según ASCE 7-16
-            BD = 1.0  # Factor de amplificación por desplazamiento (inicial)
-            if S1 >= 0.6:
-                BD = max(1.0, 1.2)  # Para zonas de alta sismicidad
+            entradas = self.leer_entradas()
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error en el cálculo: {str(e)}")
+            return
+        # El diseño corre en segundo plano; al terminar se muestran todos los resultados
+        self._mostrar_todo = True
+        self.enviar_diseno(entradas)
+    
+    def enviar_diseno(self, entradas):
+        # Diseño mediante el grafo de dependencias (solo se recalcula lo que cambió).
+        # El grafo solo se modifica en el hilo de trabajo y los trabajos "diseno" nunca
+        # corren a la vez; los nodos cambiados se acumulan aunque el trabajo se descarte.
+        def _recalcular(trabajo):
+            self._cambiados_grafo |= self.recalcular_grafo(entradas)
+        
+        self.ejecutor.enviar("diseno", _recalcular, al_terminar=self._al_terminar_diseno,
+                             al_error=self._al_fallar_diseno, descripcion="Calculando diseño")
+    
+    def _al_terminar_diseno(self, _):
+        cambiados, self._cambiados_grafo = self._cambiados_grafo, set()
+        if not self._mostrar_todo:
+            if cambiados:
+                self.mostrar_resultados(cambiados)
+            return
+        
+        self._mostrar_todo = False
+        try:
+            g = self.grafo_diseno.valores
             
-            # 1. Calcular o verificar diámetro del aislador
-            if diametro_aislador <= 0:
-                # Calcular diámetro basado en el esfuerzo admisible ASCE 7
-                area_requerida = (carga_kN * 1000) / esfuerzo_admisible  # mm²
-                diametro_aislador = math.sqrt(4 * area_requerida / math.pi)  # mm
-                # Redondear a un valor estándar
-                diametro_aislador = self.redondear_valor_estandar(diametro_aislador)
-            else:
-                # Verificar el diámetro proporcionado
-                area_total = math.pi * (diametro_aislador / 2)**2
-                esfuerzo_actual = (carga_kN * 1000) / area_total
-                if esfuerzo_actual > esfuerzo_admisible:
+            # Advertencias cuando las dimensiones proporcionadas no cumplen los límites ASCE 7
+            if g["diametro_aislador"] > 0:
+                esfuerzo_actual = g["esfuerzo_actual"]
+                if esfuerzo_actual > motor_diseno.ESFUERZO_ADMISIBLE:
                     messagebox.showwarning("Advertencia", 
                                          f"El diámetro proporcionado resulta en un esfuerzo de {esfuerzo_actual:.2f} MPa, "
-                                         f"que excede el límite de {esfuerzo_admisible:.2f} MPa según ASCE 7.")
-            
-            # Recalcular área con diámetro final
-            area_total = math.pi * (diametro_aislador / 2)**2
+                                         f"que excede el límite de {motor_diseno.ESFUERZO_ADMISIBLE:.2f} MPa según ASCE 7.")
             
-            # 2. Calcular espesor de capa de caucho basado en la relación de forma
-            espesor_capa = diametro_aislador / (4 * relacion_forma)  # mm
-            
-            # 3. Calcular número de capas necesario para el desplazamiento máximo según ASCE 7
-            # Deformación máxima por capa según ASCE 7-17.2.3
-            deformacion_max_capa = 0.5  # 50% de deformación máxima por capa (ASCE 7 límite)
-            
-            if altura_caucho <= 0:
-                # Calcular altura de caucho necesaria
-                num_capas = math.ceil(desplazamiento_max_mm / (deformacion_max_capa * espesor_capa))
-                altura_caucho = num_capas * espesor_capa  # mm
-            else:
-                # Verificar la altura de caucho proporcionada
-                num_capas = math.ceil(altura_caucho / espesor_capa)
-                altura_caucho = num_capas * espesor_capa  # Ajustar a múltiplo del espesor de capa
-                deformacion_por_capa = desplazamiento_max_mm / altura_caucho
-                if deformacion_por_capa > deformacion_max_capa:
+            if g["altura_caucho_indicada"] > 0:
+                deformacion_por_capa = g["deformacion_por_capa"]
+                if deformacion_por_capa > motor_diseno.DEFORMACION_MAX_CAPA:
                     messagebox.showwarning("Advertencia", 
                                          f"La altura de caucho proporcionada resulta en una deformación de {deformacion_por_capa*100:.1f}%, "
-                                         f"que excede el límite de {deformacion_max_capa*100:.0f}% según ASCE 7.")
+                                         f"que excede el límite de {motor_diseno.DEFORMACION_MAX_CAPA*100:.0f}% según ASCE 7.")
             
-            # 4. Calcular altura total del aislador (caucho + placas de acero)
-            altura_placas = (num_capas + 1) * espesor_placa_acero
-            altura_total = altura_caucho + altura_placas  # mm
+            # Actualizar variables de salida, verificación e información para ETABS/SAP2000
+            self.mostrar_resultados()
             
-            # 5. Calcular diámetro del núcleo de plomo según ASCE 7
-            # El área del núcleo de plomo es típicamente 15-25% del área total
-            area_nucleo = 0.2 * area_total  # 20% del área total
-            diametro_nucleo = math.sqrt(4 * area_nucleo / math.pi)  # mm
-            
-            # 6. Calcular fuerza de fluencia del núcleo de plomo
-            fuerza_fluencia = (esfuerzo_fluencia_plomo * area_nucleo) / 1000  # kN
-            
-            # 7. Calcular rigideces según ASCE 7
-            # Rigidez horizontal (K_h) = (G * A) / T_r
-            rigidez_horizontal = (modulo_corte * area_total) / altura_caucho  # N/mm
-            rigidez_horizontal_kNm = rigidez_horizontal * 1000  # Convertir a kN/m
-            
-            # Rigidez vertical (K_v) = (E_c * A) / T_r
-            # Para caucho con refuerzo de acero, E_c ≈ 6GS² (ASCE 7 aproximación)
-            E_c = 6 * modulo_corte * relacion_forma**2  # MPa
-            rigidez_vertical = (E_c * area_total) / altura_caucho  # N/mm
-            rigidez_vertical_kNm = rigidez_vertical * 1000  # Convertir to kN/m
-            
-            # 8. Calcular periodo del sistema aislado según ASCE 7-17.5.3.1
-            periodo_aislado = 2 * math.pi * math.sqrt(carga_kN / (9.81 * rigidez_horizontal_kNm))
-            
-            # 9. Calcular desplazamiento total según ASCE 7-17.5.3.2
-            # D_TD = (g / 4π²) * S_D1 * T_D / B_D
-            desplazamiento_total = (9.81 / (4 * math.pi**2)) * SD1 * periodo_aislado / BD
-            desplazamiento_total_mm = desplazamiento_total * 1000  # Convertir a mm
-            
-            # 10. Coeficiente de amortiguamiento efectivo según ASCE 7
-            # Para aisladores con núcleo de plomo, β ≈ 15-30%
-            coef_amortiguamiento = 20.0  # % (valor típico para LRB según ASCE 7)
-            
-            # Actualizar variables de salida
-            self.diametro_calculado_var.set(f"{diametro_aislador:.1f}")
-            self.altura_total_var.set(f"{altura_total:.1f}")
-            self.altura_caucho_calc_var.set(f"{altura_caucho:.1f}")
-            self.fuerza_fluencia_var.set(f"{fuerza_fluencia:.1f}")
-            self.rigidez_horizontal_var.set(f"{rigidez_horizontal_kNm:.1f}")
-            self.rigidez_vertical_var.set(f"{rigidez_vertical_kNm:.1f}")
-            self.diametro_nucleo_var.set(f"{diametro_nucleo:.1f}")
-            self.coef_amortiguamiento_var.set(f"{coef_amortiguamiento:.1f}")
-            self.num_capas_var.set(f"{num_capas}")
-            self.espesor_capa_var.set(f"{espesor_capa:.1f}")
-            self.periodo_aislado_var.set(f"{periodo_aislado:.2f}")
-            self.desplazamiento_total_var.set(f"{desplazamiento_total_mm:.1f}")
-            
-            # Realizar verificación automática
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error en el cálculo: {str(e)}")
+    
+    def _al_fallar_diseno(self, e):
+        # Los errores de la actualización en vivo se ignoran (valores a medio escribir)
+        if self._mostrar_todo:
+            self._mostrar_todo = False
+            messagebox.showerror("Error", f"Ocurrió un error en el cálculo: {str(e)}")
+    
+    def leer_entradas(self):
+        # Valores actuales de los campos de entrada (TclError si un campo no es numérico)
+        return {nombre: variable.get() for nombre, variable in self.entradas_grafo.items()}
+    
+    def recalcular_grafo(self, entradas):
+        for nombre, valor in entradas.items():
+            self.grafo_diseno.asignar(nombre, valor)
+        return self.grafo_diseno.recalcular()
+    
+    def mostrar_resultados(self, cambiados=None):
+        # Actualiza solo las salidas cuyos nodos cambiaron (todas si cambiados es None)
+        g = self.grafo_diseno.valores
+        self.resultado = resultados.ResultadoDiseno.desde_valores(g)
+        for nodo, (variable, formato) in self.salidas_grafo.items():
+            if cambiados is None or nodo in cambiados:
+                variable.set(formato.format(g[nodo]))
+        
+        # Realizar verificación automática
+        if cambiados is None or cambiados & set(resultados.ResultadoDiseno.campos()):
             self.verificar()
-            
-            # Generar información adicional para ETABS/SAP2000
-            info_etabs = self.generar_info_etabs(
-                diametro_aislador, altura_total, altura_caucho, fuerza_fluencia,
-                rigidez_horizontal_kNm, rigidez_vertical_kNm, diametro_nucleo,
-                coef_amortiguamiento, carga_kN, desplazamiento_max_mm,
-                num_capas, espesor_capa, periodo_aislado, desplazamiento_total_mm,
-                S1, SDS, SD1, TL, BD
-            )
-            
+        
+        # Generar información adicional para ETABS/SAP2000
+        if cambiados is None or cambiados & set(NODOS_INFO_ETABS):
+            argumentos = tuple(g[nodo] for nodo in NODOS_INFO_ETABS)
+            info_etabs = self.cache.obtener("info_etabs", argumentos, lambda: self.generar_info_etabs(*argumentos))
             self.text_output.delete(1.0, tk.END)
             self.text_output.insert(tk.END, info_etabs)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Ocurrió un error en el cálculo: {str(e)}")
     
+    def _al_modificar_entrada(self, *args):
+        # Actualización en vivo mientras se escribe, una vez calculado el primer diseño.
+        # Las pulsaciones seguidas se agrupan: solo se recalcula tras una pausa.
+        if self.resultado is None:
+            return
+        if self._actualizacion_pendiente is not None:
+            self.root.after_cancel(self._actualizacion_pendiente)
+        self._actualizacion_pendiente = self.root.after(RETARDO_ACTUALIZACION_MS, self.actualizar_en_vivo)
+    
+    def actualizar_en_vivo(self):
+        self._actualizacion_pendiente = None
+        try:
+            entradas = self.leer_entradas()
+        except (tk.TclError, ValueError):
+            return  # campo incompleto o vacío mientras se escribe
+        self.enviar_diseno(entradas)
+    
+    @instrumentacion.medir("verificar (interfaz)")
     def verificar(self):
         try:
             # Verificar que se hayan calculado los valores primero
-            if not self.diametro_calculado_var.get():
+            if self.resultado is None:
                 messagebox.showwarning("Advertencia", "Primero debe calcular los parámetros del aislador.")
                 return
             
-            # Obtener valores calculados
-            diametro_aislador = float(self.diametro_calculado_var.get())
-            altura_total = float(self.altura_total_var.get())
-            altura_caucho = float(self.altura_caucho_calc_var.get())
-            fuerza_fluencia = float(self.fuerza_fluencia_var.get())
-            rigidez_horizontal = float(self.rigidez_horizontal_var.get())
-            rigidez_vertical = float(self.rigidez_vertical_var.get())
-            diametro_nucleo = float(self.diametro_nucleo_var.get())
-            coef_amortiguamiento = float(self.coef_amortiguamiento_var.get())
-            num_capas = int(self.num_capas_var.get())
-            espesor_capa = float(self.espesor_capa_var.get())
-            periodo_aislado = float(self.periodo_aislado_var.get())
-            desplazamiento_total = float(self.desplazamiento_total_var.get())
-            
-            carga_ton = self.carga_var.get()
-            carga_kN = carga_ton * 9.81
-            desplazamiento_max_mm = self.desplazamiento_var.get()
-            
-            # Parámetros según ASCE 7-16
-            esfuerzo_admisible = 11.0  # MPa (ASCE 7-17.2.3.1)
-            deformacion_max_capa = 0.5  # 50% (ASCE 7-17.2.3.2)
-            relacion_estabilidad = 3.0  # Relación altura/diámetro máxima (ASCE 7-17.2.3.3)
-            amortiguamiento_min = 15.0  # % mínimo para LRB (ASCE 7-17.5.3.3)
-            
-            # Calcular valores actuales
-            area_total = math.pi * (diametro_aislador / 2)**2
-            esfuerzo_actual = (carga_kN * 1000) / area_total  # MPa
-            
-            deformacion_actual = desplazamiento_max_mm / altura_caucho
-            deformacion_por_capa = desplazamiento_max_mm / (num_capas * espesor_capa)
-            
-            relacion_altura_diametro = altura_total / diametro_aislador
-            
-            # Realizar verificaciones
-            verificaciones = []
-            
-            # 1. Verificación de esfuerzo de compresión
-            if esfuerzo_actual <= esfuerzo_admisible:
-                self.verif_esfuerzo_var.set("CUMPLE ✓")
-                color_esfuerzo = "green"
-                verificaciones.append(True)
-            else:
-                self.verif_esfuerzo_var.set("NO CUMPLE ✗")
-                color_esfuerzo = "red"
-                verificaciones.append(False)
-            
-            # 2. Verificación de deformación por cortante
-            if deformacion_por_capa <= deformacion_max_capa:
-                self.verif_deformacion_var.set("CUMPLE ✓")
-                color_deformacion = "green"
-                verificaciones.append(True)
-            else:
-                self.verif_deformacion_var.set("NO CUMPLE ✗")
-                color_deformacion = "red"
-                verificaciones.append(False)
-            
-            # 3. Verificación de estabilidad global
-            if relacion_altura_diametro <= relacion_estabilidad:
-                self.verif_estabilidad_var.set("CUMPLE ✓")
-                color_estabilidad = "green"
-                verificaciones.append(True)
-            else:
-                self.verif_estabilidad_var.set("NO CUMPLE ✗")
-                color_estabilidad = "red"
-                verificaciones.append(False)
-            
-            # 4. Verificación de estabilidad al volteo
-            # Para aisladores circulares, generalmente no hay problema de volteo
-            self.verif_volteo_var.set("CUMPLE ✓")
-            color_volteo = "green"
-            verificaciones.append(True)
-            
-            # 5. Verificación de amortiguamiento efectivo
-            if coef_amortiguamiento >= amortiguamiento_min:
-                self.verif_amortiguamiento_var.set("CUMPLE ✓")
-                color_amortiguamiento = "green"
-                verificaciones.append(True)
-            else:
-                self.verif_amortiguamiento_var.set("NO CUMPLE ✗")
-                color_amortiguamiento = "red"
-                verificaciones.append(False)
+            # Las verificaciones se leen del registro de resultados (precisión completa)
+            r = self.resultado
+            for variable, cumple in [
+                (self.verif_esfuerzo_var, r.cumple_esfuerzo),
+                (self.verif_deformacion_var, r.cumple_deformacion),
+                (self.verif_estabilidad_var, r.cumple_estabilidad),
+                # Para aisladores circulares, generalmente no hay problema de volteo
+                (self.verif_volteo_var, r.cumple_volteo),
+                (self.verif_amortiguamiento_var, r.cumple_amortiguamiento)
+            ]:
+                variable.set(texto_verificacion(cumple))
+                self.colorear_verificacion(variable, cumple)
             
             # Verificación general
-            if all(verificaciones):
-                self.verif_general_var.set("CUMPLE TODOS LOS REQUISITOS ✓")
-                color_general = "green"
-            else:
-                self.verif_general_var.set("NO CUMPLE ALGUNOS REQUISITOS ✗")
-                color_general = "red"
-            
-            # Aplicar colores a las verificaciones
-            for label, color in [
-                (self.verif_esfuerzo_var, color_esfuerzo),
-                (self.verif_deformacion_var, color_deformacion),
-                (self.verif_estabilidad_var, color_estabilidad),
-                (self.verif_volteo_var, color_volteo),
-                (self.verif_amortiguamiento_var, color_amortiguamiento),
-                (self.verif_general_var, color_general)
-            ]:
-                label_widget = self.root.nametowidget(label._name) if hasattr(label, '_name') else None
-                if label_widget:
-                    label_widget.config(foreground=color)
+            self.verif_general_var.set(texto_verificacion(r.cumple_general, general=True))
+            self.colorear_verificacion(self.verif_general_var, r.cumple_general)
             
             # Generar reporte detallado de verificación
-            reporte = self.generar_reporte_verificacion(
-                esfuerzo_actual, esfuerzo_admisible,
-                deformacion_por_capa, deformacion_max_capa,
-                relacion_altura_diametro, relacion_estabilidad,
-                coef_amortiguamiento, amortiguamiento_min,
-                diametro_aislador, altura_total, area_total
+            argumentos = (
+                r.esfuerzo_actual, motor_diseno.ESFUERZO_ADMISIBLE,
+                r.deformacion_por_capa, motor_diseno.DEFORMACION_MAX_CAPA,
+                r.relacion_altura_diametro, motor_diseno.RELACION_ESTABILIDAD,
+                r.coef_amortiguamiento, motor_diseno.AMORTIGUAMIENTO_MIN,
+                r.diametro, r.altura_total, r.area_total
             )
+            reporte = self.cache.obtener("reporte_verificacion", argumentos,
+                                         lambda: self.generar_reporte_verificacion(*argumentos))
+            
+            # Propiedades de límite superior e inferior (ASCE 7-17.2.8.4)
+            limites = motor_diseno.analizar_limites(r.como_dict())
+            reporte += "\n\n" + self.generar_reporte_limites(limites, motor_diseno.verificar_limites(limites))
             
             self.text_verificacion.delete(1.0, tk.END)
             self.text_verificacion.insert(tk.END, reporte)
@@ -588,115 +618,77 @@ class AisladorSismicoASCE7App:
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un error en la verificación: {str(e)}")
     
+    def colorear_verificacion(self, variable, cumple):
+        for etiqueta in self.etiquetas_verificacion.get(str(variable), []):
+            etiqueta.config(foreground="green" if cumple else "red")
+    
     def generar_grafico(self):
         try:
             # Verificar que se hayan calculado los valores primero
-            if not self.diametro_calculado_var.get():
+            if self.resultado is None:
                 messagebox.showwarning("Advertencia", "Primero debe calcular los parámetros del aislador.")
                 return
             
-            # Obtener valores calculados
-            fuerza_fluencia = float(self.fuerza_fluencia_var.get())
-            rigidez_horizontal = float(self.rigidez_horizontal_var.get()) / 1000  # Convertir a kN/mm
-            desplazamiento_total = float(self.desplazamiento_total_var.get())
-            carga_kN = self.carga_var.get() * 9.81  # Convertir toneladas a kN
+            self.asegurar_graficos()
             
-            # Generar datos para la curva de histéresis (modelo bilineal)
-            # Para un aislador con núcleo de plomo, la rigidez post-fluencia es aproximadamente 10% de la rigidez elástica
-            rigidez_post_fluencia = 0.1 * rigidez_horizontal
+            # Generar datos para la curva de histéresis (modelo bilineal con endurecimiento cinemático)
+            # La rigidez del caucho es la post-fluencia, aproximadamente 10% de la rigidez elástica,
+            # y la fuerza del núcleo de plomo es la resistencia característica Qd
+            _, rigidez_horizontal, rigidez_post_fluencia, fuerza_fluencia = self.resultado.parametros_bilineales()
+            rigidez_horizontal, rigidez_post_fluencia = rigidez_horizontal / 1000, rigidez_post_fluencia / 1000  # kN/mm
+            desplazamiento_total = self.resultado.desplazamiento_total
+            carga_kN = self.resultado.carga_kN
             
-            # Punto de fluencia (aproximado)
+            # Punto de fluencia
             desplazamiento_fluencia = fuerza_fluencia / rigidez_horizontal
             
-            # Generar ciclo de carga completo (ida y vuelta)
+            # Carga inicial 0 → Δmax seguida de un ciclo completo Δmax → -Δmax → Δmax
             num_puntos = 100
-            desplazamientos = np.linspace(0, desplazamiento_total, num_puntos)
-            
-            # Curva de carga (rampa positiva)
-            fuerza_carga = np.where(
-                desplazamientos <= desplazamiento_fluencia,
-                rigidez_horizontal * desplazamientos,
-                fuerza_fluencia + rigidez_post_fluencia * (desplazamientos - desplazamiento_fluencia)
-            )
-            
-            # Curva de descarga (rampa negativa)
-            desplazamientos_descarga = np.linspace(desplazamiento_total, -desplazamiento_total, 2*num_puntos)
-            fuerza_descarga = np.zeros_like(desplazamientos_descarga)
-            
-            for i, d in enumerate(desplazamientos_descarga):
-                if d >= desplazamiento_fluencia:
-                    fuerza_descarga[i] = fuerza_fluencia + rigidez_post_fluencia * (d - desplazamiento_fluencia)
-                elif d <= -desplazamiento_fluencia:
-                    fuerza_descarga[i] = -fuerza_fluencia + rigidez_post_fluencia * (d + desplazamiento_fluencia)
-                else:
-                    fuerza_descarga[i] = rigidez_horizontal * d
-            
-            # Curva de recarga (rampa positiva)
-            desplazamientos_recarga = np.linspace(-desplazamiento_total, desplazamiento_total, 2*num_puntos)
-            fuerza_recarga = np.zeros_like(desplazamientos_recarga)
-            
-            for i, d in enumerate(desplazamientos_recarga):
-                if d >= desplazamiento_fluencia:
-                    fuerza_recarga[i] = fuerza_fluencia + rigidez_post_fluencia * (d - desplazamiento_fluencia)
-                elif d <= -desplazamiento_fluencia:
-                    fuerza_recarga[i] = -fuerza_fluencia + rigidez_post_fluencia * (d + desplazamiento_fluencia)
-                else:
-                    fuerza_recarga[i] = rigidez_horizontal * d
-            
-            # Combinar todas las curvas
-            desplazamientos_completo = np.concatenate([
-                desplazamientos,
-                desplazamientos_descarga,
-                desplazamientos_recarga
-            ])
-            
-            fuerza_completo = np.concatenate([
-                fuerza_carga,
-                fuerza_descarga,
-                fuerza_recarga
+            desplazamientos_completo = desplazamiento_total * np.concatenate([
+                np.linspace(0, 1, num_puntos),
+                np.linspace(1, -1, 2*num_puntos),
+                np.linspace(-1, 1, 2*num_puntos)
             ])
-            
-            # Limpiar el gráfico anterior
-            self.ax.clear()
-            
-            # Crear el gráfico
-            self.ax.plot(desplazamientos_completo, fuerza_completo, 'b-', linewidth=2)
-            self.ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-            self.ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
-            self.ax.set_xlabel('Desplazamiento (mm)')
-            self.ax.set_ylabel('Fuerza (kN)')
-            self.ax.set_title('Curva de Histéresis del Aislador Sísmico')
-            self.ax.grid(True, alpha=0.3)
-            
-            # Añadir anotaciones
-            self.ax.annotate(f'Fy = {fuerza_fluencia:.1f} kN', 
-                           xy=(desplazamiento_fluencia, fuerza_fluencia), 
-                           xytext=(desplazamiento_fluencia+10, fuerza_fluencia+50),
-                           arrowprops=dict(arrowstyle='->', color='red'),
-                           fontsize=10, color='red')
-            
-            self.ax.annotate(f'Δmax = {desplazamiento_total:.1f} mm', 
-                           xy=(desplazamiento_total, fuerza_completo[np.where(desplazamientos_completo >= desplazamiento_total)[0][0]]), 
-                           xytext=(desplazamiento_total+10, fuerza_fluencia),
-                           arrowprops=dict(arrowstyle='->', color='green'),
-                           fontsize=10, color='green')
-            
-            # Añadir línea de carga máxima
-            self.ax.axhline(y=carga_kN, color='purple', linestyle='--', alpha=0.7, label=f'Carga máxima: {carga_kN:.1f} kN')
-            self.ax.legend()
-            
-            # Actualizar el canvas
-            self.canvas.draw()
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error al generar el gráfico: {str(e)}")
+            return
+        
+        # El lazo se calcula en segundo plano y se dibuja al volver al hilo de la interfaz
+        def _calcular_lazo(trabajo):
+            return self.cache.obtener(
+                "histeresis", (desplazamiento_total, num_puntos, rigidez_horizontal, rigidez_post_fluencia,
+                               fuerza_fluencia),
+                lambda: histeresis.lazo_bilineal(
+                    desplazamientos_completo, rigidez_horizontal, rigidez_post_fluencia, fuerza_fluencia
+                )
+            )
+        
+        self.ejecutor.enviar(
+            "grafico", _calcular_lazo,
+            al_terminar=lambda fuerza_completo: self.dibujar_histeresis(
+                desplazamientos_completo, fuerza_completo, fuerza_fluencia, desplazamiento_fluencia,
+                desplazamiento_total, carga_kN),
+            al_error=lambda e: messagebox.showerror("Error", f"Ocurrió un error al generar el gráfico: {str(e)}"),
+            descripcion="Generando histéresis"
+        )
+    
+    def dibujar_histeresis(self, desplazamientos_completo, fuerza_completo, fuerza_fluencia,
+                           desplazamiento_fluencia, desplazamiento_total, carga_kN):
+        try:
+            # Se actualizan los artistas existentes y se repinta solo lo que cambia (blitting)
+            self.grafico.actualizar(desplazamientos_completo, fuerza_completo, fuerza_fluencia,
+                                    desplazamiento_fluencia, desplazamiento_total, carga_kN)
             
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un error al generar el gráfico: {str(e)}")
     
     def guardar_grafico(self):
         try:
-            if self.fig is None:
+            if self.fig is None or self.grafico.datos is None:
                 messagebox.showwarning("Advertencia", "Primero debe generar el gráfico.")
                 return
             
+            from tkinter import filedialog
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".png",
                 filetypes=[("PNG files", "*.png"), ("PDF files", "*.pdf"), ("All files", "*.*")],
@@ -704,8 +696,17 @@ class AisladorSismicoASCE7App:
             )
             
             if file_path:
-                self.fig.savefig(file_path, dpi=300, bbox_inches='tight')
-                messagebox.showinfo("Éxito", f"Gráfico guardado correctamente en {file_path}")
+                # El renderizado a 300 dpi corre en segundo plano sobre una figura Agg propia,
+                # con una copia de los datos tomada aquí (la figura de Tk no sale de este hilo)
+                datos = self.grafico.datos
+                tamano = tuple(self.fig.get_size_inches())
+                self.ejecutor.enviar(
+                    "guardar_grafico",
+                    lambda trabajo: graficos.guardar_figura(file_path, datos, tamano, dpi=300),
+                    al_terminar=lambda _: messagebox.showinfo("Éxito", f"Gráfico guardado correctamente en {file_path}"),
+                    al_error=lambda e: messagebox.showerror("Error", f"Error al guardar el gráfico: {str(e)}"),
+                    descripcion="Guardando gráfico"
+                )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar el gráfico: {str(e)}")
@@ -772,16 +773,36 @@ RECOMENDACIONES:
         
         return reporte
     
+    def generar_reporte_limites(self, limites, verificacion):
+        # Tabla por juego de propiedades y límite que gobierna cada comprobación
+        nombres = motor_diseno.LIMITES
+        reporte = "PROPIEDADES DE LÍMITE SUPERIOR E INFERIOR (ASCE 7-17.2.8.4):\n"
+        reporte += f"   {'Límite':10s} {'Qd (kN)':>10s} {'Kd (kN/m)':>11s} {'β (%)':>8s} {'D_TD (mm)':>10s} {'V (kN)':>10s}\n"
+        for i, nombre in enumerate(nombres):
+            cortante = limites["rigidez_efectiva"][i] * limites["desplazamiento_total"][i] / 1000
+            reporte += (f"   {nombre:10s} {limites['fuerza_fluencia'][i]:10.1f} {limites['rigidez_horizontal'][i]:11.1f} "
+                        f"{limites['coef_amortiguamiento'][i]:8.1f} {limites['desplazamiento_total'][i]:10.1f} "
+                        f"{cortante:10.1f}\n")
+        reporte += "\n   Límite que gobierna:\n"
+        for etiqueta, clave in (("Esfuerzo de compresión", "esfuerzo"), ("Deformación por cortante (con D_TD)", "deformacion"),
+                                ("Estabilidad global", "estabilidad"), ("Amortiguamiento efectivo", "amortiguamiento")):
+            estado = "CUMPLE" if verificacion["cumple_" + clave] else "NO CUMPLE"
+            if clave in motor_diseno.COMPROBACIONES_SIN_LIMITE:
+                gobierna = "no depende del límite de propiedades"
+            else:
+                gobierna = nombres[int(verificacion['limite_' + clave])]
+            reporte += f"   - {etiqueta}: {gobierna} ({estado})\n"
+        reporte += (f"   - Desplazamiento máximo: {verificacion['desplazamiento_maximo']:.1f} mm "
+                    f"({nombres[int(verificacion['limite_desplazamiento'])]})\n")
+        reporte += (f"   - Cortante máximo: {verificacion['cortante_maximo']:.1f} kN "
+                    f"({nombres[int(verificacion['limite_cortante'])]})\n")
+        reporte += (f"   - Resultado con los tres límites: "
+                    f"{'CUMPLE' if verificacion['cumple_general'] else 'NO CUMPLE'}")
+        return reporte
+    
     def redondear_valor_estandar(self, valor):
         # Redondear a valores estándar de diámetros comerciales
-        estandares = [100, 150, 200, 250, 300, 350, 400, 450, 500, 550, 600, 
-                      650, 700, 750, 800, 850, 900, 950, 1000, 1050, 1100, 1150, 1200]
-        
-        for estandar in estandares:
-            if valor <= estandar:
-                return estandar
-        
-        return estandares[-1]
+        return float(motor_diseno.redondear_valor_estandar(valor))
     
     def generar_info_etabs(self, diametro, altura_total, altura_caucho, fluencia, 
                           k_horizontal, k_vertical, diametro_nucleo, amortiguamiento, 
@@ -794,7 +815,7 @@ DATOS SÍSMICOS DE ENTRADA:
 - Parámetro SDS: {SDS}
 - Parámetro SD1: {SD1}
 - Parámetro TL: {TL}
-- Factor de amplificación BD: {BD}
+- Coeficiente de amortiguamiento BD (Tabla 17.7-1): {BD:.2f}
 
 PROPIEDADES GEOMÉTRICAS DEL AISLADOR:
 - Diámetro total: {diametro:.1f} mm
@@ -838,46 +859,48 @@ Se requiere validación con normas específicas y ensayos de prototipos."""
     
     def exportar_json(self):
         try:
-            if not self.diametro_calculado_var.get():
+            if self.resultado is None:
                 messagebox.showwarning("Advertencia", "Primero debe calcular los parámetros del aislador.")
                 return
             
-            # Crear diccionario con todos los datos
+            # Crear diccionario con todos los datos (valores del registro, sin redondear)
+            r = self.resultado
             data = {
-                "carga_ton": self.carga_var.get(),
+                "carga_ton": r.carga_ton,
                 "diametro_aislador_mm": self.diametro_aislador_var.get(),
                 "altura_caucho_mm": self.altura_caucho_var.get(),
-                "desplazamiento_max_mm": self.desplazamiento_var.get(),
+                "desplazamiento_max_mm": r.desplazamiento_max_mm,
                 "parametros_sismicos": {
-                    "S1": self.s1_var.get(),
-                    "SDS": self.sds_var.get(),
-                    "SD1": self.sd1_var.get(),
-                    "TL": self.tl_var.get()
+                    "S1": r.S1,
+                    "SDS": r.SDS,
+                    "SD1": r.SD1,
+                    "TL": r.TL
                 },
                 "resultados_diseno": {
-                    "diametro_calculado_mm": float(self.diametro_calculado_var.get()),
-                    "altura_total_mm": float(self.altura_total_var.get()),
-                    "altura_caucho_calculada_mm": float(self.altura_caucho_calc_var.get()),
-                    "num_capas_caucho": int(self.num_capas_var.get()),
-                    "espesor_capa_mm": float(self.espesor_capa_var.get()),
-                    "fuerza_fluencia_kN": float(self.fuerza_fluencia_var.get()),
-                    "rigidez_horizontal_kN_m": float(self.rigidez_horizontal_var.get()),
-                    "rigidez_vertical_kN_m": float(self.rigidez_vertical_var.get()),
-                    "diametro_nucleo_mm": float(self.diametro_nucleo_var.get()),
-                    "coef_amortiguamiento_porc": float(self.coef_amortiguamiento_var.get()),
-                    "periodo_aislado_s": float(self.periodo_aislado_var.get()),
-                    "desplazamiento_total_mm": float(self.desplazamiento_total_var.get())
+                    "diametro_calculado_mm": r.diametro,
+                    "altura_total_mm": r.altura_total,
+                    "altura_caucho_calculada_mm": r.altura_caucho,
+                    "num_capas_caucho": r.num_capas,
+                    "espesor_capa_mm": r.espesor_capa,
+                    "fuerza_fluencia_kN": r.fuerza_fluencia,
+                    "rigidez_horizontal_kN_m": r.rigidez_horizontal,
+                    "rigidez_vertical_kN_m": r.rigidez_vertical,
+                    "diametro_nucleo_mm": r.diametro_nucleo,
+                    "coef_amortiguamiento_porc": r.coef_amortiguamiento,
+                    "periodo_aislado_s": r.periodo_aislado,
+                    "desplazamiento_total_mm": r.desplazamiento_total
                 },
                 "verificaciones": {
-                    "esfuerzo_compresion": self.verif_esfuerzo_var.get(),
-                    "deformacion_cortante": self.verif_deformacion_var.get(),
-                    "estabilidad_global": self.verif_estabilidad_var.get(),
-                    "estabilidad_volteo": self.verif_volteo_var.get(),
-                    "amortiguamiento_efectivo": self.verif_amortiguamiento_var.get(),
-                    "estado_general": self.verif_general_var.get()
+                    "esfuerzo_compresion": texto_verificacion(r.cumple_esfuerzo),
+                    "deformacion_cortante": texto_verificacion(r.cumple_deformacion),
+                    "estabilidad_global": texto_verificacion(r.cumple_estabilidad),
+                    "estabilidad_volteo": texto_verificacion(r.cumple_volteo),
+                    "amortiguamiento_efectivo": texto_verificacion(r.cumple_amortiguamiento),
+                    "estado_general": texto_verificacion(r.cumple_general, general=True)
                 }
             }
             
+            from tkinter import filedialog
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".json",
                 filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
@@ -885,10 +908,16 @@ Se requiere validación con normas específicas y ensayos de prototipos."""
             )
             
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
+                def _escribir(trabajo):
+                    with instrumentacion.etapa("exportación JSON"), open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=4, ensure_ascii=False)
                 
-                messagebox.showinfo("Éxito", f"Datos exportados correctamente a {file_path}")
+                self.ejecutor.enviar(
+                    "exportar_json", _escribir,
+                    al_terminar=lambda _: messagebox.showinfo("Éxito", f"Datos exportados correctamente a {file_path}"),
+                    al_error=lambda e: messagebox.showerror("Error", f"Error al exportar: {str(e)}"),
+                    descripcion="Exportando JSON"
+                )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error al exportar: {str(e)}")
@@ -922,20 +951,53 @@ Se requiere validación con normas específicas y ensayos de prototipos."""
         self.verif_general_var.set("")
         self.text_output.delete(1.0, tk.END)
         self.text_verificacion.delete(1.0, tk.END)
+        if self._actualizacion_pendiente is not None:
+            self.root.after_cancel(self._actualizacion_pendiente)
+            self._actualizacion_pendiente = None
+        self._mostrar_todo = False
+        self.ejecutor.cancelar("diseno")
+        self.resultado = None
         
         # Limpiar gráfico
         if self.fig:
-            self.ax.clear()
-            self.ax.set_xlabel('Desplazamiento (mm)')
-            self.ax.set_ylabel('Fuerza (kN)')
-            self.ax.set_title('Curva de Histéresis del Aislador Sísmico')
-            self.ax.grid(True, alpha=0.3)
-            self.canvas.draw()
+            self.grafico.limpiar()
+
+_TIEMPO_IMPORTACION = time.perf_counter() - _INICIO_IMPORTACION
+
 
-def main():
+def reportar_tiempo(etiqueta, segundos, presupuesto):
+    estado = "OK" if segundos <= presupuesto else "EXCEDIDO"
+    print(f"{etiqueta}: {segundos:.3f} s (presupuesto {presupuesto:.3f} s) {estado}", file=sys.stderr)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Camino rápido: modo por lotes sin cargar la interfaz gráfica
+    if argv and argv[0] == "--lote":
+        import aislador_lote
+        return aislador_lote.main(argv[1:])
+    
+    medir_tiempos = "--tiempos" in argv
+    inicio = time.perf_counter()
+    cargar_interfaz()
     root = tk.Tk()
     app = AisladorSismicoASCE7App(root)
+    
+    if medir_tiempos:
+        def _primera_ventana(event):
+            if event.widget is root:
+                root.unbind("<Map>")
+                root.update_idletasks()
+                reportar_tiempo("Importación del módulo", _TIEMPO_IMPORTACION, PRESUPUESTO_IMPORTACION)
+                reportar_tiempo("Tiempo hasta la primera ventana", time.perf_counter() - inicio,
+                                PRESUPUESTO_PRIMERA_VENTANA)
+        root.bind("<Map>", _primera_ventana)
+    
     root.mainloop()
+    app.ejecutor.cerrar()
+    app.cache.cerrar()
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,365 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+
+import numpy as np
+
+import cache_resultados
+import espectros
+import historia_tiempo
+import motor_diseno
+import registros as registros_sismicos
+
+# Análisis dinámico incremental (IDA) del sistema de aislamiento y curvas de fragilidad.
+# Cada registro se escala a intensidades crecientes de Sa(T, 5%) (T: periodo efectivo del
+# diseño) y se integra el modelo no lineal del aislador (historia_tiempo). La demanda es el
+# desplazamiento máximo del aislador y los estados límite son umbrales de desplazamiento:
+# la deformación de corte límite del caucho (γ·T_r) y la holgura del foso perimetral.
+# Las intensidades se eligen con el algoritmo de caza y relleno (Vamvatsikos y Cornell):
+#   caza: pasos crecientes IM_j = IM_0 + j·paso + j(j−1)/2·incremento hasta superar el
+#         mayor umbral (o la intensidad máxima);
+#   acotamiento: bisección del intervalo donde cada umbral se supera por primera vez,
+#         hasta la tolerancia relativa;
+#   relleno: con las corridas restantes se parte el mayor hueco de intensidades.
+# La siguiente intensidad de un registro es función solo de sus corridas terminadas, así
+# que el planificador no tiene estado: en cada ronda todos los registros pendientes
+# proponen una corrida, las rondas se reparten en lotes vectorizados entre procesos, y
+# cada lote terminado se agrega a un punto de control JSONL (con fsync). Una campaña
+# interrumpida se reanuda leyendo el archivo, sin repetir corridas.
+# La capacidad de cada registro es la intensidad interpolada donde cruza el umbral; la
+# fragilidad lognormal (mediana y β) se ajusta por máxima verosimilitud, con los registros
+# que no alcanzan el umbral como datos censurados (algoritmo EM).
+
+CAZA = {
+    "inicial": 0.1,  # g
+    "paso": 0.1,  # g
+    "incremento": 0.05,  # g
+    "maxima": 5.0,  # g
+    "corridas": 12,  # corridas por registro
+    "tolerancia": 0.05,  # resolución relativa de la capacidad y del relleno
+}
+DEFORMACION_CORTE_LIMITE = 2.5  # γ límite del caucho (250%)
+AMORTIGUAMIENTO_INTENSIDAD = 0.05
+TAMANO_LOTE = 64  # máximo de corridas por tarea del grupo de procesos
+DECIMALES_INTENSIDAD = 9  # redondeo de las intensidades guardadas (clave de cada corrida)
+VERSION_CONTROL = 1
+
+
+def intensidad_caza(j, caza=CAZA):
+    return caza["inicial"] + j * caza["paso"] + j * (j - 1) / 2 * caza["incremento"]
+
+
+def _ordenar(corridas):
+    intensidades = np.array(sorted(corridas), dtype=float)
+    return intensidades, np.array([corridas[im] for im in intensidades.tolist()], dtype=float)
+
+
+def siguiente_intensidad(corridas, umbrales, caza=CAZA):
+    # Próxima intensidad de un registro a partir de sus corridas {intensidad: demanda (mm)},
+    # o None si el registro terminó
+    if len(corridas) >= caza["corridas"]:
+        return None
+    intensidades, demandas = _ordenar(corridas)
+    tope = max(umbrales.values())
+    if not np.any(demandas >= tope):
+        candidata = intensidad_caza(len(corridas), caza)
+        if candidata <= caza["maxima"]:
+            return round(candidata, DECIMALES_INTENSIDAD)
+
+    # Acotamiento: el intervalo relativo más ancho entre los umbrales ya superados
+    intervalos = []
+    for umbral in umbrales.values():
+        supera = demandas >= umbral
+        if supera.any():
+            h = int(np.argmax(supera))
+            alta, baja = intensidades[h], intensidades[h - 1] if h > 0 else 0.0
+            if alta - baja > caza["tolerancia"] * alta:
+                intervalos.append(((alta - baja) / alta, 0.5 * (alta + baja)))
+    if intervalos:
+        return round(max(intervalos)[1], DECIMALES_INTENSIDAD)
+
+    # Relleno: mitad del mayor hueco entre 0 y la mayor intensidad corrida
+    puntos = np.concatenate([[0.0], intensidades])
+    huecos = np.diff(puntos)
+    k = int(np.argmax(huecos))
+    if huecos[k] > caza["tolerancia"] * puntos[-1]:
+        return round(0.5 * (puntos[k] + puntos[k + 1]), DECIMALES_INTENSIDAD)
+    return None
+
+
+def capacidad(corridas, umbral):
+    # (intensidad de cruce del umbral, censurado): interpolación lineal entre la última
+    # corrida bajo el umbral y la primera que lo supera; sin cruce, la mayor intensidad
+    intensidades, demandas = _ordenar(corridas)
+    supera = demandas >= umbral
+    if not supera.any():
+        return float(intensidades[-1]), True
+    h = int(np.argmax(supera))
+    im_baja, d_baja = (intensidades[h - 1], demandas[h - 1]) if h > 0 else (0.0, 0.0)
+    fraccion = (umbral - d_baja) / max(demandas[h] - d_baja, 1e-12)
+    return float(im_baja + fraccion * (intensidades[h] - im_baja)), False
+
+
+def ajustar_lognormal(capacidades, censurados, max_iteraciones=500, tolerancia=1e-10):
+    # Máxima verosimilitud de ln(capacidad) ~ N(μ, β²) con censura por la derecha (EM:
+    # los censurados se reemplazan por la esperanza condicional de y e y² sobre y > c).
+    # Devuelve (mediana = e^μ, β); NaN si no hay capacidades observadas.
+    y = np.log(np.asarray(capacidades, dtype=float))
+    censurados = np.asarray(censurados, dtype=bool)
+    observados, limites = y[~censurados], y[censurados]
+    if observados.size == 0:
+        return float("nan"), float("nan")
+    mu = observados.mean()
+    sigma = observados.std() if observados.size > 1 and observados.std() > 0 else 0.3
+    if limites.size == 0:
+        return float(np.exp(mu)), float(observados.std())
+
+    normal = NormalDist()
+    for _ in range(max_iteraciones):
+        alfa = (limites - mu) / sigma
+        cola = np.array([1 - normal.cdf(a) for a in alfa.tolist()])
+        densidad = np.exp(-0.5 * alfa**2) / np.sqrt(2 * np.pi)
+        # Razón de Mills inversa; en la cola extrema λ → α
+        mills = np.where(cola > 1e-300, densidad / np.maximum(cola, 1e-300), alfa)
+        esperanza = mu + sigma * mills
+        esperanza2 = mu**2 + sigma**2 + sigma * (limites + mu) * mills
+        mu_nuevo = (observados.sum() + esperanza.sum()) / y.size
+        sigma_nuevo = np.sqrt(max((np.sum(observados**2) + esperanza2.sum()) / y.size - mu_nuevo**2, 1e-12))
+        convergido = abs(mu_nuevo - mu) < tolerancia and abs(sigma_nuevo - sigma) < tolerancia
+        mu, sigma = mu_nuevo, sigma_nuevo
+        if convergido:
+            break
+    return float(np.exp(mu)), float(sigma)
+
+
+def probabilidad_excedencia(intensidades, mediana, beta):
+    # P(demanda ≥ umbral | IM) = Φ(ln(IM/θ)/β)
+    normal = NormalDist()
+    z = np.log(np.maximum(np.asarray(intensidades, dtype=float), 1e-300) / mediana) / beta
+    return np.array([normal.cdf(v) for v in np.ravel(z).tolist()]).reshape(np.shape(z))
+
+
+def umbrales_diseno(diseno, holgura_mm, deformacion_limite=DEFORMACION_CORTE_LIMITE):
+    # Desplazamientos (mm) de cada estado límite de un diseño de un aislador
+    return {
+        "deformacion_corte": float(deformacion_limite * diseno["altura_caucho"]),
+        "holgura_foso": float(holgura_mm),
+    }
+
+
+class PuntoControl:
+    # Archivo JSONL: una cabecera con la clave de la campaña y una línea por corrida.
+    # Reabrir el archivo de otra campaña es un error; una última línea incompleta (corte
+    # durante la escritura) se descarta.
+    def __init__(self, ruta, clave, configuracion):
+        self.ruta = ruta
+        self.filas = []
+        if ruta is None:
+            self._archivo = None
+            return
+        if os.path.exists(ruta) and os.path.getsize(ruta) > 0:
+            self._leer(clave)
+            self._archivo = open(ruta, "a", encoding="utf-8")
+        else:
+            self._archivo = open(ruta, "w", encoding="utf-8")
+            self._escribir([{"campana": clave, "version": VERSION_CONTROL, "configuracion": configuracion}])
+
+    def _leer(self, clave):
+        with open(self.ruta, "rb+") as f:
+            contenido = f.read()
+            completo = contenido.rfind(b"\n") + 1
+            if completo < len(contenido):
+                f.truncate(completo)
+        lineas = contenido[:completo].decode("utf-8").splitlines()
+        cabecera = json.loads(lineas[0]) if lineas else {}
+        if cabecera.get("campana") != clave:
+            raise ValueError(f"El punto de control {self.ruta} corresponde a otra campaña "
+                             "(registros, diseño o parámetros distintos)")
+        self.filas = [json.loads(linea) for linea in lineas[1:] if linea.strip()]
+
+    def _escribir(self, filas):
+        self._archivo.writelines(json.dumps(fila, ensure_ascii=False) + "\n" for fila in filas)
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+
+    def registrar(self, filas):
+        self.filas.extend(filas)
+        if self._archivo is not None:
+            self._escribir(filas)
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+def correr_lote(aceleraciones_g, dt, diseno, opciones):
+    # Demanda de un lote de corridas ya escaladas (una fila por corrida), vectorizado
+    resultado = historia_tiempo.respuesta_historia_diseno(aceleraciones_g, dt, diseno, **opciones)
+    return resultado["desplazamiento_max_mm"], resultado["fuerza_max_kN"]
+
+
+def _correr_tarea(indices, aceleraciones_g, dt, diseno, opciones):
+    return (indices,) + correr_lote(aceleraciones_g, dt, diseno, opciones)
+
+
+def ejecutar_ida(registros, diseno, umbrales, ruta_control=None, periodo=None, caza=CAZA, trabajadores=None,
+                 tamano_lote=TAMANO_LOTE, opciones_modelo=None, progreso=None):
+    # registros: lista de (nombre, aceleraciones en g, dt); diseno: un aislador de
+    # motor_diseno; umbrales: {estado límite: desplazamiento en mm}.
+    # Devuelve {"periodo", "intensidad_unitaria", "corridas", "fragilidad"}.
+    nombres = [nombre for nombre, _, _ in registros]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError("Los nombres de los registros deben ser únicos")
+    if np.size(diseno["diametro"]) != 1:
+        raise ValueError("El IDA se aplica a un diseño de un solo aislador")
+    opciones_modelo = dict(opciones_modelo or {})
+    aceleraciones, dt = historia_tiempo.apilar_registros([(a, d) for _, a, d in registros])
+    diseno = {c: np.asarray(v).reshape(()) for c, v in diseno.items()}
+    periodo = float(diseno["periodo_aislado"]) if periodo is None else float(periodo)
+    sa = espectros.espectros_respuesta(aceleraciones, dt, [periodo], AMORTIGUAMIENTO_INTENSIDAD)[:, 0]
+    if np.any(sa <= 0):
+        raise ValueError("Hay registros con Sa(T) nula; no pueden escalarse")
+
+    masa, K1, K2, Fy = motor_diseno.parametros_bilineales(diseno)
+    configuracion = cache_resultados.normalizar({
+        "registros": nombres,
+        "huella_registros": hashlib.sha1(np.ascontiguousarray(aceleraciones).tobytes()).hexdigest(),
+        "dt": dt, "periodo": periodo, "modelo": [masa, K1, K2, Fy], "opciones": opciones_modelo,
+        "umbrales": umbrales, "caza": caza,
+    })
+    control = PuntoControl(ruta_control, cache_resultados.clave_cache("ida", configuracion), configuracion)
+    corridas = {nombre: {} for nombre in nombres}
+    for fila in control.filas:
+        if fila.get("registro") in corridas:
+            corridas[fila["registro"]][fila["intensidad"]] = fila["desplazamiento_max_mm"]
+    hechas_al_inicio = len(control.filas)
+
+    trabajadores = trabajadores or os.cpu_count() or 1
+    ejecutor = ProcessPoolExecutor(max_workers=trabajadores) if trabajadores > 1 else None
+    inicio_reloj = time.perf_counter()
+    try:
+        while True:
+            pendientes = [(i, im) for i, nombre in enumerate(nombres)
+                          for im in [siguiente_intensidad(corridas[nombre], umbrales, caza)] if im is not None]
+            if not pendientes:
+                break
+            indices = np.array([i for i, _ in pendientes])
+            intensidades = np.array([im for _, im in pendientes])
+            # Cada ronda se reparte entre todos los procesos (una ronda típica tiene una
+            # corrida por registro, muchas menos que tamano_lote)
+            lote = min(tamano_lote, -(-len(pendientes) // trabajadores))
+            tareas = []
+            for inicio in range(0, len(pendientes), lote):
+                parte = slice(inicio, inicio + lote)
+                escaladas = aceleraciones[indices[parte]] * (intensidades[parte] / sa[indices[parte]])[:, None]
+                tareas.append((np.arange(len(pendientes))[parte], escaladas, dt, diseno, opciones_modelo))
+
+            terminadas = (as_completed([ejecutor.submit(_correr_tarea, *t) for t in tareas]) if ejecutor
+                          else (_correr_tarea(*t) for t in tareas))
+            for tarea in terminadas:
+                posiciones, desplazamientos, fuerzas = tarea.result() if ejecutor else tarea
+                filas = []
+                for p, d, f in zip(posiciones.tolist(), desplazamientos.tolist(), fuerzas.tolist()):
+                    nombre, im = nombres[indices[p]], float(intensidades[p])
+                    corridas[nombre][im] = d
+                    filas.append({"registro": nombre, "intensidad": im, "desplazamiento_max_mm": d,
+                                  "fuerza_max_kN": f})
+                control.registrar(filas)
+                if progreso:
+                    progreso(len(control.filas) - hechas_al_inicio, sum(len(c) for c in corridas.values()),
+                             time.perf_counter() - inicio_reloj)
+    finally:
+        if ejecutor:
+            ejecutor.shutdown()
+        control.cerrar()
+
+    fragilidad = {}
+    for estado, umbral in umbrales.items():
+        capacidades = [capacidad(corridas[nombre], umbral) for nombre in nombres]
+        valores = np.array([c for c, _ in capacidades])
+        censurados = np.array([c for _, c in capacidades])
+        mediana, beta = ajustar_lognormal(valores, censurados)
+        fragilidad[estado] = {"umbral_mm": umbral, "mediana_g": mediana, "beta": beta,
+                              "capacidades_g": valores, "censurados": censurados}
+    return {
+        "periodo": periodo,
+        "intensidad_unitaria": dict(zip(nombres, sa.tolist())),
+        "corridas": {nombre: sorted(c.items()) for nombre, c in corridas.items()},
+        "corridas_nuevas": len(control.filas) - hechas_al_inicio,
+        "fragilidad": fragilidad,
+    }
+
+
+def reportar_progreso(nuevas, total, transcurrido):
+    print(f"\r{nuevas} corridas nuevas ({total} en total) - {transcurrido:.1f} s",
+          end="", file=sys.stderr, flush=True)
+
+
+def reporte(resultado):
+    lineas = [f"IDA con Sa(T = {resultado['periodo']:.3f} s, 5%)", "",
+              f"{'Estado límite':20s} {'Umbral mm':>10s} {'Mediana g':>10s} {'β':>7s} {'Censurados':>11s}"]
+    for estado, f in resultado["fragilidad"].items():
+        lineas.append(f"{estado:20s} {f['umbral_mm']:10.1f} {f['mediana_g']:10.4g} {f['beta']:7.3f} "
+                      f"{int(np.sum(f['censurados'])):5d}/{len(f['censurados']):<5d}")
+    return "\n".join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="IDA (caza y relleno) y fragilidad lognormal del sistema de aislamiento LRB."
+    )
+    parser.add_argument("registros", nargs="+", help="Registros .AT2 o de texto (g)")
+    parser.add_argument("--dt", type=float, help="Paso de los registros de texto sin columna de tiempo (s)")
+    parser.add_argument("--carga", type=float, required=True, help="Carga vertical (t)")
+    parser.add_argument("--desplazamiento", type=float, required=True, help="Desplazamiento de diseño (mm)")
+    parser.add_argument("--s1", type=float, required=True)
+    parser.add_argument("--sds", type=float, required=True)
+    parser.add_argument("--sd1", type=float, required=True)
+    parser.add_argument("--tl", type=float, required=True)
+    parser.add_argument("--holgura", type=float, help="Holgura del foso (mm); por defecto el desplazamiento de diseño")
+    parser.add_argument("--deformacion-limite", type=float, default=DEFORMACION_CORTE_LIMITE,
+                        help="Deformación de corte límite del caucho (2.5 = 250%%)")
+    parser.add_argument("--periodo", type=float, help="Periodo de Sa (s); por defecto el periodo efectivo del diseño")
+    parser.add_argument("--corridas", type=int, default=CAZA["corridas"], help="Corridas por registro")
+    parser.add_argument("--intensidad-maxima", type=float, default=CAZA["maxima"], help="Sa máxima de la caza (g)")
+    parser.add_argument("--modelo", choices=historia_tiempo.MODELOS, default="bilineal")
+    parser.add_argument("--calentamiento", action="store_true", help="Degradación de Qd por calentamiento del plomo")
+    parser.add_argument("--control", help="Punto de control JSONL (se reanuda si existe)")
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos (por defecto, núcleos disponibles)")
+    parser.add_argument("-o", "--salida", help="Resultados en JSON (corridas y fragilidad)")
+    args = parser.parse_args(argv)
+
+    caza = dict(CAZA, corridas=args.corridas, maxima=args.intensidad_maxima)
+    try:
+        diseno = motor_diseno.disenar_aisladores(args.carga, args.desplazamiento, args.s1, args.sds, args.sd1,
+                                                 args.tl)
+        cache = registros_sismicos.CacheRegistros()
+        suite = []
+        for ruta in args.registros:
+            aceleraciones, meta = cache.cargar(ruta, args.dt)
+            suite.append((os.path.basename(ruta), np.asarray(aceleraciones, dtype=float), meta["dt"]))
+        umbrales = umbrales_diseno(diseno, args.desplazamiento if args.holgura is None else args.holgura,
+                                   args.deformacion_limite)
+        resultado = ejecutar_ida(suite, diseno, umbrales, args.control, args.periodo, caza, args.trabajadores,
+                                 opciones_modelo={"modelo": args.modelo, "calentamiento": args.calentamiento},
+                                 progreso=reportar_progreso)
+        print(file=sys.stderr)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as f:
+                json.dump(cache_resultados.normalizar(resultado), f, indent=1, ensure_ascii=False)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(reporte(resultado))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import motor_diseno
+
+# Barrido paramétrico del espacio de diseño. Una grilla de valores de carga, desplazamiento
+# y parámetros sísmicos se expande (sin materializar el producto cartesiano) en bloques de
+# casos que se reparten en un grupo de procesos; cada bloque se diseña y verifica de forma
+# vectorizada. El resultado es un cubo compacto .npz con un eje por parámetro.
+
+PARAMETROS = ("carga_ton", "desplazamiento_max_mm", "S1", "SDS", "SD1", "TL")
+
+VALORES_POR_DEFECTO = {
+    "carga_ton": 200.0,
+    "desplazamiento_max_mm": 150.0,
+    "S1": 0.6,
+    "SDS": 1.0,
+    "SD1": 0.8,
+    "TL": 8.0,
+}
+
+# Resultados guardados en el cubo y su tipo compacto
+CAMPOS_DISENO = {
+    "diametro": np.float32,
+    "num_capas": np.int16,
+    "altura_caucho": np.float32,
+    "altura_total": np.float32,
+    "fuerza_fluencia": np.float32,
+    "rigidez_horizontal": np.float32,
+    "rigidez_vertical": np.float32,
+    "periodo_aislado": np.float32,
+    "desplazamiento_total": np.float32,
+}
+CAMPOS_VERIFICACION = ("cumple_esfuerzo", "cumple_deformacion", "cumple_estabilidad",
+                       "cumple_amortiguamiento", "cumple_general")
+
+TAMANO_BLOQUE = 200_000
+
+
+def normalizar_grilla(grilla):
+    # Completa la grilla con los valores por defecto y la convierte en ejes 1D
+    ejes = {}
+    for nombre in PARAMETROS:
+        valores = np.atleast_1d(np.asarray(grilla.get(nombre, VALORES_POR_DEFECTO[nombre]), dtype=float))
+        if valores.ndim != 1 or valores.size == 0:
+            raise ValueError(f"El eje '{nombre}' debe ser una lista no vacía de valores")
+        ejes[nombre] = valores
+    desconocidos = set(grilla) - set(PARAMETROS)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos en la grilla: {', '.join(sorted(desconocidos))}")
+    return ejes
+
+
+def evaluar_bloque(ejes, inicio, fin):
+    # Diseña y verifica los casos con índice plano en [inicio, fin)
+    forma = tuple(len(ejes[n]) for n in PARAMETROS)
+    indices = np.unravel_index(np.arange(inicio, fin), forma)
+    valores = {n: ejes[n][i] for n, i in zip(PARAMETROS, indices)}
+
+    diseno = motor_diseno.disenar_aisladores(
+        valores["carga_ton"], valores["desplazamiento_max_mm"],
+        valores["S1"], valores["SDS"], valores["SD1"], valores["TL"]
+    )
+    verificacion = motor_diseno.verificar_aisladores(diseno)
+
+    resultado = {c: diseno[c].astype(t) for c, t in CAMPOS_DISENO.items()}
+    resultado.update({c: verificacion[c] for c in CAMPOS_VERIFICACION})
+    return inicio, fin, resultado
+
+
+def _evaluar_bloque_empaquetado(argumentos):
+    return evaluar_bloque(*argumentos)
+
+
+def ejecutar_barrido(grilla, trabajadores=None, tamano_bloque=TAMANO_BLOQUE, progreso=None):
+    # Devuelve (ejes, cubo) donde cada arreglo del cubo tiene la forma de la grilla
+    ejes = normalizar_grilla(grilla)
+    forma = tuple(len(ejes[n]) for n in PARAMETROS)
+    total = int(np.prod(forma))
+
+    cubo = {c: np.empty(total, dtype=t) for c, t in CAMPOS_DISENO.items()}
+    cubo.update({c: np.empty(total, dtype=bool) for c in CAMPOS_VERIFICACION})
+
+    bloques = [(ejes, inicio, min(inicio + tamano_bloque, total)) for inicio in range(0, total, tamano_bloque)]
+    trabajadores = trabajadores or os.cpu_count() or 1
+
+    inicio_reloj = time.perf_counter()
+    completados = 0
+
+    def _recibir(inicio, fin, resultado):
+        nonlocal completados
+        for campo, valores in resultado.items():
+            cubo[campo][inicio:fin] = valores
+        completados += fin - inicio
+        if progreso:
+            progreso(completados, total, time.perf_counter() - inicio_reloj)
+
+    if trabajadores == 1 or len(bloques) == 1:
+        for bloque in bloques:
+            _recibir(*evaluar_bloque(*bloque))
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            for resultado in ejecutor.map(_evaluar_bloque_empaquetado, bloques):
+                _recibir(*resultado)
+
+    return ejes, {campo: valores.reshape(forma) for campo, valores in cubo.items()}
+
+
+def guardar_cubo(ruta, ejes, cubo):
+    # Los ejes se guardan como "eje_<parámetro>" y el orden de los ejes en "parametros"
+    np.savez_compressed(
+        ruta,
+        parametros=np.array(PARAMETROS),
+        **{f"eje_{n}": ejes[n] for n in PARAMETROS},
+        **cubo
+    )
+
+
+def interpretar_eje(texto):
+    # "a:b:n" -> n valores equiespaciados entre a y b; "v1,v2,..." -> lista explícita
+    if ":" in texto:
+        partes = texto.split(":")
+        if len(partes) != 3:
+            raise argparse.ArgumentTypeError(f"Rango inválido '{texto}', use inicio:fin:n")
+        return np.linspace(float(partes[0]), float(partes[1]), int(partes[2]))
+    return np.array([float(v) for v in texto.split(",")])
+
+
+def reportar_progreso(completados, total, transcurrido):
+    velocidad = completados / transcurrido if transcurrido > 0 else 0.0
+    print(f"\r{completados}/{total} casos ({100 * completados / total:.1f}%) - {velocidad:,.0f} casos/s",
+          end="" if completados < total else "\n", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Barrido paramétrico del diseño de aisladores LRB (ASCE 7-16)."
+    )
+    parser.add_argument("-o", "--salida", default="barrido.npz", help="Archivo .npz del cubo de resultados")
+    parser.add_argument("--carga", dest="carga_ton", type=interpretar_eje, help="Carga vertical (t)")
+    parser.add_argument("--desplazamiento", dest="desplazamiento_max_mm", type=interpretar_eje,
+                        help="Desplazamiento de diseño (mm)")
+    parser.add_argument("--s1", dest="S1", type=interpretar_eje)
+    parser.add_argument("--sds", dest="SDS", type=interpretar_eje)
+    parser.add_argument("--sd1", dest="SD1", type=interpretar_eje)
+    parser.add_argument("--tl", dest="TL", type=interpretar_eje)
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos (por defecto, núcleos disponibles)")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Casos por bloque")
+    args = parser.parse_args(argv)
+
+    grilla = {n: getattr(args, n) for n in PARAMETROS if getattr(args, n) is not None}
+    try:
+        ejes, cubo = ejecutar_barrido(grilla, args.trabajadores, args.bloque, reportar_progreso)
+        guardar_cubo(args.salida, ejes, cubo)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Cubo de forma {cubo['diametro'].shape} guardado en {args.salida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+
+import numpy as np
+
+import edificio_aislado
+import grafo_diseno
+import graficos
+import historia_tiempo
+import histeresis
+import motor_diseno
+from resultados import ResultadoDiseno
+
+# Banco de pruebas de rendimiento de los caminos principales: diseño de un aislador (lógica
+# de calcular, vía el grafo de diseño), verificación (lógica de verificar), lotes de 10^3 a
+# 10^6 aisladores, curva de histéresis (lógica de generar_grafico), historia en el tiempo
+# con y sin calentamiento del plomo, exportación JSON e importación/arranque del módulo de
+# la interfaz.
+# Las entradas salen de un generador con semilla fija, así que dos corridas miden
+# exactamente el mismo trabajo. Cada caso se calibra (bucles por repetición hasta superar
+# TIEMPO_MINIMO_S), se repite y se resume con mínimo, mediana, media, desviación e IQR.
+# Los resultados se guardan en JSON con metadatos (commit, Python, NumPy, plataforma) y
+# --comparar contrasta dos archivos: una regresión es un caso cuya mediana y mínimo
+# empeoran ambos más que el umbral, lo que filtra la mayor parte del ruido.
+
+VERSION_RESULTADOS = 1
+SEMILLA = 20240517
+REPETICIONES = 7
+TIEMPO_MINIMO_S = 0.05  # duración mínima de una repetición (se agregan bucles)
+UMBRAL_REGRESION = 0.10  # 10% más lento
+TAMANOS_LOTE = (1_000, 10_000, 100_000, 1_000_000)
+TAMANO_MAXIMO_RAPIDO = 100_000
+RUTA_MODULO_INTERFAZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def entradas_aleatorias(n, semilla=SEMILLA):
+    # Cuadro reproducible de n aisladores con parámetros sísmicos variados
+    rng = np.random.default_rng(semilla)
+    return {
+        "carga_ton": rng.uniform(50.0, 600.0, n),
+        "desplazamiento_max_mm": rng.uniform(100.0, 400.0, n),
+        "S1": rng.uniform(0.3, 1.2, n),
+        "SDS": rng.uniform(0.6, 2.0, n),
+        "SD1": rng.uniform(0.3, 1.2, n),
+        "TL": rng.choice([4.0, 6.0, 8.0, 12.0], n),
+    }
+
+
+def _diseno_individual():
+    entradas = dict(grafo_diseno.ENTRADAS_DISENO)
+    grafo = grafo_diseno.crear_grafo_diseno(entradas)
+    grafo.recalcular()
+    return ResultadoDiseno.desde_valores(grafo.valores)
+
+
+# Cada preparador recibe el tamaño n y devuelve la función a medir (sin argumentos);
+# la preparación de datos queda fuera de la medición.
+
+def preparar_calcular(n):
+    # Diseño completo de un aislador con un grafo nuevo (pasos 1-10 más verificaciones)
+    entradas = dict(grafo_diseno.ENTRADAS_DISENO)
+
+    def medir():
+        grafo = grafo_diseno.crear_grafo_diseno(entradas)
+        grafo.recalcular()
+        return grafo.valores
+    return medir
+
+
+def preparar_calcular_incremental(n):
+    # Cambio de carga en un grafo existente, como en la actualización en vivo
+    grafo = grafo_diseno.crear_grafo_diseno(dict(grafo_diseno.ENTRADAS_DISENO))
+    grafo.recalcular()
+    cargas = itertools.cycle([200.0, 260.0])
+
+    def medir():
+        grafo.asignar("carga_ton", next(cargas))
+        return grafo.recalcular()
+    return medir
+
+
+def preparar_verificar(n):
+    diseno = motor_diseno.disenar_aisladores(**{k: v[0] for k, v in entradas_aleatorias(1).items()})
+    return lambda: ResultadoDiseno.desde_diseno(diseno)
+
+
+def preparar_lote(n):
+    # Diseño y verificación vectorizados de n aisladores
+    entradas = entradas_aleatorias(n)
+
+    def medir():
+        diseno = motor_diseno.disenar_aisladores(**entradas)
+        return motor_diseno.verificar_aisladores(diseno)
+    return medir
+
+
+def preparar_limites(n):
+    # Propiedades nominales, superiores e inferiores de n aisladores ya diseñados
+    diseno = motor_diseno.disenar_aisladores(**entradas_aleatorias(n))
+    return lambda: motor_diseno.verificar_limites(motor_diseno.analizar_limites(diseno))
+
+
+def preparar_histeresis(n):
+    # Lazo bilineal y diezmado para pantalla, como generar_grafico y GraficoHisteresis
+    r = _diseno_individual()
+    _, K1, K2, Fy = r.parametros_bilineales()
+    K1, K2 = K1 / 1000, K2 / 1000  # kN/mm
+    desplazamiento_total = r.desplazamiento_total
+    desplazamientos = desplazamiento_total * np.concatenate([
+        np.linspace(0, 1, n), np.linspace(1, -1, 2 * n), np.linspace(-1, 1, 2 * n)])
+
+    def medir():
+        fuerzas = histeresis.lazo_bilineal(desplazamientos, K1, K2, Fy)
+        return graficos.diezmar_minmax(desplazamientos, fuerzas, 2 * 800)
+    return medir
+
+
+def _registros_prueba(n_pasos=2000, dt=0.01):
+    # Tres pulsos sinusoidales de 0.4 g (periodos de 1, 2 y 3 s)
+    t = np.arange(n_pasos) * dt
+    return np.stack([0.4 * np.sin(2 * np.pi * t / T) * np.exp(-((t - 8) / 4)**2) for T in (1.0, 2.0, 3.0)])
+
+
+def preparar_historia(n, calentamiento=False):
+    # Historia en el tiempo de n aisladores bajo 3 registros de 2000 pasos
+    diseno = motor_diseno.disenar_aisladores(**entradas_aleatorias(n))
+    registros = _registros_prueba()
+    return lambda: historia_tiempo.respuesta_historia_diseno(registros, 0.01, diseno, calentamiento=calentamiento)
+
+
+def preparar_historia_plomo(n):
+    # Igual que historia, con calentamiento del plomo y degradación de Qd en cada paso
+    return preparar_historia(n, calentamiento=True)
+
+
+def preparar_edificio(n):
+    # Edificio de n pisos sobre la capa de aislamiento: 3 registros x 3 límites, 2000 pasos
+    diseno = motor_diseno.disenar_aisladores(**entradas_aleatorias(40))
+    K1, K2, Fy = edificio_aislado.parametros_capa(motor_diseno.analizar_limites(diseno))
+    masas, rigideces = edificio_aislado.edificio_uniforme(n, diseno["carga_kN"].sum() / motor_diseno.GRAVEDAD / (n + 1),
+                                                          2e6)
+    registros = _registros_prueba()
+    return lambda: edificio_aislado.respuesta_edificio(registros, 0.01, masas, rigideces, K1, K2, Fy)
+
+
+def preparar_exportar_json(n):
+    # Misma estructura que escribe exportar_json, a un archivo temporal
+    r = _diseno_individual()
+    datos = {
+        "carga_ton": r.carga_ton,
+        "desplazamiento_max_mm": r.desplazamiento_max_mm,
+        "parametros_sismicos": {"S1": r.S1, "SDS": r.SDS, "SD1": r.SD1, "TL": r.TL},
+        "resultados_diseno": {nombre: getattr(r, nombre) for nombre in ResultadoDiseno.campos()
+                              if not nombre.startswith("cumple_")},
+        "verificaciones": {nombre: getattr(r, nombre) for nombre in ResultadoDiseno.campos()
+                           if nombre.startswith("cumple_")},
+    }
+    descriptor, ruta = tempfile.mkstemp(suffix=".json")
+    os.close(descriptor)
+
+    def medir():
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=4, ensure_ascii=False)
+    weakref.finalize(medir, os.remove, ruta)
+    return medir
+
+
+def _importar_interfaz():
+    # Proceso nuevo; devuelve el tiempo de importación que mide el propio módulo
+    salida = subprocess.run(
+        [sys.executable, "-c", "import aislador_sismico_asce7 as m; print(m._TIEMPO_IMPORTACION)"],
+        cwd=RUTA_MODULO_INTERFAZ, capture_output=True, text=True, check=True)
+    return float(salida.stdout)
+
+
+def preparar_importacion(n):
+    return _importar_interfaz
+
+
+def preparar_arranque(n):
+    # Proceso completo: intérprete + importación del módulo de la interfaz
+    return _importar_interfaz
+
+
+# nombre: (preparador, tamaños, medición interna)
+# Con medición interna el caso devuelve su propio tiempo (p. ej. medido en otro proceso)
+CASOS = {
+    "calcular": (preparar_calcular, (1,), False),
+    "calcular_incremental": (preparar_calcular_incremental, (1,), False),
+    "verificar": (preparar_verificar, (1,), False),
+    "lote": (preparar_lote, TAMANOS_LOTE, False),
+    "limites": (preparar_limites, TAMANOS_LOTE, False),
+    "histeresis": (preparar_histeresis, (100, 10_000), False),
+    "historia": (preparar_historia, (100, 1_000), False),
+    "historia_plomo": (preparar_historia_plomo, (100, 1_000), False),
+    "edificio": (preparar_edificio, (10, 50), False),
+    "exportar_json": (preparar_exportar_json, (1,), False),
+    "importacion": (preparar_importacion, (1,), True),
+    "arranque": (preparar_arranque, (1,), False),
+}
+
+
+def nombre_caso(caso, n):
+    return caso if len(CASOS[caso][1]) == 1 else f"{caso}[n={n}]"
+
+
+def calibrar(funcion, tiempo_minimo=TIEMPO_MINIMO_S):
+    # Bucles por repetición, duplicando hasta superar tiempo_minimo (como timeit.autorange)
+    bucles = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(bucles):
+            funcion()
+        if time.perf_counter() - inicio >= tiempo_minimo or bucles >= 1 << 20:
+            return bucles
+        bucles *= 2
+
+
+def resumir(tiempos):
+    # Estadísticas por llamada (segundos) de una lista de tiempos por repetición
+    ordenados = sorted(tiempos)
+    cuartiles = statistics.quantiles(ordenados, n=4) if len(ordenados) > 1 else ordenados * 3
+    return {
+        "minimo_s": ordenados[0],
+        "mediana_s": statistics.median(ordenados),
+        "media_s": statistics.fmean(ordenados),
+        "desviacion_s": statistics.stdev(ordenados) if len(ordenados) > 1 else 0.0,
+        "iqr_s": cuartiles[2] - cuartiles[0],
+        "maximo_s": ordenados[-1],
+    }
+
+
+def medir_caso(caso, n, repeticiones=REPETICIONES, tiempo_minimo=TIEMPO_MINIMO_S):
+    preparar, _, medicion_interna = CASOS[caso]
+    funcion = preparar(n)
+    if medicion_interna:
+        funcion()  # calentamiento (caché de disco, .pyc)
+        tiempos = [funcion() for _ in range(repeticiones)]
+        bucles = 1
+    else:
+        bucles = calibrar(funcion, tiempo_minimo)
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            for _ in range(bucles):
+                funcion()
+            tiempos.append((time.perf_counter() - inicio) / bucles)
+    resumen = resumir(tiempos)
+    resumen.update(n=n, repeticiones=repeticiones, bucles=bucles,
+                   por_segundo=n / resumen["mediana_s"], tiempos_s=tiempos)
+    return resumen
+
+
+def metadatos():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RUTA_MODULO_INTERFAZ,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": VERSION_RESULTADOS,
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+        "semilla": SEMILLA,
+    }
+
+
+def ejecutar(casos, repeticiones=REPETICIONES, tamano_maximo=None, tiempo_minimo=TIEMPO_MINIMO_S, informar=None):
+    resultados = {}
+    for caso in casos:
+        for n in CASOS[caso][1]:
+            if tamano_maximo is not None and n > tamano_maximo:
+                continue
+            nombre = nombre_caso(caso, n)
+            resultados[nombre] = medir_caso(caso, n, repeticiones, tiempo_minimo)
+            if informar is not None:
+                informar(nombre, resultados[nombre])
+    return {**metadatos(), "casos": resultados}
+
+
+def _formatear_tiempo(segundos):
+    for unidad, escala in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= escala:
+            return f"{segundos / escala:8.3f} {unidad}"
+    return f"{segundos / 1e-9:8.1f} ns"
+
+
+def linea_resultado(nombre, r):
+    rendimiento = f"  {r['por_segundo']:12,.0f} /s" if r["n"] > 1 else ""
+    return (f"{nombre:28s} mediana {_formatear_tiempo(r['mediana_s'])}  mín. {_formatear_tiempo(r['minimo_s'])}"
+            f"  IQR {_formatear_tiempo(r['iqr_s'])}{rendimiento}")
+
+
+def comparar(base, nuevo, umbral=UMBRAL_REGRESION):
+    # Filas (nombre, razón de medianas, estado) para los casos comunes a ambos archivos
+    filas = []
+    for nombre, r_nuevo in nuevo["casos"].items():
+        r_base = base["casos"].get(nombre)
+        if r_base is None:
+            continue
+        razon = r_nuevo["mediana_s"] / r_base["mediana_s"]
+        razon_minimo = r_nuevo["minimo_s"] / r_base["minimo_s"]
+        if razon > 1 + umbral and razon_minimo > 1 + umbral:
+            estado = "REGRESIÓN"
+        elif razon < 1 / (1 + umbral) and razon_minimo < 1 / (1 + umbral):
+            estado = "mejora"
+        else:
+            estado = "igual"
+        filas.append((nombre, r_base["mediana_s"], r_nuevo["mediana_s"], razon, estado))
+    return filas
+
+
+def cargar(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("version") != VERSION_RESULTADOS or "casos" not in datos:
+        raise ValueError(f"{ruta}: no es un archivo de resultados de benchmark (versión {VERSION_RESULTADOS})")
+    return datos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento del diseño de aisladores LRB.")
+    parser.add_argument("-o", "--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--casos", default=",".join(CASOS),
+                        help=f"Casos separados por comas (disponibles: {', '.join(CASOS)})")
+    parser.add_argument("-r", "--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--rapido", action="store_true",
+                        help=f"Omite tamaños mayores que {TAMANO_MAXIMO_RAPIDO:,} y usa 3 repeticiones")
+    parser.add_argument("--comparar", nargs="+", metavar="JSON",
+                        help="Compara con un archivo base (y opcionalmente otro en lugar de una corrida nueva)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="Fracción de empeoramiento considerada regresión")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comparar and len(args.comparar) > 2:
+            raise ValueError("--comparar acepta uno o dos archivos")
+        base = cargar(args.comparar[0]) if args.comparar else None
+        if args.comparar and len(args.comparar) == 2:
+            nuevo = cargar(args.comparar[1])
+        else:
+            casos = [c.strip() for c in args.casos.split(",") if c.strip()]
+            desconocidos = [c for c in casos if c not in CASOS]
+            if desconocidos:
+                raise ValueError(f"Casos desconocidos: {', '.join(desconocidos)}")
+            repeticiones = 3 if args.rapido else args.repeticiones
+            if repeticiones < 1:
+                raise ValueError("Se requiere al menos una repetición")
+            nuevo = ejecutar(casos, repeticiones, TAMANO_MAXIMO_RAPIDO if args.rapido else None,
+                             informar=lambda nombre, r: print(linea_resultado(nombre, r), flush=True))
+            if args.salida:
+                with open(args.salida, "w", encoding="utf-8") as f:
+                    json.dump(nuevo, f, indent=2)
+    except (ValueError, OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if base is None:
+        return 0
+    filas = comparar(base, nuevo, args.umbral)
+    print(f"\nBase {base.get('commit') or '?'} ({base['fecha']}) → nuevo {nuevo.get('commit') or '?'}")
+    for nombre, t_base, t_nuevo, razon, estado in filas:
+        print(f"{nombre:28s} {_formatear_tiempo(t_base)} → {_formatear_tiempo(t_nuevo)}  x{razon:6.3f}  {estado}")
+    regresiones = sum(estado == "REGRESIÓN" for *_, estado in filas)
+    print(f"{len(filas)} casos comparados, {regresiones} regresiones (umbral {args.umbral:.0%})")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import motor_diseno
+
+# Memoización persistente de resultados (diseño, histéresis, reportes).
+# La clave es la tupla de entrada normalizada más la versión del motor de diseño, de modo
+# que un cambio en las fórmulas invalida automáticamente los resultados guardados.
+# Hay dos niveles: una LRU en memoria (respuesta inmediata dentro de la sesión) y una base
+# SQLite en disco, compartida entre sesiones, que también desaloja lo menos usado.
+# Los aciertos en disco no escriben: la fecha de uso se acumula en memoria y se vuelca en
+# una sola transacción cada USOS_POR_VOLCADO aciertos, antes de escribir o desalojar y al
+# cerrar. El número de filas se lleva como contador (se cuenta una vez al abrir); solo al
+# superar la capacidad se recuenta y se desaloja, con holgura para no repetirlo en cada escritura.
+# sqlite3 se importa al abrir la base por primera vez, para no pesar en el arranque.
+
+RUTA_CACHE = os.environ.get(
+    "AISLADOR_CACHE_RESULTADOS", os.path.join(os.path.expanduser("~"), ".aislador_sismico", "resultados.sqlite")
+)
+CAPACIDAD_MEMORIA = 256  # entradas en la LRU en memoria
+CAPACIDAD_DISCO = 100000  # entradas en la base SQLite
+HOLGURA_DESALOJO = 0.05  # fracción de la capacidad que se libera de más al desalojar
+USOS_POR_VOLCADO = 256  # aciertos en disco acumulados antes de actualizar "usado"
+CIFRAS_SIGNIFICATIVAS = 12  # los flotantes de la clave se redondean (1e-12 relativo)
+
+
+def normalizar(valor):
+    # Lleva un argumento a una forma JSON estable: flotantes redondeados, arreglos y
+    # escalares de NumPy a listas/números de Python, tuplas a listas
+    if isinstance(valor, (bool, np.bool_)):
+        return bool(valor)
+    if isinstance(valor, (int, np.integer)):
+        return int(valor)
+    if isinstance(valor, (float, np.floating)):
+        return float(f"{float(valor):.{CIFRAS_SIGNIFICATIVAS}g}") + 0.0  # +0.0 unifica -0.0
+    if isinstance(valor, np.ndarray):
+        return normalizar(valor.tolist())
+    if isinstance(valor, (list, tuple)):
+        return [normalizar(v) for v in valor]
+    if isinstance(valor, dict):
+        return {str(k): normalizar(v) for k, v in sorted(valor.items())}
+    if valor is None or isinstance(valor, str):
+        return valor
+    raise TypeError(f"Argumento no admitido en la clave de caché: {type(valor).__name__}")
+
+
+def clave_cache(espacio, argumentos, version=motor_diseno.VERSION_MOTOR):
+    texto = json.dumps([version, espacio, normalizar(argumentos)], separators=(",", ":"))
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+class CacheResultados:
+    def __init__(self, ruta=RUTA_CACHE, capacidad=CAPACIDAD_MEMORIA, capacidad_disco=CAPACIDAD_DISCO,
+                 version=motor_diseno.VERSION_MOTOR):
+        # ruta=None deja solo el nivel en memoria
+        self.ruta = ruta
+        self.capacidad = capacidad
+        self.capacidad_disco = capacidad_disco
+        self.version = version
+        self._memoria = OrderedDict()
+        self._conexion = None
+        self._filas_disco = 0
+        self._usos = {}  # clave -> fecha de uso pendiente de escribir
+        self._bloqueo = threading.RLock()
+        self.contadores = {"aciertos_memoria": 0, "aciertos_disco": 0, "fallos": 0,
+                           "desalojos_memoria": 0, "desalojos_disco": 0}
+
+    # --- nivel en disco ---
+
+    def _base(self):
+        # Conexión perezosa; si la base no se puede abrir se sigue solo en memoria
+        if self._conexion is None and self.ruta:
+            import sqlite3
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+                conexion = sqlite3.connect(self.ruta, timeout=5.0, check_same_thread=False)
+                conexion.execute("PRAGMA journal_mode=WAL")
+                conexion.execute("CREATE TABLE IF NOT EXISTS resultados ("
+                                 "clave TEXT PRIMARY KEY, espacio TEXT, valor BLOB, usado REAL)")
+                conexion.execute("CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)")
+                conexion.commit()
+                self._filas_disco = conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+                self._conexion = conexion
+            except (sqlite3.Error, OSError):
+                self.ruta = None
+        return self._conexion
+
+    def _leer_disco(self, clave):
+        import sqlite3
+        base = self._base()
+        if base is None:
+            return None
+        try:
+            fila = base.execute("SELECT valor FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            if fila is None:
+                return None
+            self._usos[clave] = time.time()
+            if len(self._usos) >= USOS_POR_VOLCADO:
+                self._volcar_usos()
+            return pickle.loads(fila[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def _volcar_usos(self, confirmar=True):
+        # Escribe las fechas de uso acumuladas en una sola transacción
+        if self._usos and self._conexion is not None:
+            self._conexion.executemany("UPDATE resultados SET usado = ? WHERE clave = ?",
+                                       [(usado, clave) for clave, usado in self._usos.items()])
+            if confirmar:
+                self._conexion.commit()
+        self._usos.clear()
+
+    def _escribir_disco(self, clave, espacio, valor):
+        import sqlite3
+        base = self._base()
+        if base is None:
+            return
+        try:
+            # Las fechas de uso pendientes entran en la misma transacción, antes de desalojar
+            self._volcar_usos(confirmar=False)
+            base.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?)",
+                         (clave, espacio, pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL), time.time()))
+            self._filas_disco += 1
+            if self._filas_disco > self.capacidad_disco:
+                # Recuento exacto (otros procesos también escriben) y desalojo con holgura
+                filas = base.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+                exceso = filas - self.capacidad_disco
+                if exceso > 0:
+                    exceso += int(HOLGURA_DESALOJO * self.capacidad_disco)
+                    base.execute("DELETE FROM resultados WHERE clave IN "
+                                 "(SELECT clave FROM resultados ORDER BY usado LIMIT ?)", (exceso,))
+                    self.contadores["desalojos_disco"] += min(exceso, filas)
+                    filas = max(filas - exceso, 0)
+                self._filas_disco = filas
+            base.commit()
+        except sqlite3.Error:
+            pass
+
+    # --- nivel en memoria ---
+
+    def _guardar_memoria(self, clave, valor):
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+            self.contadores["desalojos_memoria"] += 1
+
+    # --- interfaz ---
+
+    def obtener(self, espacio, argumentos, calcular):
+        # Devuelve el resultado memoizado de calcular() para (espacio, argumentos)
+        clave = clave_cache(espacio, argumentos, self.version)
+        with self._bloqueo:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.contadores["aciertos_memoria"] += 1
+                return self._memoria[clave]
+            valor = self._leer_disco(clave)
+            if valor is not None:
+                self.contadores["aciertos_disco"] += 1
+                self._guardar_memoria(clave, valor)
+                return valor
+            self.contadores["fallos"] += 1
+
+        valor = calcular()
+        with self._bloqueo:
+            self._guardar_memoria(clave, valor)
+            self._escribir_disco(clave, espacio, valor)
+        return valor
+
+    def limpiar(self, disco=True):
+        with self._bloqueo:
+            self._memoria.clear()
+            base = self._base() if disco else None
+            if base is not None:
+                self._usos.clear()
+                base.execute("DELETE FROM resultados")
+                base.commit()
+                self._filas_disco = 0
+
+    def estadisticas(self):
+        with self._bloqueo:
+            estadisticas = dict(self.contadores, entradas_memoria=len(self._memoria))
+            base = self._base()
+            if base is not None:
+                estadisticas["entradas_disco"] = base.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+                self._filas_disco = estadisticas["entradas_disco"]
+        consultas = estadisticas["aciertos_memoria"] + estadisticas["aciertos_disco"] + estadisticas["fallos"]
+        estadisticas["tasa_aciertos"] = (consultas - estadisticas["fallos"]) / consultas if consultas else 0.0
+        return estadisticas
+
+    def cerrar(self):
+        with self._bloqueo:
+            if self._conexion is not None:
+                import sqlite3
+                try:
+                    self._volcar_usos()
+                except sqlite3.Error:
+                    pass
+                self._conexion.close()
+                self._conexion = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Administración de la caché de resultados de diseño.")
+    parser.add_argument("--ruta", default=RUTA_CACHE, help="Base SQLite de la caché")
+    parser.add_argument("--limpiar", action="store_true", help="Borrar todas las entradas")
+    args = parser.parse_args(argv)
+
+    cache = CacheResultados(args.ruta)
+    if args.limpiar:
+        cache.limpiar()
+    print(json.dumps(cache.estadisticas(), indent=1, ensure_ascii=False))
+    cache.cerrar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import numpy as np
+
+import motor_diseno
+
+# Calentamiento del núcleo de plomo y degradación de Qd (Kalpakidis y Constantinou, 2009).
+# La resistencia del plomo cae exponencialmente con el aumento de temperatura del núcleo
+#     σ_YL(T) = σ_YL0·exp(−E2·T)   →   Qd(T) = Qd0·exp(−E2·T)
+# y el núcleo se calienta con el trabajo del plomo y se enfría por conducción hacia las
+# placas de acero (ec. 23 del artículo):
+#     ρc·h·dT/dt = σ_YL(T)·z·du/dt − (k_s·T/a)·[1/F(τ) + 1.274·(t_s/a)·τ^(−1/3)],
+#     τ = α_s·t/a²
+# con a el radio del núcleo, h su altura (caucho más placas internas) y t_s el espesor
+# total de acero. El paso de temperatura es explícito y elemento a elemento, de modo que
+# el estado se vectoriza sobre todos los aisladores y registros. El término de conducción
+# solo depende del tiempo y de la geometría, así que los núcleos de histéresis y de
+# historia en el tiempo lo precalculan para todos los pasos (retencion_conduccion) y en el
+# ciclo solo quedan unas pocas operaciones de arreglo por paso.
+# T es el aumento de temperatura sobre la inicial (°C).
+
+COEF_TEMPERATURA = 0.0069  # E2, 1/°C
+CALOR_VOLUMETRICO_PLOMO = 11200 * 130  # ρ_L·c_L, J/(m³·°C)
+CONDUCTIVIDAD_ACERO = 50.0  # k_s, W/(m·°C)
+DIFUSIVIDAD_ACERO = 1.41e-5  # α_s, m²/s
+
+
+def funcion_F(tau):
+    # F(τ) de la solución de conducción en el acero (aproximaciones para τ < 0.6 y τ ≥ 0.6)
+    # (cada rama se evalúa solo donde aplica: es lo más costoso de retencion_conduccion)
+    tau = np.maximum(np.asarray(tau, dtype=float), 1e-12)
+    F = np.empty(tau.shape)
+    corto = tau < 0.6
+    t = tau[corto]
+    r = t / 4
+    F[corto] = 2 * np.sqrt(t / np.pi) - t / np.pi * (2 - r * (1 + r * (1 + 15 / 4 * r)))
+    t = tau[~corto]
+    s = 1 / (4 * t)
+    F[~corto] = 8 / (3 * np.pi) - (1 - s * (1 / 3 - s * (1 / 6 - s / 12))) / (2 * np.sqrt(np.pi * t))
+    return F
+
+
+class NucleoPlomo:
+    # Estado térmico de un lote de núcleos de plomo. El estado se conserva entre llamadas
+    # (ensayos o registros sucesivos sobre el mismo aislador); reiniciar() vuelve a T = 0.
+    def __init__(self, radio_m, altura_m, espesor_acero_m):
+        self.radio = np.asarray(radio_m, dtype=float)
+        self.altura = np.asarray(altura_m, dtype=float)
+        self.espesor_acero = np.asarray(espesor_acero_m, dtype=float)
+        if np.any(self.radio <= 0) or np.any(self.altura <= 0):
+            raise ValueError("El radio y la altura del núcleo de plomo deben ser positivos")
+        # Inverso de la capacidad calorífica del núcleo (°C/kJ) y factor de conducción (1/s, sin F ni τ)
+        self.forma = np.broadcast_shapes(self.radio.shape, self.altura.shape, self.espesor_acero.shape)
+        self._inverso_capacidad = 1000 / (CALOR_VOLUMETRICO_PLOMO * np.pi * self.radio**2 * self.altura)
+        self._conduccion = CONDUCTIVIDAD_ACERO / (self.radio * CALOR_VOLUMETRICO_PLOMO * self.altura)
+        self._relacion_acero = 1.274 * self.espesor_acero / self.radio
+        self.reiniciar()
+
+    @classmethod
+    def desde_diseno(cls, diseno):
+        # Geometría del núcleo de un diseño de motor_diseno (mm → m): el plomo atraviesa
+        # el caucho y las num_capas − 1 placas internas
+        espesor_acero = (np.asarray(diseno["num_capas"]) - 1) * motor_diseno.ESPESOR_PLACA_ACERO
+        return cls(np.asarray(diseno["diametro_nucleo"]) / 2000,
+                   (np.asarray(diseno["altura_caucho"]) + espesor_acero) / 1000,
+                   espesor_acero / 1000)
+
+    def reiniciar(self):
+        self.temperatura = np.zeros(self.forma)
+        self.tiempo = 0.0
+
+    def factor_resistencia(self):
+        # Qd(T)/Qd0
+        return np.exp(-COEF_TEMPERATURA * self.temperatura)
+
+    def _perdida(self, tiempo):
+        # Fracción de T que se conduce al acero por segundo en el instante t
+        tau = DIFUSIVIDAD_ACERO * tiempo / self.radio**2
+        return self._conduccion * (1 / funcion_F(tau) + self._relacion_acero * tau**(-1 / 3))
+
+    def retencion_conduccion(self, n_pasos, dt):
+        # 1 − dt·pérdida en los n_pasos siguientes al tiempo actual, forma (n_pasos,) + forma
+        tiempo = self.tiempo + dt * np.arange(1, n_pasos + 1)
+        return 1 - dt * self._perdida(tiempo.reshape((-1,) + (1,) * len(self.forma)))
+
+    def calentar(self, trabajo_kNm, dt, retencion=None):
+        # Avanza un paso dt (s) con el trabajo del plomo en el paso (kN·m, con signo: la
+        # descarga elástica devuelve energía) y devuelve el nuevo factor Qd(T)/Qd0.
+        # retencion: fila de retencion_conduccion para este paso (se calcula si falta)
+        self.tiempo += dt
+        if retencion is None:
+            retencion = 1 - dt * self._perdida(self.tiempo)
+        self.temperatura = np.maximum(self.temperatura * retencion + trabajo_kNm * self._inverso_capacidad, 0.0)
+        return np.exp(-COEF_TEMPERATURA * self.temperatura)
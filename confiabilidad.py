@@ -0,0 +1,362 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+import barrido
+import motor_diseno
+
+# Análisis de confiabilidad por Monte Carlo de un diseño de aisladores.
+# El diseño nominal fija la geometría (diámetro, espesor y número de capas); cada muestra
+# representa un aislador fabricado con propiedades dispersas: módulo de corte G, fluencia
+# del plomo y espesor de capa (la relación de forma S = D/(4t) sigue al espesor), y
+# opcionalmente el SD1 del sitio. Cada variable es un factor sobre el valor nominal con
+# distribución lognormal o normal (mediana/media y coeficiente de variación); una mediana
+# distinta de 1 representa envejecimiento o un sesgo del fabricante.
+# Las muestras se procesan en bloques vectorizados (pasos 4-10 y verificación con
+# motor_diseno.evaluar_geometria) repartidos en un grupo de procesos. Cada bloque tiene su
+# propio flujo aleatorio, hijo de un SeedSequence raíz, así que el resultado solo depende
+# de la semilla y del tamaño de bloque, no del número de procesos.
+# Ninguna muestra se guarda: cada bloque se resume en momentos (Welford, combinados con la
+# fórmula de Chan), un t-digest por salida para los cuantiles y conteos de falla por
+# comprobación, y los resúmenes se combinan en el proceso principal en orden de bloque.
+# 10^7 muestras ocupan la memoria de un bloque.
+
+DISTRIBUCIONES = {
+    "modulo_corte": ("lognormal", 1.0, 0.10),
+    "fluencia_plomo": ("lognormal", 1.0, 0.15),
+    "espesor_capa": ("normal", 1.0, 0.03),
+}
+DISTRIBUCIONES_SISMO = {
+    "SD1": ("lognormal", 1.0, 0.30),
+}
+TIPOS_DISTRIBUCION = ("lognormal", "normal")
+FACTOR_MINIMO = 1e-3  # las normales se truncan aquí para no muestrear factores negativos
+
+SALIDAS = ("desplazamiento_total", "periodo_aislado", "coef_amortiguamiento", "rigidez_efectiva",
+           "fuerza_fluencia", "rigidez_horizontal", "rigidez_vertical", "deformacion_por_capa")
+# Comprobaciones de verificar_aisladores (cumple_general exige todas) con la deformación
+# por capa de la muestra (su D_TD sobre la altura de caucho), más cumple_desplazamiento:
+# D_TD de la muestra no mayor que la holgura del foso, que se informa aparte porque la
+# holgura la fija el proyecto y no el diseño del aislador
+COMPROBACIONES = ("cumple_esfuerzo", "cumple_deformacion", "cumple_estabilidad", "cumple_amortiguamiento",
+                  "cumple_general", "cumple_desplazamiento")
+# Holgura por defecto: este factor sobre el D_TD nominal
+MARGEN_HOLGURA = 1.25
+
+CUANTILES = (0.01, 0.05, 0.5, 0.95, 0.99)
+COMPRESION_DIGESTO = 200
+SEMILLA = 12345
+TAMANO_BLOQUE = 100_000
+
+
+class Momentos:
+    # Conteo, media, suma de cuadrados de desviaciones (M2), mínimo y máximo por elemento;
+    # los bloques se agregan y combinan con la actualización de Welford/Chan
+    def __init__(self, forma=()):
+        self.n = 0
+        self.media = np.zeros(forma)
+        self.m2 = np.zeros(forma)
+        self.minimo = np.full(forma, np.inf)
+        self.maximo = np.full(forma, -np.inf)
+
+    def agregar(self, valores):
+        # valores: (muestras,) + forma
+        valores = np.asarray(valores, dtype=float)
+        if valores.shape[0] == 0:
+            return
+        media = valores.mean(axis=0)
+        self._combinar(valores.shape[0], media, ((valores - media)**2).sum(axis=0),
+                       valores.min(axis=0), valores.max(axis=0))
+
+    def combinar(self, otro):
+        if otro.n:
+            self._combinar(otro.n, otro.media, otro.m2, otro.minimo, otro.maximo)
+
+    def _combinar(self, n, media, m2, minimo, maximo):
+        total = self.n + n
+        delta = media - self.media
+        self.media = self.media + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta**2 * (self.n * n / total)
+        self.n = total
+        self.minimo = np.minimum(self.minimo, minimo)
+        self.maximo = np.maximum(self.maximo, maximo)
+
+    def varianza(self):
+        return self.m2 / max(self.n - 1, 1)
+
+
+class DigestoT:
+    # t-digest de fusión para un flujo escalar: centroides (media, peso) ordenados, cuyo
+    # tamaño se limita con la escala k1(q) = δ/(2π)·asin(2q − 1), de modo que las colas
+    # quedan con centroides pequeños y los cuantiles extremos son precisos. Unos δ/2
+    # centroides resumen cualquier cantidad de muestras y dos digestos se combinan
+    # fusionando sus centroides.
+    def __init__(self, compresion=COMPRESION_DIGESTO):
+        self.compresion = compresion
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, valores):
+        valores = np.ravel(np.asarray(valores, dtype=float))
+        if valores.size:
+            self.minimo = min(self.minimo, float(valores.min()))
+            self.maximo = max(self.maximo, float(valores.max()))
+            self._fusionar(np.concatenate([self.medias, valores]),
+                           np.concatenate([self.pesos, np.ones(valores.size)]))
+
+    def combinar(self, otro):
+        if otro.pesos.size:
+            self.minimo = min(self.minimo, otro.minimo)
+            self.maximo = max(self.maximo, otro.maximo)
+            self._fusionar(np.concatenate([self.medias, otro.medias]), np.concatenate([self.pesos, otro.pesos]))
+
+    def _fusionar(self, medias, pesos):
+        orden = np.argsort(medias, kind="stable")
+        medias, pesos = medias[orden], pesos[orden]
+        q = (np.cumsum(pesos) - 0.5 * pesos) / pesos.sum()
+        k = self.compresion / (2 * np.pi) * np.arcsin(2 * q - 1)
+        grupo = np.floor(k - k[0])
+        inicios = np.flatnonzero(np.diff(grupo, prepend=-1.0))
+        self.pesos = np.add.reduceat(pesos, inicios)
+        self.medias = np.add.reduceat(medias * pesos, inicios) / self.pesos
+
+    def cuantil(self, q):
+        if self.pesos.size == 0:
+            return np.full(np.shape(q), np.nan)
+        acumulado = (np.cumsum(self.pesos) - 0.5 * self.pesos) / self.pesos.sum()
+        return np.interp(q, np.concatenate([[0.0], acumulado, [1.0]]),
+                         np.concatenate([[self.minimo], self.medias, [self.maximo]]))
+
+
+def validar_distribuciones(distribuciones):
+    for nombre, (tipo, _, cov) in distribuciones.items():
+        if nombre not in DISTRIBUCIONES and nombre not in DISTRIBUCIONES_SISMO:
+            raise ValueError(f"Variable aleatoria desconocida: {nombre!r}")
+        if tipo not in TIPOS_DISTRIBUCION:
+            raise ValueError(f"Distribución desconocida para {nombre}: {tipo!r} "
+                             f"(use {', '.join(TIPOS_DISTRIBUCION)})")
+        if cov < 0:
+            raise ValueError(f"El coeficiente de variación de {nombre} no puede ser negativo")
+
+
+def muestrear_factores(rng, n, forma, distribuciones):
+    # Factores (n,) + forma de cada variable; las que no se muestrean valen 1
+    factores = {}
+    for nombre, (tipo, centro, cov) in distribuciones.items():
+        if tipo == "lognormal":
+            sigma = np.sqrt(np.log1p(cov**2))
+            factores[nombre] = centro * np.exp(sigma * rng.standard_normal((n,) + forma))
+        else:
+            factores[nombre] = np.maximum(centro * (1 + cov * rng.standard_normal((n,) + forma)), FACTOR_MINIMO)
+    return factores
+
+
+def evaluar_muestras(diseno, factores):
+    # Pasos 4-10 y verificación de cada muestra sobre la geometría nominal del diseño
+    muestra = motor_diseno.evaluar_geometria(
+        diseno["carga_kN"], diseno["desplazamiento_max_mm"], diseno["SD1"] * factores.get("SD1", 1.0),
+        diseno["diametro"], diseno["espesor_capa"] * factores.get("espesor_capa", 1.0), diseno["num_capas"],
+        diseno["relacion_nucleo"], diseno["desplazamiento_total"],
+        factor_rigidez=factores.get("modulo_corte", 1.0), factor_resistencia=factores.get("fluencia_plomo", 1.0))
+    # La deformación por capa se evalúa con el D_TD de la muestra (verificar_aisladores usa
+    # el desplazamiento de entrada, que no cambia con la dispersión de G y Qd)
+    verificacion = motor_diseno.verificar_aisladores(
+        dict(muestra, desplazamiento_max_mm=muestra["desplazamiento_total"]))
+    forma = np.shape(muestra["desplazamiento_total"])
+    muestra["deformacion_por_capa"] = verificacion["deformacion_por_capa"]
+    comprobaciones = {c: np.broadcast_to(verificacion[c], forma) for c in COMPROBACIONES
+                      if c in verificacion}
+    comprobaciones["cumple_desplazamiento"] = muestra["desplazamiento_total"] <= diseno["holgura"]
+    return {s: np.broadcast_to(muestra[s], forma) for s in SALIDAS}, comprobaciones
+
+
+def resumir_bloque(diseno, distribuciones, n, semilla, compresion=COMPRESION_DIGESTO):
+    # Muestrea y evalúa un bloque con su propio flujo (semilla: SeedSequence hijo) y
+    # devuelve solo su resumen: (n, momentos, digestos por elemento, fallas)
+    forma = np.shape(diseno["desplazamiento_total"])
+    rng = np.random.default_rng(semilla)
+    salidas, comprobaciones = evaluar_muestras(diseno, muestrear_factores(rng, n, forma, distribuciones))
+    momentos, digestos = {}, {}
+    for nombre, valores in salidas.items():
+        momentos[nombre] = Momentos(forma)
+        momentos[nombre].agregar(valores)
+        planos = valores.reshape(n, -1)
+        digestos[nombre] = []
+        for j in range(planos.shape[1]):
+            digesto = DigestoT(compresion)
+            digesto.agregar(planos[:, j])
+            digestos[nombre].append(digesto)
+    fallas = {c: np.count_nonzero(~cumple, axis=0) for c, cumple in comprobaciones.items()}
+    return n, momentos, digestos, fallas
+
+
+def _resumir_bloque_empaquetado(argumentos):
+    return resumir_bloque(*argumentos)
+
+
+def ejecutar_montecarlo(diseno, n_muestras, distribuciones=None, semilla=SEMILLA, tamano_bloque=TAMANO_BLOQUE,
+                        trabajadores=None, compresion=COMPRESION_DIGESTO, progreso=None, holgura_mm=None):
+    # Devuelve {"muestras", "momentos", "digestos", "fallas"} combinados de todos los bloques
+    # (los digestos, uno por elemento del diseño en orden plano). Sin distribuciones se
+    # usan DISTRIBUCIONES (sin dispersión sísmica). holgura_mm: holgura del foso para
+    # cumple_desplazamiento; por defecto MARGEN_HOLGURA veces el D_TD nominal.
+    distribuciones = DISTRIBUCIONES if distribuciones is None else distribuciones
+    validar_distribuciones(distribuciones)
+    if n_muestras < 1 or tamano_bloque < 1:
+        raise ValueError("El número de muestras y el tamaño de bloque deben ser positivos")
+    diseno = {c: np.asarray(diseno[c]) for c in ("carga_kN", "desplazamiento_max_mm", "SD1", "diametro",
+                                                 "espesor_capa", "num_capas", "relacion_nucleo",
+                                                 "desplazamiento_total")}
+    forma = np.shape(diseno["desplazamiento_total"])
+    diseno["holgura"] = np.asarray(MARGEN_HOLGURA * diseno["desplazamiento_total"] if holgura_mm is None
+                                   else holgura_mm, dtype=float)
+
+    tamanos = [min(tamano_bloque, n_muestras - inicio) for inicio in range(0, n_muestras, tamano_bloque)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    bloques = [(diseno, distribuciones, n, s, compresion) for n, s in zip(tamanos, semillas)]
+    trabajadores = trabajadores or os.cpu_count() or 1
+
+    total = {"muestras": 0,
+             "momentos": {s: Momentos(forma) for s in SALIDAS},
+             "digestos": {s: [DigestoT(compresion) for _ in range(int(np.prod(forma)))] for s in SALIDAS},
+             "fallas": {c: np.zeros(forma, dtype=np.int64) for c in COMPROBACIONES}}
+    inicio_reloj = time.perf_counter()
+
+    def _recibir(n, momentos, digestos, fallas):
+        total["muestras"] += n
+        for nombre in SALIDAS:
+            total["momentos"][nombre].combinar(momentos[nombre])
+            for acumulado, digesto in zip(total["digestos"][nombre], digestos[nombre]):
+                acumulado.combinar(digesto)
+        for c in COMPROBACIONES:
+            total["fallas"][c] += fallas[c]
+        if progreso:
+            progreso(total["muestras"], n_muestras, time.perf_counter() - inicio_reloj)
+
+    if trabajadores == 1 or len(bloques) == 1:
+        for bloque in bloques:
+            _recibir(*resumir_bloque(*bloque))
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            for resultado in ejecutor.map(_resumir_bloque_empaquetado, bloques):
+                _recibir(*resultado)
+    return total
+
+
+def resumir(resultado, cuantiles=CUANTILES):
+    # Estadísticas finales con la forma del diseño: media, desviación, mínimo, máximo y
+    # cuantiles (p01, p05, ...) por salida; probabilidad de falla, su error estándar
+    # √(p(1 − p)/n) e índice de confiabilidad β = −Φ⁻¹(p) por comprobación
+    n = resultado["muestras"]
+    resumen = {"muestras": n, "salidas": {}, "comprobaciones": {}}
+    for nombre in SALIDAS:
+        momentos = resultado["momentos"][nombre]
+        forma = momentos.media.shape
+        estadisticas = {"media": momentos.media, "desviacion": np.sqrt(momentos.varianza()),
+                        "minimo": momentos.minimo, "maximo": momentos.maximo}
+        valores = np.array([d.cuantil(cuantiles) for d in resultado["digestos"][nombre]])
+        for i, q in enumerate(cuantiles):
+            estadisticas[f"p{100 * q:02.0f}"] = valores[:, i].reshape(forma)
+        resumen["salidas"][nombre] = estadisticas
+    normal = NormalDist()
+    for c in COMPROBACIONES:
+        p = resultado["fallas"][c] / n
+        beta = np.vectorize(lambda v: -normal.inv_cdf(v) if 0 < v < 1 else (np.inf if v == 0 else -np.inf),
+                            otypes=[float])(p)
+        resumen["comprobaciones"][c] = {"probabilidad_falla": p, "error_estandar": np.sqrt(p * (1 - p) / n),
+                                        "indice_confiabilidad": beta}
+    return resumen
+
+
+def _a_listas(valor):
+    if isinstance(valor, dict):
+        return {k: _a_listas(v) for k, v in valor.items()}
+    if isinstance(valor, np.ndarray):
+        return np.where(np.isfinite(valor), valor, None).tolist() if valor.dtype.kind == "f" else valor.tolist()
+    return valor
+
+
+def reporte(resumen):
+    # Tabla de texto para un diseño de un solo aislador
+    lineas = [f"Monte Carlo: {resumen['muestras']:,} muestras", "",
+              f"{'Salida':24s} {'Media':>12s} {'Desv.':>12s} " +
+              " ".join(f"{c:>12s}" for c in resumen["salidas"][SALIDAS[0]] if c.startswith("p"))]
+    for nombre, e in resumen["salidas"].items():
+        cuantiles = " ".join(f"{float(np.ravel(v)[0]):12.5g}" for c, v in e.items() if c.startswith("p"))
+        lineas.append(f"{nombre:24s} {float(np.ravel(e['media'])[0]):12.5g} "
+                      f"{float(np.ravel(e['desviacion'])[0]):12.5g} {cuantiles}")
+    lineas += ["", f"{'Comprobación':24s} {'P. falla':>12s} {'Error est.':>12s} {'β':>8s}"]
+    for c, e in resumen["comprobaciones"].items():
+        lineas.append(f"{c:24s} {float(np.ravel(e['probabilidad_falla'])[0]):12.4e} "
+                      f"{float(np.ravel(e['error_estandar'])[0]):12.2e} "
+                      f"{float(np.ravel(e['indice_confiabilidad'])[0]):8.3f}")
+    return "\n".join(lineas)
+
+
+def interpretar_distribucion(texto):
+    # "variable=tipo:centro:cov", p. ej. "modulo_corte=lognormal:1.1:0.12"
+    try:
+        nombre, definicion = texto.split("=")
+        tipo, centro, cov = definicion.split(":")
+        return nombre.strip(), (tipo.strip(), float(centro), float(cov))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Distribución inválida '{texto}', use variable=tipo:centro:cov")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Confiabilidad por Monte Carlo de un aislador LRB con propiedades dispersas (ASCE 7-16)."
+    )
+    parser.add_argument("--carga", type=float, required=True, help="Carga vertical (t)")
+    parser.add_argument("--desplazamiento", type=float, required=True, help="Desplazamiento de diseño (mm)")
+    parser.add_argument("--s1", type=float, required=True)
+    parser.add_argument("--sds", type=float, required=True)
+    parser.add_argument("--sd1", type=float, required=True)
+    parser.add_argument("--tl", type=float, required=True)
+    parser.add_argument("--diametro", type=float, default=0.0, help="Diámetro del aislador (mm, 0 = calcular)")
+    parser.add_argument("--altura-caucho", type=float, default=0.0, help="Altura de caucho (mm, 0 = calcular)")
+    parser.add_argument("--holgura", type=float,
+                        help=f"Holgura del foso (mm); por defecto {MARGEN_HOLGURA:g} veces el D_TD nominal")
+    parser.add_argument("-n", "--muestras", type=float, default=1e6, help="Número de muestras (admite 1e7)")
+    parser.add_argument("--distribucion", type=interpretar_distribucion, action="append", default=[],
+                        help="Reemplaza o agrega una variable: variable=tipo:centro:cov (repetible)")
+    parser.add_argument("--sismo", action="store_true", help="Incluye la dispersión de SD1")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Muestras por bloque")
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos (por defecto, núcleos disponibles)")
+    parser.add_argument("-o", "--salida", help="Resumen en JSON")
+    args = parser.parse_args(argv)
+
+    distribuciones = dict(DISTRIBUCIONES)
+    if args.sismo:
+        distribuciones.update(DISTRIBUCIONES_SISMO)
+    distribuciones.update(args.distribucion)
+    try:
+        diseno = motor_diseno.disenar_aisladores(args.carga, args.desplazamiento, args.s1, args.sds, args.sd1,
+                                                 args.tl, args.diametro, args.altura_caucho)
+        resultado = ejecutar_montecarlo(diseno, int(args.muestras), distribuciones, args.semilla, args.bloque,
+                                        args.trabajadores, progreso=barrido.reportar_progreso,
+                                        holgura_mm=args.holgura)
+        resumen = resumir(resultado)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as f:
+                json.dump({"distribuciones": distribuciones, "semilla": args.semilla, "bloque": args.bloque,
+                           **_a_listas(resumen)}, f, indent=2, ensure_ascii=False)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(reporte(resumen))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
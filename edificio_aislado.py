@@ -0,0 +1,234 @@
+import numpy as np
+
+import instrumentacion
+import motor_diseno
+
+# Respuesta en el tiempo de un edificio de cortante de varios pisos sobre la capa de
+# aisladores LRB (no lineal), para muchos registros y casos (p. ej. límites de propiedades)
+# a la vez.
+# Grados de libertad: losa de base (sobre los aisladores) y un desplazamiento por piso,
+# relativos al suelo. La masa es diagonal y la rigidez y el amortiguamiento de la
+# superestructura son tridiagonales, así que cada paso de Newmark (aceleración promedio)
+# resuelve un sistema tridiagonal por el algoritmo de Thomas, vectorizado sobre todos los
+# registros y casos; solo se guardan la diagonal y la subdiagonal.
+# La eliminación avanza desde la azotea hacia la base: los pivotes de los pisos no dependen
+# de los aisladores y se factorizan una sola vez; la rigidez tangente de la capa de
+# aislamiento (K1 elástica o K2 en fluencia) solo entra en el pivote de la base, que se
+# refactoriza únicamente en los casos cuyo estado cambió en el paso.
+# La capa de aislamiento es bilineal con endurecimiento cinemático, como en historia_tiempo.
+# El amortiguamiento de la superestructura es proporcional a la rigidez, con la razón
+# indicada en el primer modo de base fija.
+# Las historias (derivas, aceleraciones absolutas de piso, desplazamiento de los aisladores)
+# se guardan opcionalmente en float32, con un paso de salida de cada "decimacion" pasos.
+#
+# Unidades: aceleraciones en g, masas en t, rigideces en kN/m, fuerzas en kN;
+# desplazamientos y derivas de salida en mm.
+
+AMORTIGUAMIENTO_SUPERESTRUCTURA = 0.05
+
+
+def edificio_uniforme(n_pisos, masa_piso, rigidez_piso, masa_base=None):
+    # Masas (n_pisos + 1: losa de base y pisos) y rigideces de entrepiso (n_pisos) uniformes
+    masas = np.full(n_pisos + 1, float(masa_piso))
+    if masa_base is not None:
+        masas[0] = masa_base
+    return masas, np.full(n_pisos, float(rigidez_piso))
+
+
+def parametros_capa(diseno, cantidad=1):
+    # K1, K2 y Fy de la capa de aislamiento completa: suma sobre el último eje del diseño
+    # (los aisladores de un cuadro, o de motor_diseno.analizar_limites con forma (3, n)),
+    # ponderada por la cantidad de aisladores de cada tipo
+    _, K1, K2, Fy = motor_diseno.parametros_bilineales(diseno)
+    return tuple(np.sum(np.asarray(v, dtype=float) * cantidad, axis=-1) for v in (K1, K2, Fy))
+
+
+def _tridiagonal_superestructura(rigideces):
+    # Diagonal (..., n + 1) y subdiagonal (..., n) de la rigidez de los entrepisos;
+    # el entrepiso j une los grados de libertad j - 1 y j
+    diagonal = np.zeros(rigideces.shape[:-1] + (rigideces.shape[-1] + 1,))
+    diagonal[..., :-1] += rigideces
+    diagonal[..., 1:] += rigideces
+    return diagonal, -rigideces
+
+
+def _producto_tridiagonal(diagonal, subdiagonal, x):
+    # Producto de una matriz tridiagonal simétrica por x, con los grados de libertad en el eje 0
+    y = diagonal * x
+    y[1:] += subdiagonal * x[:-1]
+    y[:-1] += subdiagonal * x[1:]
+    return y
+
+
+def periodos_base_fija(masas, rigideces):
+    # Periodos (s) de la superestructura con la losa de base fija, de mayor a menor
+    m = np.asarray(masas, dtype=float)[..., 1:]
+    k = np.asarray(rigideces, dtype=float)
+    diagonal, subdiagonal = _tridiagonal_superestructura(k)
+    n = k.shape[-1]
+    matriz = np.zeros(np.broadcast_shapes(m.shape[:-1], k.shape[:-1]) + (n, n))
+    indices = np.arange(n)
+    escala = 1 / np.sqrt(m)
+    matriz[..., indices, indices] = diagonal[..., 1:] * escala**2
+    matriz[..., indices[1:], indices[:-1]] = subdiagonal[..., 1:] * escala[..., 1:] * escala[..., :-1]
+    matriz[..., indices[:-1], indices[1:]] = matriz[..., indices[1:], indices[:-1]]
+    omega2 = np.linalg.eigvalsh(matriz)
+    return 2 * np.pi / np.sqrt(omega2)
+
+
+@instrumentacion.medir("edificio aislado")
+def respuesta_edificio(aceleraciones_g, dt, masas, rigideces, rigidez_elastica, rigidez_post_fluencia,
+                       fuerza_fluencia, amortiguamiento=AMORTIGUAMIENTO_SUPERESTRUCTURA,
+                       amortiguamiento_aislador=0.0, guardar_historia=False, decimacion=1):
+    # aceleraciones_g: (n_pasos,) o (n_registros, n_pasos).
+    # masas: (..., n_pisos + 1), la primera es la losa de base; rigideces: (..., n_pisos).
+    # rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia: de la capa de aislamiento
+    # completa (sumas sobre los aisladores), con cualquier forma de casos, p. ej. (3,) para
+    # nominal/superior/inferior de motor_diseno.analizar_limites.
+    # Los resultados tienen forma (n_registros,) + forma_casos [+ (pisos,)] [+ (n_salida,)].
+    # amortiguamiento_aislador: razón viscosa de la capa, referida a K2 y a la masa total.
+    ag = np.atleast_2d(np.asarray(aceleraciones_g, dtype=float)) * motor_diseno.GRAVEDAD
+    n_registros, n_pasos = ag.shape
+    m = np.asarray(masas, dtype=float)
+    k = np.asarray(rigideces, dtype=float)
+    if m.shape[-1] != k.shape[-1] + 1:
+        raise ValueError("Se requiere una masa más que rigideces de entrepiso (la losa de base)")
+    K1, K2, Fy = (np.asarray(v, dtype=float) for v in (rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia))
+    n_gdl = m.shape[-1]
+    forma_casos = np.broadcast_shapes(m.shape[:-1], k.shape[:-1], K1.shape, K2.shape, Fy.shape)
+    forma = (n_registros,) + forma_casos
+    n_lote = int(np.prod(forma))
+    periodo_1 = periodos_base_fija(m, k)[..., 0]
+
+    # Internamente todo es (grado de libertad, lote): cada fila es contigua y la sustitución
+    # de Thomas recorre filas completas del lote
+    def por_gdl(valor, n):
+        return np.ascontiguousarray(np.broadcast_to(valor, forma + (n,)).reshape(n_lote, n).T)
+
+    def por_lote(valor):
+        return np.broadcast_to(valor, forma).reshape(n_lote).copy()
+
+    m = por_gdl(m, n_gdl)
+    k = por_gdl(k, n_gdl - 1)
+    K1, K2, Fy = (por_lote(v) for v in (K1, K2, Fy))
+    a1 = por_lote(amortiguamiento * periodo_1 / np.pi)  # 2ζ/ω1
+    ag = np.ascontiguousarray(np.broadcast_to(
+        ag.reshape((n_registros,) + (1,) * len(forma_casos) + (n_pasos,)), forma + (n_pasos,)
+    ).reshape(n_lote, n_pasos).T)
+
+    Qd = Fy * (1 - K2 / K1)
+    dy = Fy / K1
+    c_aislador = 2 * amortiguamiento_aislador * np.sqrt(K2 * m.sum(axis=0))
+
+    # Matrices de la superestructura (tridiagonales) y coeficientes de Newmark
+    beta, gamma = 0.25, 0.5
+    ks_diag = np.zeros((n_gdl, n_lote))
+    ks_diag[:-1] += k
+    ks_diag[1:] += k
+    ks_sub = -k
+    cs_diag, cs_sub = a1 * ks_diag, a1 * ks_sub
+    c_u, c_v, c_a = 1 / (beta * dt**2), 1 / (beta * dt), 1 / (2 * beta) - 1
+    d_u, d_v, d_a = gamma / (beta * dt), gamma / beta - 1, dt * (gamma / (2 * beta) - 1)
+    rigidez_dinamica = ks_diag + d_u * cs_diag + c_u * m
+    sub = ks_sub + d_u * cs_sub
+
+    # Factorización de Thomas de la azotea hacia la base: pivotes de los pisos (fijos)
+    pivote = np.ones((n_gdl, n_lote))
+    pivote[-1] = rigidez_dinamica[-1]
+    for j in range(n_gdl - 2, 0, -1):
+        pivote[j] = rigidez_dinamica[j] - sub[j]**2 / pivote[j + 1]
+    multiplicador = sub / pivote[1:]
+    base_fija = rigidez_dinamica[0] - sub[0] * multiplicador[0] + d_u * c_aislador
+    inverso_pivote = 1 / pivote
+
+    def refactorizar(casos):
+        # Pivote de la base con la rigidez tangente de los aisladores, solo en los casos indicados
+        inverso_pivote[0, casos] = 1 / (base_fija[casos] + rigidez_tangente[casos])
+
+    fluyendo = np.zeros(n_lote, dtype=bool)
+    rigidez_tangente = K1.copy()
+    refactorizar(slice(None))
+    refactorizaciones = 0
+
+    u = np.zeros((n_gdl, n_lote))
+    v = np.zeros((n_gdl, n_lote))
+    a = -ag[0] * np.ones((n_gdl, n_lote))
+    z = np.zeros(n_lote)
+    fuerza = np.zeros(n_lote)
+
+    deriva_max = np.zeros((n_gdl - 1, n_lote))
+    aceleracion_max = np.abs(a + ag[0])
+    desplazamiento_max = np.zeros(n_lote)
+    cortante_max = np.zeros(n_lote)
+    if guardar_historia:
+        n_salida = len(range(0, n_pasos, decimacion))
+        historia_deriva = np.zeros((n_salida, n_gdl - 1, n_lote), dtype=np.float32)
+        historia_aceleracion = np.zeros((n_salida, n_gdl, n_lote), dtype=np.float32)
+        historia_aislador = np.zeros((n_salida, n_lote), dtype=np.float32)
+        historia_aceleracion[0] = aceleracion_max / motor_diseno.GRAVEDAD
+
+    for paso in range(1, n_pasos):
+        # Rigidez tangente de la capa según su estado al final del paso anterior
+        tangente_fluencia = (np.abs(z) >= 1.0) & (v[0] * z > 0)
+        cambios = np.flatnonzero(tangente_fluencia != fluyendo)
+        if cambios.size:
+            fluyendo = tangente_fluencia
+            rigidez_tangente[cambios] = np.where(fluyendo[cambios], K2[cambios], K1[cambios])
+            refactorizar(cambios)
+            refactorizaciones += cambios.size
+
+        # Vector de carga efectivo (forma total de Newmark)
+        rhs = m * (c_u * u + c_v * v + c_a * a - ag[paso])
+        rhs += _producto_tridiagonal(cs_diag, cs_sub, d_u * u + d_v * v + d_a * a)
+        rhs[0] += (c_aislador * (d_u * u[0] + d_v * v[0] + d_a * a[0])
+                   - fuerza + rigidez_tangente * u[0])
+
+        # Sustitución hacia adelante (azotea → base) y hacia atrás (base → azotea)
+        for j in range(n_gdl - 2, -1, -1):
+            rhs[j] -= multiplicador[j] * rhs[j + 1]
+        u_nuevo = rhs
+        u_nuevo[0] *= inverso_pivote[0]
+        for j in range(1, n_gdl):
+            u_nuevo[j] -= sub[j - 1] * u_nuevo[j - 1]
+            u_nuevo[j] *= inverso_pivote[j]
+
+        a_nuevo = c_u * (u_nuevo - u) - c_v * v - c_a * a
+        v += dt * ((1 - gamma) * a + gamma * a_nuevo)
+        a = a_nuevo
+        z = np.clip(z + (u_nuevo[0] - u[0]) / dy, -1.0, 1.0)
+        u = u_nuevo
+        fuerza = K2 * u[0] + Qd * z
+
+        deriva = u[1:] - u[:-1]
+        aceleracion_absoluta = a + ag[paso]
+        np.maximum(deriva_max, np.abs(deriva), out=deriva_max)
+        np.maximum(aceleracion_max, np.abs(aceleracion_absoluta), out=aceleracion_max)
+        np.maximum(desplazamiento_max, np.abs(u[0]), out=desplazamiento_max)
+        np.maximum(cortante_max, np.abs(fuerza + c_aislador * v[0]), out=cortante_max)
+        if guardar_historia and paso % decimacion == 0:
+            i = paso // decimacion
+            historia_deriva[i] = deriva * 1000
+            historia_aceleracion[i] = aceleracion_absoluta / motor_diseno.GRAVEDAD
+            historia_aislador[i] = u[0] * 1000
+
+    def a_forma(valor):
+        # (..., lote) → forma + (...) sin copiar
+        return np.moveaxis(valor.reshape(valor.shape[:-1] + forma), tuple(range(valor.ndim - 1)),
+                           tuple(range(-valor.ndim + 1, 0)))
+
+    resultado = {
+        "desplazamiento_aislador_max_mm": a_forma(desplazamiento_max * 1000),
+        "deriva_max_mm": a_forma(deriva_max * 1000),
+        "aceleracion_piso_max_g": a_forma(aceleracion_max / motor_diseno.GRAVEDAD),
+        "cortante_basal_max_kN": a_forma(cortante_max),
+        "desplazamiento_residual_mm": a_forma(u[0] * 1000),
+        "periodo_base_fija": periodo_1,
+        "refactorizaciones": refactorizaciones,
+    }
+    if guardar_historia:
+        # Historias con el tiempo en el último eje: (forma, pisos, n_salida)
+        resultado["tiempo"] = np.arange(n_salida) * decimacion * dt
+        resultado["deriva_mm"] = a_forma(np.moveaxis(historia_deriva, 0, 1))
+        resultado["aceleracion_piso_g"] = a_forma(np.moveaxis(historia_aceleracion, 0, 1))
+        resultado["desplazamiento_aislador_mm"] = a_forma(historia_aislador)
+    return resultado
@@ -0,0 +1,207 @@
+import argparse
+import sys
+
+import numpy as np
+
+import exportacion
+import instrumentacion
+from resultados import ResultadoDiseno
+
+# Generación masiva de propiedades de enlace (link) para ETABS/SAP2000 a partir de un
+# cuadro de aisladores diseñados.
+# Los aisladores cuyas propiedades coinciden dentro de una tolerancia relativa se agrupan
+# en un solo tipo de enlace (de miles de aisladores quedan unas decenas de tipos). Los
+# grupos se forman propiedad por propiedad (lexicográficamente): dentro de cada grupo se
+# ordena por la propiedad y se abre un grupo nuevo cuando el valor supera al primero del
+# grupo (su ancla) en más de la tolerancia. Cada tipo abarca a lo sumo la tolerancia y no
+# hay bordes de grilla fijos, pero el corte entre dos grupos depende de los datos y puede
+# separar valores casi iguales (1.0, 1.0099 y 1.0101 con 1%: el último abre un grupo nuevo).
+# Cada grupo nuevo se ubica con una búsqueda binaria (O(n log n) más O(tipos) pasos).
+# Luego se escribe, en una sola pasada, el archivo de texto de importación:
+#   s2k: tablas de base de datos de SAP2000/ETABS (.$2k) "LINK PROPERTY DEFINITIONS" y
+#        "LINK PROPERTY ASSIGNMENTS"
+#   e2k: secciones $ LINK PROPERTIES / $ LINK ASSIGNS de ETABS (.e2k)
+# Las asignaciones usan el id de cada aislador como etiqueta del enlace en el modelo.
+# Unidades: kN, m, s.
+
+TOLERANCIA_AGRUPAMIENTO = 0.01  # 1% relativo
+PREFIJO_ENLACE = "LRB"
+FORMATOS = ("s2k", "e2k")
+
+# Propiedades que definen un tipo de enlace (las que se escriben en el archivo)
+PROPIEDADES_ENLACE = ("rigidez_vertical", "rigidez_efectiva", "amortiguamiento_efectivo",
+                      "rigidez_elastica", "fuerza_fluencia", "relacion_post_fluencia")
+
+
+def propiedades_enlace(resultado):
+    # Propiedades del elemento "Rubber Isolator" por aislador (arreglos 1-D):
+    # U1 lineal con K_v; U2/U3 lineales con K_eff y c_eff = 2·β·√(K_eff·m) para análisis
+    # lineal, y bilineales (K1, Fy, K2/K1) para análisis no lineal
+    masa, K1, K2, Fy = (np.ravel(v) for v in resultado.parametros_bilineales())
+    rigidez_efectiva = np.ravel(resultado.rigidez_efectiva)
+    beta = np.ravel(resultado.coef_amortiguamiento) / 100
+    return {
+        "rigidez_vertical": np.ravel(resultado.rigidez_vertical).astype(float),
+        "rigidez_efectiva": rigidez_efectiva.astype(float),
+        "amortiguamiento_efectivo": 2 * beta * np.sqrt(rigidez_efectiva * masa),
+        "rigidez_elastica": K1.astype(float),
+        "fuerza_fluencia": Fy.astype(float),
+        "relacion_post_fluencia": (K2 / K1).astype(float),
+    }
+
+
+def dividir_por_tolerancia(grupo, valores, paso):
+    # Subdivide los grupos (enteros) según valores: ordenados dentro de cada grupo, cada
+    # subgrupo abarca los valores que no superan a su ancla (el menor) en más de paso
+    orden = np.lexsort((valores, grupo))
+    grupo_ordenado, valores_ordenados = grupo[orden], valores[orden]
+    subgrupo = np.empty(grupo.size, dtype=np.int64)
+    fin_grupo = np.searchsorted(grupo_ordenado, grupo_ordenado, side="right")
+    i = numero = 0
+    while i < grupo.size:
+        fin = fin_grupo[i]
+        j = i + np.searchsorted(valores_ordenados[i:fin], valores_ordenados[i] + paso, side="right")
+        subgrupo[orden[i:j]] = numero
+        numero += 1
+        i = j
+    return subgrupo
+
+
+def agrupar_enlaces(propiedades, tolerancia=TOLERANCIA_AGRUPAMIENTO):
+    # Devuelve (tipo de cada aislador, propiedades promedio de cada tipo, aisladores por tipo).
+    # Los tipos se numeran por orden de primera aparición en el cuadro.
+    n = np.size(propiedades[PROPIEDADES_ENLACE[0]])
+    tipo = np.zeros(n, dtype=np.int64)
+    for p in PROPIEDADES_ENLACE:
+        valores = np.asarray(propiedades[p], dtype=float)
+        if tolerancia > 0:
+            # Brecha relativa en escala logarítmica; ceros (p. ej. sin amortiguamiento) aparte
+            with np.errstate(divide="ignore"):
+                valores = np.where(valores > 0, np.log(np.maximum(valores, 1e-300)), -np.inf)
+            tipo = dividir_por_tolerancia(tipo, valores, np.log1p(tolerancia))
+        else:
+            tipo = dividir_por_tolerancia(tipo, valores, 0.0)
+    _, primero = np.unique(tipo, return_index=True)
+
+    # Renumerar por primera aparición
+    orden = np.argsort(primero)
+    renumeracion = np.empty_like(orden)
+    renumeracion[orden] = np.arange(orden.size)
+    tipo = renumeracion[tipo]
+
+    cantidad = np.bincount(tipo, minlength=orden.size)
+    representantes = {p: np.bincount(tipo, weights=propiedades[p], minlength=orden.size) / cantidad
+                      for p in PROPIEDADES_ENLACE}
+    return tipo, representantes, cantidad
+
+
+def nombres_enlaces(n_tipos, prefijo=PREFIJO_ENLACE):
+    ancho = max(2, len(str(n_tipos)))
+    return [f"{prefijo}{i + 1:0{ancho}d}" for i in range(n_tipos)]
+
+
+def _g(valor):
+    return f"{valor:.6g}"
+
+
+def lineas_s2k(representantes, cantidad, nombres, tipo, ids):
+    yield "File generated by aislador_sismico_LRB  Units: KN, m, C"
+    yield ""
+    yield 'TABLE:  "PROGRAM CONTROL"'
+    yield '   ProgramName=SAP2000   CurrUnits="KN, m, C"'
+    yield ""
+    yield 'TABLE:  "LINK PROPERTY DEFINITIONS 01 - GENERAL"'
+    for i, nombre in enumerate(nombres):
+        yield (f'   Link={nombre}   LinkType="Rubber Isolator"   Mass=0   Weight=0   RotInert1=0   RotInert2=0'
+               f'   RotInert3=0   DefLength=1   DefArea=1   PDM2I=0   PDM2J=0   PDM3I=0   PDM3J=0'
+               f'   Notes="{cantidad[i]} aisladores"')
+    yield ""
+    yield 'TABLE:  "LINK PROPERTY DEFINITIONS 08 - RUBBER ISOLATOR"'
+    for i, nombre in enumerate(nombres):
+        r = {p: representantes[p][i] for p in PROPIEDADES_ENLACE}
+        yield (f'   Link={nombre}   DOF=U1   Fixed=No   TransKE={_g(r["rigidez_vertical"])}   TransCE=0'
+               f'   Nonlinear=No')
+        for dof in ("U2", "U3"):
+            yield (f'   Link={nombre}   DOF={dof}   Fixed=No   TransKE={_g(r["rigidez_efectiva"])}'
+                   f'   TransCE={_g(r["amortiguamiento_efectivo"])}   Nonlinear=Yes'
+                   f'   NonlinK={_g(r["rigidez_elastica"])}   Yield={_g(r["fuerza_fluencia"])}'
+                   f'   Ratio={_g(r["relacion_post_fluencia"])}')
+    yield ""
+    yield 'TABLE:  "LINK PROPERTY ASSIGNMENTS"'
+    for etiqueta, t in zip(ids, tipo.tolist()):
+        yield f'   Link={etiqueta}   LinkType=TwoJoint   LinkProp={nombres[t]}'
+    yield ""
+    yield "END TABLE DATA"
+
+
+def lineas_e2k(representantes, cantidad, nombres, tipo, ids):
+    yield "$ File generated by aislador_sismico_LRB"
+    yield ""
+    yield "$ CONTROLS"
+    yield '  UNITS  "KN"  "M"  "C"'
+    yield ""
+    yield "$ LINK PROPERTIES"
+    for i, nombre in enumerate(nombres):
+        r = {p: representantes[p][i] for p in PROPIEDADES_ENLACE}
+        yield f'  LINKPROP  "{nombre}"  TYPE "RUBBER ISOLATOR"  MASS 0  WEIGHT 0  $ {cantidad[i]} aisladores'
+        yield f'  LINKPROP  "{nombre}"  DOF "U1"  FIXED "No"  NONLINEAR "No"  KE {_g(r["rigidez_vertical"])}  CE 0'
+        for dof in ("U2", "U3"):
+            yield (f'  LINKPROP  "{nombre}"  DOF "{dof}"  FIXED "No"  NONLINEAR "Yes"'
+                   f'  KE {_g(r["rigidez_efectiva"])}  CE {_g(r["amortiguamiento_efectivo"])}'
+                   f'  K {_g(r["rigidez_elastica"])}  YIELD {_g(r["fuerza_fluencia"])}'
+                   f'  RATIO {_g(r["relacion_post_fluencia"])}')
+    yield ""
+    yield "$ LINK ASSIGNS"
+    for etiqueta, t in zip(ids, tipo.tolist()):
+        yield f'  LINKASSIGN  "{etiqueta}"  PROP "{nombres[t]}"'
+    yield ""
+    yield "$ END OF MODEL FILE"
+
+
+@instrumentacion.medir("enlaces ETABS")
+def escribir_enlaces(resultado, salida, ids=None, formato="s2k", tolerancia=TOLERANCIA_AGRUPAMIENTO,
+                     prefijo=PREFIJO_ENLACE):
+    # Escribe el archivo de importación en salida (objeto de texto); devuelve el número de tipos
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r} (use {', '.join(FORMATOS)})")
+    propiedades = propiedades_enlace(resultado)
+    tipo, representantes, cantidad = agrupar_enlaces(propiedades, tolerancia)
+    nombres = nombres_enlaces(cantidad.size, prefijo)
+    ids = [f"{i + 1}" for i in range(tipo.size)] if ids is None else [str(i) for i in ids]
+    lineas = (lineas_s2k if formato == "s2k" else lineas_e2k)(representantes, cantidad, nombres, tipo, ids)
+    salida.writelines(linea + "\n" for linea in lineas)
+    return cantidad.size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Propiedades de enlace ETABS/SAP2000 (agrupadas) para un cuadro de aisladores diseñados."
+    )
+    parser.add_argument("cuadro", help="Cuadro exportado (.npz, .csv o .jsonl; ver exportacion.py)")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo .$2k/.s2k o .e2k ('-' para salida estándar)")
+    parser.add_argument("--formato", choices=FORMATOS, help="Por defecto según la extensión de la salida")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_AGRUPAMIENTO,
+                        help="Tolerancia relativa para agrupar aisladores iguales (0 = exactos)")
+    parser.add_argument("--prefijo", default=PREFIJO_ENLACE, help="Prefijo de los nombres de enlace")
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("e2k" if args.salida.lower().endswith(".e2k") else "s2k")
+    try:
+        columnas = exportacion.cargar_resultados(args.cuadro)
+        resultado = ResultadoDiseno.desde_valores(columnas)
+        salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8", newline="\r\n")
+        try:
+            tipos = escribir_enlaces(resultado, salida, columnas.get("id"), formato, args.tolerancia, args.prefijo)
+        finally:
+            if salida is not sys.stdout:
+                salida.close()
+    except (ValueError, OSError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{len(resultado)} aisladores en {tipos} tipos de enlace", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
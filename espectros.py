@@ -0,0 +1,111 @@
+import numpy as np
+
+# Espectros de diseño ASCE 7 y espectros de respuesta de registros, con el escalamiento
+# de suites de registros según ASCE 7-16 §17.3.3.
+# Los espectros de respuesta se calculan para todos los registros y todos los periodos en
+# un solo recorrido del tiempo (método exacto por tramos lineales de Nigam-Jennings),
+# vectorizado sobre el arreglo (n_registros, n_periodos).
+
+AMORTIGUAMIENTO_ESPECTRO = 0.05
+FACTOR_MCE = 1.5  # SMS = 1.5·SDS, SM1 = 1.5·SD1
+
+# Rango de periodos de ASCE 7-16 §17.3.3: 0.2·T_M (cota superior) a 1.25·T_M (cota inferior)
+FACTOR_PERIODO_MINIMO = 0.2
+FACTOR_PERIODO_MAXIMO = 1.25
+
+
+def periodos_estandar(periodo_max=10.0, n=200):
+    # Grilla densa de periodos (logarítmica entre 0.01 s y periodo_max)
+    return np.geomspace(0.01, periodo_max, n)
+
+
+def espectro_diseno(periodos, SDS, SD1, TL):
+    # Espectro de diseño ASCE 7-16 §11.4.6 (aceleración en g). Admite broadcasting entre
+    # periodos y parámetros: p. ej. periodos (n,) con SDS (m, 1) da (m, n).
+    T = np.asarray(periodos, dtype=float)
+    SDS, SD1, TL = (np.asarray(v, dtype=float) for v in (SDS, SD1, TL))
+    T0 = 0.2 * SD1 / SDS
+    TS = SD1 / SDS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(T < T0, SDS * (0.4 + 0.6 * T / T0),
+               np.where(T <= TS, SDS,
+               np.where(T <= TL, SD1 / T, SD1 * TL / T**2)))
+
+
+def espectro_mce(periodos, SDS, SD1, TL):
+    # Espectro MCE_R (SMS = 1.5·SDS, SM1 = 1.5·SD1)
+    return FACTOR_MCE * espectro_diseno(periodos, SDS, SD1, TL)
+
+
+def _coeficientes_nigam_jennings(omega, xi, dt):
+    raiz = np.sqrt(1 - xi**2)
+    omega_d = omega * raiz
+    E = np.exp(-xi * omega * dt)
+    S = np.sin(omega_d * dt)
+    C = np.cos(omega_d * dt)
+
+    a11 = E * (xi / raiz * S + C)
+    a12 = E * S / omega_d
+    a21 = -omega / raiz * E * S
+    a22 = E * (C - xi / raiz * S)
+
+    k1 = (2 * xi**2 - 1) / (omega**2 * dt)
+    k2 = 2 * xi / (omega**3 * dt)
+    b11 = E * ((k1 + xi / omega) * S / omega_d + (k2 + 1 / omega**2) * C) - k2
+    b12 = -E * (k1 * S / omega_d + k2 * C) - 1 / omega**2 + k2
+    b21 = (E * ((k1 + xi / omega) * (C - xi / raiz * S) - (k2 + 1 / omega**2) * (omega_d * S + xi * omega * C))
+           + 1 / (omega**2 * dt))
+    b22 = -E * (k1 * (C - xi / raiz * S) - k2 * (omega_d * S + xi * omega * C)) - 1 / (omega**2 * dt)
+    return a11, a12, a21, a22, b11, b12, b21, b22
+
+
+def espectros_respuesta(aceleraciones_g, dt, periodos, amortiguamiento=AMORTIGUAMIENTO_ESPECTRO):
+    # Pseudo-aceleración espectral (g) de cada registro en cada periodo.
+    # aceleraciones_g: (n_pasos,) o (n_registros, n_pasos). Devuelve (n_registros, n_periodos).
+    ag = np.atleast_2d(np.asarray(aceleraciones_g, dtype=float))
+    omega = 2 * np.pi / np.asarray(periodos, dtype=float)
+    a11, a12, a21, a22, b11, b12, b21, b22 = _coeficientes_nigam_jennings(omega, amortiguamiento, dt)
+
+    forma = (ag.shape[0], omega.size)
+    u = np.zeros(forma)
+    v = np.zeros(forma)
+    u_max = np.zeros(forma)
+    for k in range(ag.shape[1] - 1):
+        p0 = ag[:, k, None]
+        p1 = ag[:, k + 1, None]
+        u, v = (a11 * u + a12 * v + b11 * p0 + b12 * p1,
+                a21 * u + a22 * v + b21 * p0 + b22 * p1)
+        np.maximum(u_max, np.abs(u), out=u_max)
+    return omega**2 * u_max
+
+
+def escalar_suite(psa, periodos, objetivo, periodo_superior, periodo_inferior=None,
+                  factor_minimo=FACTOR_PERIODO_MINIMO, factor_maximo=FACTOR_PERIODO_MAXIMO):
+    # Factores de escala de amplitud según ASCE 7-16 §17.3.3.
+    # 1) Cada registro se escala para ajustar (media logarítmica) el espectro objetivo en el
+    #    rango 0.2·T_M (cota superior) a 1.25·T_M (cota inferior).
+    # 2) Un factor común lleva el promedio de la suite a no quedar por debajo del objetivo
+    #    en ningún periodo del rango (y a tocarlo en al menos uno).
+    # psa: (n_registros, n_periodos); objetivo: (n_periodos,) en la misma grilla.
+    periodo_inferior = periodo_superior if periodo_inferior is None else periodo_inferior
+    T = np.asarray(periodos, dtype=float)
+    rango = (T >= factor_minimo * periodo_superior) & (T <= factor_maximo * periodo_inferior)
+    if not rango.any():
+        raise ValueError("La grilla de periodos no cubre el rango de escalamiento de ASCE 7 §17.3.3")
+
+    objetivo = np.asarray(objetivo, dtype=float)
+    razon = np.log(objetivo[rango]) - np.log(psa[:, rango])
+    factores = np.exp(razon.mean(axis=1))
+
+    promedio = (factores[:, None] * psa[:, rango]).mean(axis=0)
+    factor_comun = np.max(objetivo[rango] / promedio)
+    factores = factores * factor_comun
+
+    promedio_escalado = (factores[:, None] * psa).mean(axis=0)
+    return {
+        "factores": factores,
+        "factor_comun": factor_comun,
+        "promedio_escalado": promedio_escalado,
+        "rango": rango,
+        "cumple": bool(np.all(promedio_escalado[rango] >= objetivo[rango] * (1 - 1e-9))),
+    }
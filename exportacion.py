@@ -0,0 +1,278 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+import instrumentacion
+from resultados import ResultadoDiseno
+
+# Exportación masiva por columnas de cuadros de aisladores diseñados (CSV, JSONL o NPZ).
+# Las columnas son los campos de resultados.ResultadoDiseno (más un "id" opcional) con
+# tipos fijos: flotantes, enteros y booleanos (0/1 en CSV, true/false en JSONL). Se pueden
+# agregar columnas adicionales (p. ej. las de límites del modo por lotes), cuyo tipo se
+# declara en el encabezado. Los resultados se escriben por bloques, de modo que la memoria
+# no depende del tamaño del cuadro. En NPZ cada columna (también los ids y los textos) se
+# acumula en un archivo temporal y al cerrar se copia al .npz como un arreglo .npy; la
+# carga de un NPZ no interpreta texto y es casi inmediata.
+# Cada archivo lleva la versión del esquema, que el cargador comprueba.
+
+VERSION_ESQUEMA = 1
+FORMATOS = ("csv", "jsonl", "npz")
+COLUMNAS = ResultadoDiseno.campos()
+TIPOS_COLUMNAS = {
+    nombre: np.dtype(np.bool_) if nombre.startswith("cumple_")
+    else np.dtype(np.int64) if nombre == "num_capas"
+    else np.dtype(np.float64)
+    for nombre in COLUMNAS
+}
+TIPO_TEXTO = np.dtype(str)
+MIEMBRO_ESQUEMA = "__esquema__"
+TAMANO_BLOQUE_TEXTO = 65536
+
+
+def detectar_formato(ruta, formato=None):
+    if formato:
+        return formato
+    extension = os.path.splitext(ruta)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    return extension if extension in FORMATOS else "csv"
+
+
+def columnas_de(resultado):
+    # Columnas tipadas (arreglos 1-D) de un ResultadoDiseno o de un diccionario de columnas
+    valores = resultado.como_dict() if isinstance(resultado, ResultadoDiseno) else resultado
+    n = max(np.size(valores[nombre]) for nombre in COLUMNAS)
+    return {nombre: np.broadcast_to(np.asarray(valores[nombre], dtype=tipo), (n,)) if np.ndim(valores[nombre]) == 0
+            else np.asarray(valores[nombre], dtype=tipo).ravel()
+            for nombre, tipo in TIPOS_COLUMNAS.items()}
+
+
+def tipo_columna(valores):
+    # Tipo de una columna adicional: booleano, entero, flotante o texto
+    tipo = np.asarray(valores).dtype
+    if tipo.kind == "b":
+        return np.dtype(np.bool_)
+    if tipo.kind in "iu":
+        return np.dtype(np.int64)
+    return np.dtype(np.float64) if tipo.kind == "f" else TIPO_TEXTO
+
+
+class EscritorResultados:
+    # ruta: archivo de destino, o un archivo de texto ya abierto (CSV o JSONL, p. ej.
+    # sys.stdout), que no se cierra al terminar
+    def __init__(self, ruta, formato=None):
+        self.ruta = ruta
+        self._propio = not hasattr(ruta, "write")
+        self.formato = detectar_formato(ruta if self._propio else "", formato)
+        if self.formato not in FORMATOS:
+            raise ValueError(f"Formato de exportación desconocido: {self.formato!r} (use {', '.join(FORMATOS)})")
+        if self.formato == "npz" and not self._propio:
+            raise ValueError("La exportación NPZ requiere una ruta de archivo")
+        self.filas = 0
+        self._tipos = None
+        if self.formato == "npz":
+            self._temporal = tempfile.mkdtemp(prefix="exportacion_", dir=os.path.dirname(os.path.abspath(ruta)))
+            self._columnas = {}
+            self._anchos = {}
+        else:
+            self._archivo = open(ruta, "w", newline="", encoding="utf-8") if self._propio else ruta
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+    @instrumentacion.medir("exportación: escribir bloque", argumento=1)
+    def escribir(self, resultado, ids=None, adicionales=None):
+        # Agrega un bloque de aisladores (ResultadoDiseno por lotes o diccionario de columnas).
+        # adicionales: columnas extra {nombre: valores}, en el orden en que se escriben.
+        # Las columnas (ids y adicionales incluidas) se fijan con el primer bloque.
+        columnas = columnas_de(resultado)
+        n = len(columnas[COLUMNAS[0]])
+        bloque = {}
+        if ids is not None:
+            bloque["id"] = np.array([str(i) for i in ids], dtype=object)
+        bloque.update(columnas)
+        for nombre, valores in (adicionales or {}).items():
+            if nombre in bloque:
+                raise ValueError(f"La columna adicional '{nombre}' ya existe")
+            bloque[nombre] = np.asarray(valores).ravel()
+        for nombre, valores in bloque.items():
+            if len(valores) != n:
+                raise ValueError(f"Se esperaban {n} valores en '{nombre}' y se recibieron {len(valores)}")
+
+        if self._tipos is None:
+            self._tipos = {nombre: TIPO_TEXTO if nombre == "id"
+                           else TIPOS_COLUMNAS[nombre] if nombre in TIPOS_COLUMNAS
+                           else tipo_columna(valores)
+                           for nombre, valores in bloque.items()}
+            self._escribir_encabezado()
+        elif list(bloque) != list(self._tipos):
+            raise ValueError("Todos los bloques deben tener las mismas columnas (ids y adicionales incluidas)")
+
+        if self.formato == "npz":
+            for nombre, valores in bloque.items():
+                if self._tipos[nombre] == TIPO_TEXTO:
+                    textos = [str(v) for v in valores.tolist()]
+                    self._anchos[nombre] = max([self._anchos[nombre]] + [len(t) for t in textos])
+                    self._columnas[nombre].writelines(json.dumps(t) + "\n" for t in textos)
+                else:
+                    self._columnas[nombre].write(np.ascontiguousarray(valores, dtype=self._tipos[nombre]).tobytes())
+        else:
+            listas = []
+            for nombre, valores in bloque.items():
+                tipo = self._tipos[nombre]
+                if tipo == TIPO_TEXTO:
+                    listas.append([str(v) for v in valores.tolist()])
+                elif tipo == np.bool_ and self.formato == "csv":
+                    listas.append(np.asarray(valores, dtype=np.int8).tolist())
+                else:
+                    listas.append(np.asarray(valores, dtype=tipo).tolist())
+            filas = zip(*listas)
+            if self.formato == "csv":
+                self._escritor.writerows(filas)
+            else:
+                nombres = tuple(bloque)
+                self._archivo.writelines(json.dumps(dict(zip(nombres, fila)), ensure_ascii=False) + "\n"
+                                         for fila in filas)
+        self.filas += n
+
+    def _escribir_encabezado(self):
+        # El tipo de las columnas adicionales se declara en el encabezado (CSV y JSONL)
+        adicionales = {nombre: tipo.name for nombre, tipo in self._tipos.items()
+                       if nombre != "id" and nombre not in TIPOS_COLUMNAS}
+        if self.formato == "csv":
+            declaracion = "".join(f" {nombre}={tipo}" for nombre, tipo in adicionales.items())
+            self._archivo.write(f"# esquema={VERSION_ESQUEMA}{declaracion}\n")
+            self._escritor = csv.writer(self._archivo, lineterminator="\n")
+            self._escritor.writerow(list(self._tipos))
+        elif self.formato == "jsonl":
+            tipos = {nombre: tipo.name for nombre, tipo in self._tipos.items() if nombre != "id"}
+            self._archivo.write(json.dumps({MIEMBRO_ESQUEMA: VERSION_ESQUEMA, "columnas": tipos},
+                                           ensure_ascii=False) + "\n")
+        else:
+            for nombre, tipo in self._tipos.items():
+                if tipo == TIPO_TEXTO:
+                    self._columnas[nombre] = open(os.path.join(self._temporal, nombre + ".txt"), "w",
+                                                  encoding="utf-8")
+                    self._anchos[nombre] = 1
+                else:
+                    self._columnas[nombre] = open(os.path.join(self._temporal, nombre + ".bin"), "wb")
+
+    def _cerrar_archivo(self):
+        if self._propio:
+            self._archivo.close()
+        else:
+            self._archivo.flush()
+
+    @instrumentacion.medir("exportación: cerrar")
+    def cerrar(self):
+        if self._tipos is None:
+            self._tipos = dict(TIPOS_COLUMNAS)
+            self._escribir_encabezado()
+        if self.formato != "npz":
+            self._cerrar_archivo()
+            return
+
+        for archivo in self._columnas.values():
+            archivo.close()
+        # Se escribe a un temporal y se reemplaza, para no dejar un .npz a medias
+        destino = os.path.join(self._temporal, "resultado.npz")
+        with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as z:
+            with z.open(MIEMBRO_ESQUEMA + ".npy", "w") as miembro:
+                np.lib.format.write_array(miembro, np.array(VERSION_ESQUEMA))
+            for nombre, tipo in self._tipos.items():
+                if tipo == TIPO_TEXTO:
+                    tipo = np.dtype(f"<U{self._anchos[nombre]}")
+                encabezado = {"descr": np.lib.format.dtype_to_descr(tipo), "fortran_order": False,
+                              "shape": (self.filas,)}
+                with z.open(nombre + ".npy", "w", force_zip64=True) as miembro:
+                    np.lib.format.write_array_header_1_0(miembro, encabezado)
+                    if tipo.kind == "U":
+                        self._copiar_textos(nombre, tipo, miembro)
+                    else:
+                        with open(os.path.join(self._temporal, nombre + ".bin"), "rb") as datos:
+                            shutil.copyfileobj(datos, miembro, 1 << 20)
+        os.replace(destino, self.ruta)
+        shutil.rmtree(self._temporal, ignore_errors=True)
+
+    def _copiar_textos(self, nombre, tipo, miembro):
+        # Convierte por tramos las líneas JSON de una columna de texto a un arreglo de ancho fijo
+        with open(os.path.join(self._temporal, nombre + ".txt"), encoding="utf-8") as datos:
+            tramo = []
+            for linea in datos:
+                tramo.append(json.loads(linea))
+                if len(tramo) >= TAMANO_BLOQUE_TEXTO:
+                    miembro.write(np.array(tramo, dtype=tipo).tobytes())
+                    tramo = []
+            if tramo:
+                miembro.write(np.array(tramo, dtype=tipo).tobytes())
+
+    def descartar(self):
+        if self.formato == "npz":
+            for archivo in self._columnas.values():
+                archivo.close()
+            shutil.rmtree(self._temporal, ignore_errors=True)
+        else:
+            self._cerrar_archivo()
+
+
+def exportar_resultados(bloques, ruta, formato=None):
+    # bloques: iterable de ResultadoDiseno (o de pares (resultado, ids)); devuelve el número de filas
+    with EscritorResultados(ruta, formato) as escritor:
+        for bloque in bloques:
+            resultado, ids = bloque if isinstance(bloque, tuple) else (bloque, None)
+            escritor.escribir(resultado, ids)
+    return escritor.filas
+
+
+def _comprobar_esquema(version, ruta):
+    if version is None or int(version) > VERSION_ESQUEMA:
+        raise ValueError(f"{ruta}: versión de esquema {version} no admitida (máxima {VERSION_ESQUEMA})")
+
+
+def cargar_resultados(ruta, formato=None):
+    # Devuelve un diccionario de columnas tipadas (más "id" si el archivo lo incluye).
+    # ResultadoDiseno.desde_valores(columnas) da el registro por lotes correspondiente.
+    formato = detectar_formato(ruta, formato)
+    if formato == "npz":
+        with np.load(ruta) as z:
+            _comprobar_esquema(z[MIEMBRO_ESQUEMA] if MIEMBRO_ESQUEMA + ".npy" in z.zip.namelist() else None, ruta)
+            return {nombre: z[nombre] for nombre in z.files if nombre != MIEMBRO_ESQUEMA}
+
+    with open(ruta, newline="", encoding="utf-8") as f:
+        if formato == "csv":
+            # "# esquema=1 columna_adicional=tipo ..."
+            primera = f.readline().strip()
+            declaracion = dict(campo.split("=", 1) for campo in primera[1:].split() if "=" in campo) \
+                if primera.startswith("#") else {}
+            _comprobar_esquema(declaracion.pop("esquema", None), ruta)
+            tipos = {**TIPOS_COLUMNAS, **{nombre: np.dtype(tipo) for nombre, tipo in declaracion.items()}}
+            lector = csv.reader(f)
+            nombres = next(lector)
+            valores = list(zip(*lector)) or [()] * len(nombres)
+        else:
+            meta = json.loads(f.readline())
+            _comprobar_esquema(meta.get(MIEMBRO_ESQUEMA), ruta)
+            tipos = {**TIPOS_COLUMNAS, **{nombre: np.dtype(tipo) for nombre, tipo in meta.get("columnas", {}).items()}}
+            filas = [json.loads(linea) for linea in f if linea.strip()]
+            nombres = list(filas[0]) if filas else list(COLUMNAS)
+            valores = [[fila[nombre] for fila in filas] for nombre in nombres]
+
+    columnas = {}
+    for nombre, columna in zip(nombres, valores):
+        tipo = TIPO_TEXTO if nombre == "id" else tipos[nombre]
+        if tipo == np.bool_ and formato == "csv":
+            columnas[nombre] = np.array(columna, dtype=np.int8).astype(bool)
+        else:
+            columnas[nombre] = np.array(columna, dtype=tipo)
+    return columnas
@@ -0,0 +1,167 @@
+import numpy as np
+
+import instrumentacion
+
+# Dibujo rápido de la curva de histéresis.
+# Los artistas (lazo, línea de carga, anotaciones, leyenda) se crean una sola vez y se
+# actualizan con set_data; cada actualización restaura un fondo guardado (ejes, grilla,
+# rótulos) y vuelve a pintar solo los artistas que cambian (blitting). El fondo se vuelve a
+# capturar únicamente cuando cambian los límites de los ejes o el tamaño de la ventana.
+# Las trazas más largas que el ancho de pantalla se diezman conservando mínimos y máximos.
+# El módulo no importa matplotlib: recibe la figura, los ejes y el lienzo ya creados.
+# La excepción es guardar_figura, que redibuja una copia de los datos en una figura Agg
+# propia y por eso puede correr en un hilo de trabajo sin tocar la figura de la interfaz.
+
+PUNTOS_POR_PIXEL = 2  # muestras conservadas por píxel de ancho del lienzo
+
+
+@instrumentacion.medir("diezmado del gráfico")
+def diezmar_minmax(x, y, puntos_max):
+    # Reduce una trayectoria (x, y) a unos puntos_max puntos. En cada tramo de muestras
+    # consecutivas se conservan el primero y los extremos (mín./máx.) de x y de y, en su
+    # orden original, de modo que la envolvente y los picos del lazo no se pierden.
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = x.size
+    if puntos_max <= 0 or n <= puntos_max:
+        return x, y
+    por_tramo = 5  # primero, mín./máx. de x, mín./máx. de y
+    n_tramos = max(1, puntos_max // por_tramo)
+    ancho = -(-n // n_tramos)  # división entera hacia arriba
+    n_tramos = -(-n // ancho)
+
+    # El último tramo se completa repitiendo la última muestra
+    inicio = np.arange(n_tramos) * ancho
+    if n_tramos * ancho == n:
+        xb, yb = x.reshape(n_tramos, ancho), y.reshape(n_tramos, ancho)
+    else:
+        relleno = np.minimum(np.arange(n_tramos * ancho), n - 1)
+        xb, yb = x[relleno].reshape(n_tramos, ancho), y[relleno].reshape(n_tramos, ancho)
+    indices = np.stack([np.zeros(n_tramos, dtype=np.int64),
+                        xb.argmin(axis=1), xb.argmax(axis=1),
+                        yb.argmin(axis=1), yb.argmax(axis=1)], axis=1)
+    indices = np.sort(indices, axis=1) + inicio[:, None]
+    # Índices repetidos dentro de un tramo (p. ej. el primero también es el mínimo) se eliminan
+    distintos = np.ones(indices.shape, dtype=bool)
+    distintos[:, 1:] = indices[:, 1:] != indices[:, :-1]
+    indices = np.minimum(indices[distintos], n - 1)
+    # Siempre se conserva el último punto de la traza
+    indices = np.concatenate([indices, [n - 1]])
+    indices = indices[np.concatenate([[True], indices[1:] != indices[:-1]])]
+    return x[indices], y[indices]
+
+
+class GraficoHisteresis:
+    def __init__(self, figura, ejes, lienzo):
+        self.figura = figura
+        self.ejes = ejes
+        self.lienzo = lienzo
+        self._fondo = None
+        self.datos = None  # copia de los datos de la última actualización (para guardar_figura)
+
+        # Elementos fijos (forman parte del fondo)
+        ejes.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+        ejes.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+        ejes.set_xlabel('Desplazamiento (mm)')
+        ejes.set_ylabel('Fuerza (kN)')
+        ejes.set_title('Curva de Histéresis del Aislador Sísmico')
+        ejes.grid(True, alpha=0.3)
+
+        # Artistas que cambian en cada actualización
+        self.lazo, = ejes.plot([], [], 'b-', linewidth=2)
+        self.linea_carga = ejes.axhline(y=0, color='purple', linestyle='--', alpha=0.7, label='Carga máxima')
+        self.anotacion_fluencia = ejes.annotate('', xy=(0, 0), xytext=(0, 0),
+                                                arrowprops=dict(arrowstyle='->', color='red'),
+                                                fontsize=10, color='red')
+        self.anotacion_maximo = ejes.annotate('', xy=(0, 0), xytext=(0, 0),
+                                              arrowprops=dict(arrowstyle='->', color='green'),
+                                              fontsize=10, color='green')
+        self.leyenda = ejes.legend(handles=[self.linea_carga])
+        self.artistas = (self.lazo, self.linea_carga, self.anotacion_fluencia, self.anotacion_maximo, self.leyenda)
+        self._mostrar(False)
+
+        # Cualquier dibujo completo (p. ej. al redimensionar) invalida el fondo guardado
+        lienzo.mpl_connect('draw_event', self._al_dibujar)
+        self._capturando = False
+
+    def _mostrar(self, visible):
+        for artista in self.artistas:
+            artista.set_visible(visible)
+
+    def _al_dibujar(self, evento):
+        if not self._capturando:
+            self._fondo = None
+
+    def _capturar_fondo(self):
+        # Dibujo completo sin los artistas variables y copia del resultado
+        visibles = [a.get_visible() for a in self.artistas]
+        self._mostrar(False)
+        self._capturando = True
+        try:
+            self.lienzo.draw()
+        finally:
+            self._capturando = False
+        self._fondo = self.lienzo.copy_from_bbox(self.figura.bbox)
+        for artista, visible in zip(self.artistas, visibles):
+            artista.set_visible(visible)
+
+    def _pintar(self, limites_cambiaron=False):
+        if self._fondo is None or limites_cambiaron:
+            self._capturar_fondo()
+        self.lienzo.restore_region(self._fondo)
+        for artista in self.artistas:
+            if artista.get_visible():
+                self.ejes.draw_artist(artista)
+        self.lienzo.blit(self.figura.bbox)
+        self.lienzo.flush_events()
+
+    def puntos_max(self):
+        # Puntos útiles según el ancho actual del lienzo en píxeles
+        return PUNTOS_POR_PIXEL * max(int(self.figura.bbox.width), 1)
+
+    @instrumentacion.medir("dibujo del gráfico", argumento=1)
+    def actualizar(self, desplazamientos, fuerzas, fuerza_fluencia, desplazamiento_fluencia,
+                   desplazamiento_total, carga_kN):
+        self.datos = (np.array(desplazamientos), np.array(fuerzas), float(fuerza_fluencia),
+                      float(desplazamiento_fluencia), float(desplazamiento_total), float(carga_kN))
+        limites = (self.ejes.get_xlim(), self.ejes.get_ylim())
+        self._asignar(*self.datos)
+        self._pintar((self.ejes.get_xlim(), self.ejes.get_ylim()) != limites)
+
+    def _asignar(self, desplazamientos, fuerzas, fuerza_fluencia, desplazamiento_fluencia,
+                 desplazamiento_total, carga_kN):
+        # Actualiza los artistas y los límites de los ejes, sin pintar
+        x, y = diezmar_minmax(desplazamientos, fuerzas, self.puntos_max())
+        self.lazo.set_data(x, y)
+        self.linea_carga.set_ydata([carga_kN, carga_kN])
+        self.leyenda.get_texts()[0].set_text(f'Carga máxima: {carga_kN:.1f} kN')
+
+        self.anotacion_fluencia.set_text(f'Fy = {fuerza_fluencia:.1f} kN')
+        self.anotacion_fluencia.xy = (desplazamiento_fluencia, fuerza_fluencia)
+        self.anotacion_fluencia.set_position((desplazamiento_fluencia + 10, fuerza_fluencia + 50))
+
+        fuerza_maximo = fuerzas[np.argmax(np.asarray(desplazamientos) >= desplazamiento_total)]
+        self.anotacion_maximo.set_text(f'Δmax = {desplazamiento_total:.1f} mm')
+        self.anotacion_maximo.xy = (desplazamiento_total, fuerza_maximo)
+        self.anotacion_maximo.set_position((desplazamiento_total + 10, fuerza_fluencia))
+        self._mostrar(True)
+        self.ejes.relim()
+        self.ejes.autoscale_view()
+
+    def limpiar(self):
+        self.datos = None
+        self._mostrar(False)
+        self._pintar()
+
+
+@instrumentacion.medir("guardar gráfico")
+def guardar_figura(ruta, datos, tamano=(10, 6), dpi=300):
+    # Dibuja datos (GraficoHisteresis.datos) en una figura nueva con lienzo Agg y la guarda.
+    # No comparte artistas ni lienzo con la interfaz, así que puede correr en segundo plano.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figura = Figure(figsize=tamano)
+    lienzo = FigureCanvasAgg(figura)
+    grafico = GraficoHisteresis(figura, figura.add_subplot(), lienzo)
+    grafico._asignar(*datos)
+    figura.savefig(ruta, dpi=dpi, bbox_inches='tight')
@@ -0,0 +1,244 @@
+import argparse
+import sys
+
+import numpy as np
+
+import instrumentacion
+import motor_diseno
+from resultados import ResultadoDiseno
+
+# Recálculo incremental de la cadena de diseño como grafo de dependencias de magnitudes
+# con nombre (área → K_h → periodo → D_TD, ...). Al cambiar una entrada solo se
+# recalculan los nodos aguas abajo, en orden topológico; si un nodo recalculado conserva
+# su valor (p. ej. el diámetro comercial no cambia con una carga algo mayor) la
+# propagación se corta ahí. Los nombres de los nodos coinciden con las claves del
+# diccionario de motor_diseno.disenar_aisladores.
+
+ENTRADAS_DISENO = {
+    "carga_ton": 200.0,
+    "desplazamiento_max_mm": 150.0,
+    "S1": 0.6,
+    "SDS": 1.0,
+    "SD1": 0.8,
+    "TL": 8.0,
+    "diametro_aislador": 0.0,  # 0 = calcular automáticamente
+    "altura_caucho_indicada": 0.0,  # 0 = calcular automáticamente
+}
+
+VERIFICACIONES = (
+    "esfuerzo_actual", "deformacion_por_capa", "relacion_altura_diametro",
+    "cumple_esfuerzo", "cumple_deformacion", "cumple_estabilidad", "cumple_volteo",
+    "cumple_amortiguamiento", "cumple_general",
+)
+
+
+def _iguales(a, b):
+    if a is b:
+        return True
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_iguales(a[k], b[k]) for k in a)
+    try:
+        return bool(np.array_equal(a, b, equal_nan=True))
+    except TypeError:
+        return a == b
+
+
+class GrafoCalculo:
+    def __init__(self):
+        self._nodos = {}  # nombre -> (funcion, dependencias); las entradas no tienen función
+        self._dependientes = {}
+        self._orden = None
+        self._pendientes = set()
+        self._cambiados = set()
+        self.valores = {}
+        self.evaluaciones = 0  # número de nodos recalculados (diagnóstico)
+
+    def entrada(self, nombre, valor):
+        self._agregar(nombre, None, ())
+        self.valores[nombre] = valor
+        self._cambiados.add(nombre)
+
+    def nodo(self, nombre, funcion, dependencias):
+        # funcion recibe los valores de las dependencias en el mismo orden
+        self._agregar(nombre, funcion, tuple(dependencias))
+        self._pendientes.add(nombre)
+
+    def _agregar(self, nombre, funcion, dependencias):
+        if nombre in self._nodos:
+            raise ValueError(f"El nodo '{nombre}' ya está definido")
+        faltantes = [d for d in dependencias if d not in self._nodos]
+        if faltantes:
+            raise ValueError(f"El nodo '{nombre}' depende de nodos no definidos: {', '.join(faltantes)}")
+        self._nodos[nombre] = (funcion, dependencias)
+        self._dependientes[nombre] = []
+        for d in dependencias:
+            self._dependientes[d].append(nombre)
+        # Los nodos solo pueden depender de nodos ya definidos: el orden de definición es topológico
+        self._orden = list(self._nodos)
+
+    def asignar(self, nombre, valor):
+        # Cambia una entrada; devuelve False si el valor no cambió (no se invalida nada)
+        if self._nodos[nombre][0] is not None:
+            raise ValueError(f"'{nombre}' es un nodo calculado, no una entrada")
+        if _iguales(self.valores.get(nombre), valor):
+            return False
+        self.valores[nombre] = valor
+        self._cambiados.add(nombre)
+        self._pendientes.update(self._dependientes[nombre])
+        return True
+
+    @instrumentacion.medir("grafo: recalcular")
+    def recalcular(self):
+        # Recalcula los nodos invalidados; devuelve el conjunto de nombres cuyo valor cambió
+        if self._pendientes:
+            for nombre in self._orden:
+                if nombre not in self._pendientes:
+                    continue
+                funcion, dependencias = self._nodos[nombre]
+                valor = funcion(*(self.valores[d] for d in dependencias))
+                self.evaluaciones += 1
+                if nombre not in self.valores or not _iguales(self.valores[nombre], valor):
+                    self.valores[nombre] = valor
+                    self._cambiados.add(nombre)
+                    self._pendientes.update(self._dependientes[nombre])
+            self._pendientes.clear()
+        cambiados, self._cambiados = self._cambiados, set()
+        return cambiados
+
+    def obtener(self, nombre):
+        if self._pendientes:
+            self.recalcular()
+        return self.valores[nombre]
+
+    __getitem__ = obtener
+
+    def aguas_abajo(self, nombre):
+        # Todos los nodos que dependen (directa o indirectamente) de nombre
+        visitados, pila = set(), [nombre]
+        while pila:
+            for d in self._dependientes[pila.pop()]:
+                if d not in visitados:
+                    visitados.add(d)
+                    pila.append(d)
+        return visitados
+
+
+def crear_grafo_diseno(entradas=None, cache=None):
+    # Grafo de la cadena de diseño de un aislador (pasos 1-10 y verificaciones). Cada nodo
+    # llama a la función del paso en motor_diseno, de modo que el grafo y
+    # disenar_aisladores comparten las fórmulas (ver comprobar_equivalencia).
+    # Con una caché (cache_resultados.CacheResultados) la iteración del periodo efectivo,
+    # el único paso costoso, se memoriza entre sesiones.
+    grafo = GrafoCalculo()
+    for nombre, valor in dict(ENTRADAS_DISENO, **(entradas or {})).items():
+        grafo.entrada(nombre, valor)
+
+    def _efectivo(carga_kN, rigidez_horizontal, fuerza_fluencia, SD1):
+        def calcular():
+            return motor_diseno.resolver_periodo_lrb(carga_kN, rigidez_horizontal, fuerza_fluencia, SD1)
+        if cache is None:
+            return calcular()
+        return cache.obtener("periodo_efectivo", (carga_kN, rigidez_horizontal, fuerza_fluencia, SD1), calcular)
+
+    def _f(funcion, dtype=float):
+        # Los nodos guardan escalares de Python (comparación y formato directos)
+        return lambda *valores: dtype(funcion(*(np.asarray(v, dtype=float) for v in valores)))
+
+    def _par(funcion):
+        # Pasos que devuelven dos magnitudes: el nodo guarda el par y cada una se extrae aparte
+        return lambda *valores: tuple(float(v) for v in funcion(*(np.asarray(v, dtype=float) for v in valores)))
+
+    grafo.nodo("carga_kN", lambda carga_ton: carga_ton * motor_diseno.GRAVEDAD, ["carga_ton"])
+    grafo.nodo("diametro", _f(motor_diseno.calcular_diametro), ["carga_kN", "diametro_aislador"])
+    grafo.nodo("espesor_capa", _f(motor_diseno.calcular_espesor_capa), ["diametro"])
+    grafo.nodo("capas", _par(motor_diseno.calcular_capas),
+               ["desplazamiento_max_mm", "espesor_capa", "altura_caucho_indicada"])
+    grafo.nodo("num_capas", lambda capas: int(capas[0]), ["capas"])
+    grafo.nodo("altura_caucho", lambda capas: capas[1], ["capas"])
+    grafo.nodo("area_total", _f(motor_diseno.calcular_area), ["diametro"])
+    grafo.nodo("relacion_forma", _f(motor_diseno.calcular_relacion_forma), ["diametro", "espesor_capa"])
+    grafo.nodo("altura_total", _f(motor_diseno.calcular_altura_total), ["num_capas", "altura_caucho"])
+    grafo.nodo("relacion_nucleo", lambda: motor_diseno.RELACION_NUCLEO, [])
+    grafo.nodo("nucleo", _par(motor_diseno.calcular_nucleo), ["area_total", "relacion_nucleo"])
+    grafo.nodo("area_nucleo", lambda nucleo: nucleo[0], ["nucleo"])
+    grafo.nodo("diametro_nucleo", lambda nucleo: nucleo[1], ["nucleo"])
+    grafo.nodo("fuerza_fluencia", _f(motor_diseno.calcular_fuerza_fluencia), ["area_nucleo"])
+    grafo.nodo("rigideces",
+               _par(lambda area, h, s: motor_diseno.calcular_rigideces(area, h, relacion_forma=s)),
+               ["area_total", "altura_caucho", "relacion_forma"])
+    grafo.nodo("rigidez_horizontal", lambda rigideces: rigideces[0], ["rigideces"])
+    grafo.nodo("rigidez_vertical", lambda rigideces: rigideces[1], ["rigideces"])
+
+    # 8-10. Iteración del periodo y amortiguamiento efectivos
+    grafo.nodo("efectivo", _efectivo, ["carga_kN", "rigidez_horizontal", "fuerza_fluencia", "SD1"])
+    for nombre, clave in (("rigidez_efectiva", "rigidez_efectiva"), ("periodo_aislado", "periodo"),
+                          ("desplazamiento_total", "desplazamiento"), ("coef_amortiguamiento", "amortiguamiento"),
+                          ("BD", "BD"), ("iteraciones", "iteraciones"), ("residuo", "residuo")):
+        grafo.nodo(nombre, lambda efectivo, clave=clave: efectivo[clave].item(), ["efectivo"])
+
+    # Verificaciones ASCE 7 con motor_diseno.verificar_aisladores (solo con lo que usa)
+    datos_verificacion = ("carga_kN", "desplazamiento_max_mm", "diametro", "num_capas", "espesor_capa",
+                          "altura_total", "coef_amortiguamiento")
+    grafo.nodo("verificacion",
+               lambda *valores: motor_diseno.verificar_aisladores(dict(zip(datos_verificacion, valores))),
+               datos_verificacion)
+    for nombre in VERIFICACIONES:
+        grafo.nodo(nombre, lambda verificacion, nombre=nombre: np.asarray(verificacion[nombre]).item(), ["verificacion"])
+    return grafo
+
+
+def comprobar_equivalencia(casos, tolerancia=1e-12):
+    # Compara el grafo con motor_diseno.disenar_aisladores + verificar_aisladores en una
+    # serie de entradas (diccionarios como ENTRADAS_DISENO), recalculando el mismo grafo de
+    # forma incremental de un caso al siguiente. Devuelve la lista de diferencias
+    # (caso, campo, valor del grafo, valor del motor); vacía si coinciden.
+    grafo = None
+    diferencias = []
+    for i, caso in enumerate(casos):
+        entradas = dict(ENTRADAS_DISENO, **caso)
+        if grafo is None:
+            grafo = crear_grafo_diseno(entradas)
+        for nombre, valor in entradas.items():
+            grafo.asignar(nombre, valor)
+        grafo.recalcular()
+
+        diseno = motor_diseno.disenar_aisladores(
+            entradas["carga_ton"], entradas["desplazamiento_max_mm"], entradas["S1"], entradas["SDS"],
+            entradas["SD1"], entradas["TL"], diametro_aislador=entradas["diametro_aislador"],
+            altura_caucho=entradas["altura_caucho_indicada"])
+        esperados = {**diseno, **motor_diseno.verificar_aisladores(diseno)}
+        for campo in ResultadoDiseno.campos():
+            obtenido, esperado = grafo.valores[campo], np.asarray(esperados[campo]).item()
+            if not np.isclose(obtenido, esperado, rtol=tolerancia, atol=0) or type(obtenido) != type(esperado):
+                diferencias.append((i, campo, obtenido, esperado))
+    return diferencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Comprueba que el grafo de diseño coincide con motor_diseno.disenar_aisladores."
+    )
+    parser.add_argument("-n", type=int, default=500, help="Número de casos aleatorios")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.semilla)
+    casos = [{
+        "carga_ton": float(rng.choice([50.0, 120.0, 200.0, 350.0, 800.0]) * rng.choice([1.0, 1.0 + 1e-9])),
+        "desplazamiento_max_mm": float(rng.choice([100.0, 150.0, 250.0, 400.0])),
+        "S1": float(rng.uniform(0.2, 1.2)),
+        "SD1": float(rng.uniform(0.2, 1.2)),
+        "SDS": float(rng.uniform(0.5, 2.0)),
+        "TL": float(rng.choice([4.0, 8.0, 12.0])),
+        "diametro_aislador": float(rng.choice([0.0, 0.0, 450.0, 700.0])),
+        "altura_caucho_indicada": float(rng.choice([0.0, 0.0, 180.0, 320.0])),
+    } for _ in range(args.n)]
+    diferencias = comprobar_equivalencia(casos)
+    for caso, campo, obtenido, esperado in diferencias[:20]:
+        print(f"caso {caso}: {campo} = {obtenido!r} en el grafo, {esperado!r} en el motor")
+    print(f"{len(casos)} casos, {len(diferencias)} diferencias")
+    return 1 if diferencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import numpy as np
+
+import instrumentacion
+
+# Núcleo de histéresis bilineal con endurecimiento cinemático para aisladores LRB.
+# Todas las funciones trabajan por lotes: el último eje es el tiempo (pasos del protocolo)
+# y los ejes anteriores recorren aisladores, de modo que cientos de aisladores se
+# procesan en un solo recorrido del protocolo.
+
+
+def protocolo_ciclico(amplitudes, ciclos, puntos_por_ciclo=200):
+    # Ciclos triangulares completamente invertidos 0 → +A → 0 → -A → 0.
+    # Devuelve (desplazamientos, ciclo) con el índice de ciclo de cada punto.
+    # Las amplitudes son relativas: se escalan por aislador multiplicando el resultado.
+    amplitudes = np.repeat(np.asarray(amplitudes, dtype=float), ciclos)
+    fase = (np.arange(puntos_por_ciclo) + 1) / puntos_por_ciclo
+    onda = np.where(fase < 0.25, 4 * fase, np.where(fase < 0.75, 2 - 4 * fase, 4 * fase - 4))
+    desplazamientos = np.concatenate([[0.0], (amplitudes[:, None] * onda[None, :]).ravel()])
+    ciclo = np.concatenate([[0], np.repeat(np.arange(amplitudes.size), puntos_por_ciclo)])
+    return desplazamientos, ciclo
+
+
+def protocolo_ensayo_prototipo(relacion_DTM=1.15, ciclos_finales=10, puntos_por_ciclo=200):
+    # Secuencia de ensayo de prototipos ASCE 7-16 §17.8.2.2 (partes controladas por
+    # desplazamiento), en fracciones de D_M:
+    #   3 ciclos a 0.25, 0.50, 0.67 y 1.0 D_M; 3 ciclos a D_TM;
+    #   30·SM1/(SMS·BM) (no menos de 10) ciclos a 0.75 D_TM.
+    amplitudes = [0.25, 0.5, 0.67, 1.0, relacion_DTM, 0.75 * relacion_DTM]
+    ciclos = [3, 3, 3, 3, 3, max(10, int(np.ceil(ciclos_finales)))]
+    return protocolo_ciclico(amplitudes, ciclos, puntos_por_ciclo)
+
+
+def ciclos_finales_ensayo(SM1, SMS, BM):
+    # Número de ciclos del último tramo del ensayo de prototipos (mínimo 10)
+    return np.maximum(10, np.ceil(30 * np.asarray(SM1) / (np.asarray(SMS) * np.asarray(BM))))
+
+
+@instrumentacion.medir("histéresis")
+def lazo_bilineal(desplazamientos, rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia,
+                  nucleo=None, dt=None, metros_por_unidad=1.0, historia_temperatura=False):
+    # Fuerza restauradora de un modelo bilineal con endurecimiento cinemático bajo un
+    # protocolo de desplazamientos arbitrario (dependiente de la trayectoria).
+    # La fuerza de prueba elástica se limita a las ramas post-fluencia K2·x ± Qd,
+    # con Qd = Fy·(1 - K2/K1) la resistencia característica.
+    # nucleo: calentamiento_plomo.NucleoPlomo para degradar Qd con la temperatura del
+    # plomo; requiere dt (s entre puntos del protocolo) y metros_por_unidad (1e-3 si los
+    # desplazamientos están en mm, con fuerzas en kN). Con historia_temperatura devuelve
+    # (fuerzas, temperaturas).
+    x = np.asarray(desplazamientos, dtype=float)
+    K1 = np.asarray(rigidez_elastica, dtype=float)
+    K2 = np.asarray(rigidez_post_fluencia, dtype=float)
+    Fy = np.asarray(fuerza_fluencia, dtype=float)
+    lote = np.broadcast_shapes(x.shape[:-1], K1.shape, K2.shape, Fy.shape)
+    x = np.broadcast_to(x, lote + x.shape[-1:])
+    K1, K2 = np.broadcast_to(K1, lote), np.broadcast_to(K2, lote)
+    Qd = np.broadcast_to(Fy * (1 - K2 / K1), lote)
+
+    fuerzas = np.empty(x.shape)
+    fuerza = np.clip(K1 * x[..., 0], K2 * x[..., 0] - Qd, K2 * x[..., 0] + Qd)
+    fuerzas[..., 0] = fuerza
+    if nucleo is not None:
+        if dt is None:
+            raise ValueError("El calentamiento del plomo requiere dt")
+        return _lazo_bilineal_termico(x, K1, K2, Qd, fuerzas, nucleo, dt, metros_por_unidad,
+                                      historia_temperatura)
+    for k in range(1, x.shape[-1]):
+        xk = x[..., k]
+        fuerza = fuerza + K1 * (xk - x[..., k - 1])
+        fuerza = np.minimum(np.maximum(fuerza, K2 * xk - Qd), K2 * xk + Qd)
+        fuerzas[..., k] = fuerza
+    return fuerzas
+
+
+def _lazo_bilineal_termico(x, K1, K2, Qd0, fuerzas, nucleo, dt, metros_por_unidad, historia_temperatura):
+    # Mismo lazo con Qd(T) = Qd0·factor actualizado en cada paso por el trabajo del plomo
+    # (fuerza − K2·x) en el incremento, y una temperatura por aislador
+    temperaturas = np.empty(x.shape) if historia_temperatura else None
+    factor = nucleo.factor_resistencia()
+    retencion = nucleo.retencion_conduccion(x.shape[-1] - 1, dt)
+    escala = 0.5 * metros_por_unidad
+    fuerza = fuerzas[..., 0]
+    plomo = fuerza - K2 * x[..., 0]
+    if historia_temperatura:
+        temperaturas[..., 0] = nucleo.temperatura
+    for k in range(1, x.shape[-1]):
+        xk = x[..., k]
+        dx = xk - x[..., k - 1]
+        Qd = Qd0 * factor
+        K2x = K2 * xk
+        fuerza = fuerza + K1 * dx
+        fuerza = np.minimum(np.maximum(fuerza, K2x - Qd), K2x + Qd)
+        fuerzas[..., k] = fuerza
+        plomo_nuevo = fuerza - K2x
+        factor = nucleo.calentar((plomo + plomo_nuevo) * (escala * dx), dt, retencion[k - 1])
+        plomo = plomo_nuevo
+        if historia_temperatura:
+            temperaturas[..., k] = nucleo.temperatura
+    return (fuerzas, temperaturas) if historia_temperatura else fuerzas
+
+
+def propiedades_por_ciclo(desplazamientos, fuerzas, ciclo):
+    # Energía disipada por ciclo (EDC, área encerrada), rigidez efectiva
+    # K_eff = (F+ - F-)/(Δ+ - Δ-) y amortiguamiento efectivo β = EDC/(2π·K_eff·Δ²)
+    # para cada ciclo del protocolo. Devuelve arreglos con forma (..., n_ciclos).
+    x = np.broadcast_to(np.asarray(desplazamientos, dtype=float), np.shape(fuerzas))
+    ciclo = np.asarray(ciclo)
+    inicios = np.flatnonzero(np.diff(ciclo, prepend=ciclo[0] - 1))
+
+    # Trabajo de cada segmento (regla del trapecio) asignado al ciclo de su punto final
+    trabajo = 0.5 * (fuerzas[..., 1:] + fuerzas[..., :-1]) * np.diff(x, axis=-1)
+    trabajo = np.concatenate([np.zeros(trabajo.shape[:-1] + (1,)), trabajo], axis=-1)
+    edc = np.add.reduceat(trabajo, inicios, axis=-1)
+
+    d_max = np.maximum.reduceat(x, inicios, axis=-1)
+    d_min = np.minimum.reduceat(x, inicios, axis=-1)
+    f_max = np.maximum.reduceat(fuerzas, inicios, axis=-1)
+    f_min = np.minimum.reduceat(fuerzas, inicios, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rigidez_efectiva = (f_max - f_min) / (d_max - d_min)
+        amplitud = 0.5 * (d_max - d_min)
+        amortiguamiento = edc / (2 * np.pi * rigidez_efectiva * amplitud**2)
+
+    return {
+        "edc": edc,
+        "rigidez_efectiva": rigidez_efectiva,
+        "amortiguamiento_efectivo": amortiguamiento,
+        "desplazamiento_max": d_max,
+        "desplazamiento_min": d_min,
+    }
+
+
+def generar_histeresis(desplazamientos, ciclo, rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia,
+                       nucleo=None, dt=None, metros_por_unidad=1.0):
+    # Traza completa más propiedades por ciclo para un lote de aisladores (con nucleo,
+    # también la temperatura del plomo en cada punto; ver lazo_bilineal)
+    temperaturas = None
+    if nucleo is None:
+        fuerzas = lazo_bilineal(desplazamientos, rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia)
+    else:
+        fuerzas, temperaturas = lazo_bilineal(desplazamientos, rigidez_elastica, rigidez_post_fluencia,
+                                              fuerza_fluencia, nucleo, dt, metros_por_unidad, True)
+    resultado = propiedades_por_ciclo(desplazamientos, fuerzas, ciclo)
+    if temperaturas is not None:
+        resultado["temperatura"] = temperaturas
+    resultado["desplazamiento"] = np.broadcast_to(desplazamientos, fuerzas.shape)
+    resultado["fuerza"] = fuerzas
+    return resultado
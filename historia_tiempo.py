@@ -0,0 +1,166 @@
+import numpy as np
+
+import calentamiento_plomo
+import motor_diseno
+
+# Análisis de respuesta en el tiempo no lineal del sistema aislado de un grado de libertad.
+# Cada aislador se representa como una masa sobre un resorte histerético
+#     F = K2·x + Qd·z,   Qd = Fy·(1 - K2/K1),   z ∈ [-1, 1]
+# con z bilineal (endurecimiento cinemático) o de Bouc-Wen. La integración usa el método
+# de separación de operadores (Nakashima) con Newmark de aceleración promedio: el paso es
+# explícito en la parte histerética y no requiere iteraciones, por lo que se vectoriza
+# sobre todos los registros y todas las variantes de aislador a la vez.
+# Opcionalmente Qd se degrada paso a paso con la temperatura del núcleo de plomo
+# (calentamiento_plomo.NucleoPlomo, un estado térmico por aislador y registro); el
+# desplazamiento de fluencia Qd/(K1 − K2) se escala con el mismo factor.
+#
+# Unidades: aceleraciones en g, masa en t, rigideces en kN/m, fuerzas en kN;
+# los desplazamientos de salida se entregan en mm.
+
+MODELOS = ("bilineal", "bouc_wen")
+
+# Parámetros de Bouc-Wen (A = 1, β + γ = 1 reproduce el lazo bilineal en el límite n → ∞)
+BOUC_WEN_BETA = 0.5
+BOUC_WEN_GAMMA = 0.5
+BOUC_WEN_N = 2.0
+
+
+def apilar_registros(registros, dt=None):
+    # Lleva una lista de (aceleraciones, dt) a un arreglo común (n_registros, n_pasos):
+    # se remuestrea por interpolación lineal al menor dt y se completa con ceros.
+    dt = dt or min(d for _, d in registros)
+    remuestreados = []
+    for acel, dt_registro in registros:
+        acel = np.asarray(acel, dtype=float)
+        if dt_registro != dt:
+            t = np.arange(acel.size) * dt_registro
+            acel = np.interp(np.arange(0.0, t[-1] + 0.5 * dt, dt), t, acel)
+        remuestreados.append(acel)
+    apilados = np.zeros((len(remuestreados), max(a.size for a in remuestreados)))
+    for i, acel in enumerate(remuestreados):
+        apilados[i, :acel.size] = acel
+    return apilados, dt
+
+
+def _actualizar_z(z, incremento, desplazamiento_fluencia, modelo, n_bouc_wen):
+    u = incremento / desplazamiento_fluencia
+    if modelo == "bilineal":
+        return np.clip(z + u, -1.0, 1.0)
+    dz = u * (1.0 - np.abs(z)**n_bouc_wen * (BOUC_WEN_GAMMA * np.sign(u * z) + BOUC_WEN_BETA))
+    return np.clip(z + dz, -1.0, 1.0)
+
+
+def respuesta_historia(aceleraciones_g, dt, masa, rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia,
+                       modelo="bilineal", amortiguamiento=0.0, n_bouc_wen=BOUC_WEN_N, guardar_historia=False,
+                       nucleo=None):
+    # aceleraciones_g: (n_pasos,) o (n_registros, n_pasos).
+    # Las propiedades del aislador pueden tener cualquier forma (p. ej. (n_cotas, n_aisladores));
+    # el resultado tiene forma (n_registros,) + forma_propiedades.
+    # amortiguamiento: razón viscosa referida a la rigidez post-fluencia (0 = solo histerético).
+    # nucleo: NucleoPlomo con geometría de forma compatible con forma_propiedades para
+    # degradar Qd por calentamiento (su temperatura pasa a tener la forma del resultado).
+    if modelo not in MODELOS:
+        raise ValueError(f"Modelo de histéresis desconocido: {modelo!r} (use {', '.join(MODELOS)})")
+
+    ag = np.atleast_2d(np.asarray(aceleraciones_g, dtype=float)) * motor_diseno.GRAVEDAD
+    n_registros, n_pasos = ag.shape
+    m, K1, K2, Fy = (np.asarray(v, dtype=float) for v in (masa, rigidez_elastica, rigidez_post_fluencia,
+                                                          fuerza_fluencia))
+    forma_propiedades = np.broadcast_shapes(m.shape, K1.shape, K2.shape, Fy.shape)
+    forma = (n_registros,) + forma_propiedades
+    m, K1, K2, Fy = (np.broadcast_to(v, forma_propiedades) for v in (m, K1, K2, Fy))
+    ag = ag.reshape((n_registros,) + (1,) * len(forma_propiedades) + (n_pasos,))
+
+    Qd0 = Fy * (1 - K2 / K1)
+    dy0 = Fy / K1
+    Qd, dy = Qd0, dy0
+    if nucleo is not None:
+        factor = nucleo.factor_resistencia()
+        Qd, dy = Qd0 * factor, dy0 * factor
+        factor_min = np.broadcast_to(factor, forma).copy()
+        retencion = nucleo.retencion_conduccion(n_pasos - 1, dt)
+    c = 2 * amortiguamiento * np.sqrt(K2 * m)
+
+    # Newmark de aceleración promedio (β = 1/4, γ = 1/2); la corrección usa la rigidez inicial
+    beta, gamma = 0.25, 0.5
+    masa_efectiva = m + gamma * dt * c + beta * dt**2 * K1
+
+    d = np.zeros(forma)
+    v = np.zeros(forma)
+    z = np.zeros(forma)
+    a = -ag[..., 0] * np.ones(forma)
+    fuerza = np.zeros(forma)
+    energia = np.zeros(forma)
+    d_max = np.zeros(forma)
+    f_max = np.zeros(forma)
+    if guardar_historia:
+        historia_d = np.empty(forma + (n_pasos,), dtype=np.float32)
+        historia_f = np.empty(forma + (n_pasos,), dtype=np.float32)
+        historia_d[..., 0] = 0.0
+        historia_f[..., 0] = 0.0
+        if nucleo is not None:
+            historia_t = np.empty(forma + (n_pasos,), dtype=np.float32)
+            historia_t[..., 0] = nucleo.temperatura
+
+    for k in range(1, n_pasos):
+        # Predictor explícito
+        d_pred = d + dt * v + (0.5 - beta) * dt**2 * a
+        v_pred = v + (1 - gamma) * dt * a
+        z_pred = _actualizar_z(z, d_pred - d, dy, modelo, n_bouc_wen)
+        fuerza_pred = K2 * d_pred + Qd * z_pred
+
+        # Corrector con la rigidez inicial
+        a = (-m * ag[..., k] - c * v_pred - fuerza_pred) / masa_efectiva
+        d_nuevo = d_pred + beta * dt**2 * a
+        v = v_pred + gamma * dt * a
+
+        # Estado histerético consolidado con el incremento total del paso
+        z_nuevo = _actualizar_z(z, d_nuevo - d, dy, modelo, n_bouc_wen)
+        trabajo = 0.5 * Qd * (z + z_nuevo) * (d_nuevo - d)
+        energia += trabajo
+        d, z = d_nuevo, z_nuevo
+        fuerza = K2 * d + Qd * z
+        if nucleo is not None:
+            # Qd y dy del paso siguiente con la temperatura que deja el trabajo del plomo
+            factor = nucleo.calentar(trabajo, dt, retencion[k - 1])
+            Qd, dy = Qd0 * factor, dy0 * factor
+            np.minimum(factor_min, factor, out=factor_min)
+
+        np.maximum(d_max, np.abs(d), out=d_max)
+        np.maximum(f_max, np.abs(fuerza), out=f_max)
+        if guardar_historia:
+            historia_d[..., k] = d * 1000
+            historia_f[..., k] = fuerza
+            if nucleo is not None:
+                historia_t[..., k] = nucleo.temperatura
+
+    # Energía histerética disipada: trabajo de Qd·z menos la energía elástica aún almacenada
+    energia -= 0.5 * Qd * dy * z**2
+
+    resultado = {
+        "desplazamiento_max_mm": d_max * 1000,
+        "fuerza_max_kN": f_max,
+        "energia_histeretica_kNm": energia,
+        "desplazamiento_residual_mm": d * 1000,
+    }
+    if guardar_historia:
+        resultado["tiempo"] = np.arange(n_pasos) * dt
+        resultado["desplazamiento_mm"] = historia_d
+        resultado["fuerza_kN"] = historia_f
+        if nucleo is not None:
+            resultado["temperatura_C"] = historia_t
+    if nucleo is not None:
+        # El factor es monótono en T: el mínimo corresponde a la temperatura máxima
+        resultado["temperatura_max_C"] = -np.log(factor_min) / calentamiento_plomo.COEF_TEMPERATURA
+        resultado["temperatura_final_C"] = np.broadcast_to(nucleo.temperatura, forma).copy()
+        resultado["factor_Qd_min"] = factor_min
+    return resultado
+
+
+def respuesta_historia_diseno(aceleraciones_g, dt, diseno, calentamiento=False, **opciones):
+    # Atajo: historia de respuesta de los aisladores de un diseño de motor_diseno
+    # (calentamiento=True: núcleo de plomo con la geometría del diseño, desde T = 0)
+    masa, K1, K2, Fy = motor_diseno.parametros_bilineales(diseno)
+    if calentamiento:
+        opciones["nucleo"] = calentamiento_plomo.NucleoPlomo.desde_diseno(diseno)
+    return respuesta_historia(aceleraciones_g, dt, masa, K1, K2, Fy, **opciones)
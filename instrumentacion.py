@@ -0,0 +1,186 @@
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+# Instrumentación opcional de etapas: tiempo de reloj, número de llamadas y tamaño de los
+# arreglos procesados por cada etapa del diseño (pasos 1-10), la verificación, el gráfico
+# y la exportación.
+# Desactivada por defecto: medir() y etapa() solo comprueban una variable global y llaman
+# a la función original, así que el costo es de unos cientos de nanosegundos por llamada.
+# Se activa con activar() o con la variable de entorno AISLADOR_PERFIL=<ruta> (solo en el
+# proceso principal), que además vuelca el resultado al salir. El volcado es una tabla de
+# texto, o una traza de eventos de Chrome si la ruta termina en .json (se abre en
+# chrome://tracing o en ui.perfetto.dev).
+
+VARIABLE_ENTORNO = "AISLADOR_PERFIL"
+MAX_EVENTOS = 1_000_000  # eventos guardados para la traza (los agregados no tienen límite)
+
+_registro = None  # Registro activo, o None si la instrumentación está desactivada
+
+
+class Registro:
+    def __init__(self, max_eventos=MAX_EVENTOS):
+        self.inicio_ns = time.perf_counter_ns()
+        self.max_eventos = max_eventos
+        self.etapas = {}  # nombre -> [llamadas, total_ns, mínimo_ns, máximo_ns, elementos]
+        self.eventos = []  # (nombre, inicio_ns, duración_ns, hilo, elementos)
+        self.eventos_descartados = 0
+        self._candado = threading.Lock()
+
+    def agregar(self, nombre, inicio_ns, fin_ns, elementos):
+        duracion = fin_ns - inicio_ns
+        with self._candado:
+            etapa = self.etapas.get(nombre)
+            if etapa is None:
+                self.etapas[nombre] = [1, duracion, duracion, duracion, elementos]
+            else:
+                etapa[0] += 1
+                etapa[1] += duracion
+                etapa[2] = min(etapa[2], duracion)
+                etapa[3] = max(etapa[3], duracion)
+                etapa[4] += elementos
+            if len(self.eventos) < self.max_eventos:
+                self.eventos.append((nombre, inicio_ns, duracion, threading.get_ident(), elementos))
+            else:
+                self.eventos_descartados += 1
+
+
+class _Etapa:
+    __slots__ = ("nombre", "elementos", "inicio_ns")
+
+    def __init__(self, nombre, elementos):
+        self.nombre = nombre
+        self.elementos = elementos
+
+    def __enter__(self):
+        self.inicio_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        registro = _registro
+        if registro is not None:
+            registro.agregar(self.nombre, self.inicio_ns, time.perf_counter_ns(), self.elementos)
+        return False
+
+
+class _EtapaNula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+
+_ETAPA_NULA = _EtapaNula()
+
+
+def activar(max_eventos=MAX_EVENTOS):
+    # Empieza un registro nuevo (descarta el anterior) y lo devuelve
+    global _registro
+    _registro = Registro(max_eventos)
+    return _registro
+
+
+def desactivar():
+    # Detiene la instrumentación y devuelve el registro acumulado (o None)
+    global _registro
+    registro, _registro = _registro, None
+    return registro
+
+
+def activa():
+    return _registro is not None
+
+
+def registro_actual():
+    return _registro
+
+
+def etapa(nombre, elementos=0):
+    # Bloque medido:  with instrumentacion.etapa("exportación", n): ...
+    return _ETAPA_NULA if _registro is None else _Etapa(nombre, elementos)
+
+
+def _elementos(valor):
+    # Elementos de un arreglo, de un registro por lotes o de un diccionario de arreglos (1 si no)
+    if isinstance(valor, dict):
+        valor = next(iter(valor.values()), None)
+    tamano = getattr(valor, "size", None)
+    if tamano is not None:
+        return int(tamano)
+    try:
+        return len(valor)
+    except TypeError:
+        return 1
+
+
+def medir(nombre, argumento=0):
+    # Decorador de etapa; el tamaño registrado es el del argumento posicional indicado
+    # (argumento=1 en métodos, para saltar self)
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*argumentos, **opciones):
+            registro = _registro
+            if registro is None:
+                return funcion(*argumentos, **opciones)
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*argumentos, **opciones)
+            finally:
+                registro.agregar(nombre, inicio, time.perf_counter_ns(),
+                                 _elementos(argumentos[argumento]) if len(argumentos) > argumento else 0)
+        return envoltura
+    return decorador
+
+
+def tabla(registro=None):
+    # Tabla plana por etapa, ordenada por tiempo total
+    registro = _registro if registro is None else registro
+    if registro is None or not registro.etapas:
+        return "Sin etapas registradas"
+    transcurrido = max(time.perf_counter_ns() - registro.inicio_ns, 1)
+    lineas = [f"{'Etapa':32s} {'Llamadas':>9s} {'Total ms':>11s} {'%':>6s} {'Media µs':>11s} "
+              f"{'Mín. µs':>10s} {'Máx. µs':>11s} {'Elementos':>12s}"]
+    for nombre, (llamadas, total, minimo, maximo, elementos) in sorted(
+            registro.etapas.items(), key=lambda e: -e[1][1]):
+        lineas.append(f"{nombre:32s} {llamadas:9d} {total / 1e6:11.3f} {100 * total / transcurrido:6.1f} "
+                      f"{total / llamadas / 1e3:11.1f} {minimo / 1e3:10.1f} {maximo / 1e3:11.1f} {elementos:12d}")
+    if registro.eventos_descartados:
+        lineas.append(f"({registro.eventos_descartados} eventos no guardados en la traza)")
+    return "\n".join(lineas)
+
+
+def traza_chrome(registro=None):
+    # Diccionario en formato Trace Event (eventos completos "X", tiempos en µs)
+    registro = _registro if registro is None else registro
+    pid = os.getpid()
+    eventos = [] if registro is None else [
+        {"name": nombre, "cat": "aislador", "ph": "X", "pid": pid, "tid": hilo,
+         "ts": (inicio - registro.inicio_ns) / 1e3, "dur": duracion / 1e3, "args": {"elementos": elementos}}
+        for nombre, inicio, duracion, hilo, elementos in registro.eventos
+    ]
+    return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+
+def volcar(ruta, registro=None):
+    # Tabla de texto (ruta .json: traza de Chrome; '-': error estándar)
+    registro = _registro if registro is None else registro
+    if ruta == "-":
+        print(tabla(registro), file=sys.stderr)
+    elif ruta.lower().endswith(".json"):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(traza_chrome(registro), f)
+    else:
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(tabla(registro) + "\n")
+
+
+if os.environ.get(VARIABLE_ENTORNO) and multiprocessing.parent_process() is None:
+    atexit.register(volcar, os.environ[VARIABLE_ENTORNO], activar())
@@ -0,0 +1,384 @@
+import numpy as np
+
+import instrumentacion
+
+# Motor de diseño vectorizado (sin interfaz gráfica) del aislador LRB según ASCE 7-16, Capítulo 17.
+# Todas las funciones aceptan escalares o arreglos de NumPy y operan elemento a elemento,
+# de modo que un edificio completo (cientos o miles de aisladores) se diseña en una sola llamada.
+# Cada paso es una etapa de instrumentacion (desactivada por defecto).
+
+GRAVEDAD = 9.81  # m/s²
+
+# Versión de las fórmulas del motor; forma parte de la clave de la caché de resultados,
+# por lo que debe incrementarse al cambiar cualquier cálculo
+VERSION_MOTOR = "2"
+
+# Parámetros de diseño según ASCE 7-16, Capítulo 17
+ESFUERZO_ADMISIBLE = 11.0  # MPa (máximo según ASCE 7-17 para carga de servicio)
+RELACION_FORMA = 8.0  # Relación de forma típica (S = D/(4t))
+MODULO_CORTE = 0.8  # MPa (módulo de corte del elastómero)
+MODULO_COMPRESION = 2000.0  # MPa (módulo de compresión volumétrico)
+ESFUERZO_FLUENCIA_PLOMO = 10.0  # MPa (esfuerzo de fluencia del plomo)
+ESPESOR_PLACA_ACERO = 3.0  # mm (espesor típico de placas de acero)
+DEFORMACION_MAX_CAPA = 0.5  # 50% de deformación máxima por capa (ASCE 7-17.2.3.2)
+RELACION_NUCLEO = 0.2  # Área del núcleo de plomo como fracción del área total (15-25%)
+# Para un aislador con núcleo de plomo, la rigidez post-fluencia (la del caucho, K_h)
+# es aproximadamente 10% de la rigidez elástica
+RELACION_POST_FLUENCIA = 0.1
+
+# Límites de verificación según ASCE 7-16
+RELACION_ESTABILIDAD = 3.0  # Relación altura/diámetro máxima (ASCE 7-17.2.3.3)
+AMORTIGUAMIENTO_MIN = 15.0  # % mínimo para LRB (ASCE 7-17.5.3.3)
+
+# Tabla 17.7-1 de ASCE 7-16: coeficiente de amortiguamiento B_D en función de β efectivo (%)
+TABLA_AMORTIGUAMIENTO = np.array([2.0, 5.0, 10.0, 20.0, 30.0, 40.0, 50.0])
+TABLA_COEFICIENTE_B = np.array([0.8, 1.0, 1.2, 1.5, 1.7, 1.9, 2.0])
+
+# Factores de modificación de propiedades λ (ASCE 7-16 §17.2.8.4) de la rigidez post-fluencia
+# Kd (módulo de corte del caucho) y de la resistencia característica Qd (fluencia del plomo):
+# envejecimiento y ambiente (ae), ensayos de prototipo (test) y tolerancia de fabricación (spec).
+# Valores típicos de LRB (comentario C17.2.8.4); deben reemplazarse por los del fabricante.
+FACTORES_LAMBDA = {
+    "Kd": {"ae_max": 1.1, "ae_min": 1.0, "test_max": 1.3, "test_min": 0.9, "spec_max": 1.15, "spec_min": 0.85},
+    "Qd": {"ae_max": 1.1, "ae_min": 1.0, "test_max": 1.6, "test_min": 0.9, "spec_max": 1.15, "spec_min": 0.85},
+}
+LIMITES = ("nominal", "superior", "inferior")  # orden del eje de límites
+# Comprobaciones que no cambian con los λ (solo dependen de la geometría y la carga)
+COMPROBACIONES_SIN_LIMITE = ("esfuerzo", "estabilidad")
+
+# Iteración del periodo y amortiguamiento efectivos
+TOLERANCIA_ITERACION = 1e-6  # residuo relativo en el desplazamiento
+MAX_ITERACIONES = 100
+
+# Diámetros comerciales estándar (mm)
+DIAMETROS_ESTANDAR = np.array([100, 150, 200, 250, 300, 350, 400, 450, 500, 550, 600,
+                               650, 700, 750, 800, 850, 900, 950, 1000, 1050, 1100, 1150, 1200],
+                              dtype=float)
+
+
+def redondear_valor_estandar(valor):
+    # Primer diámetro comercial mayor o igual al valor; el último si ninguno alcanza
+    indice = np.searchsorted(DIAMETROS_ESTANDAR, valor, side='left')
+    return DIAMETROS_ESTANDAR[np.minimum(indice, len(DIAMETROS_ESTANDAR) - 1)]
+
+
+@instrumentacion.medir("1. diámetro")
+def calcular_diametro(carga_kN, diametro_aislador):
+    # 1. Diámetro basado en el esfuerzo admisible ASCE 7 (0 = calcular automáticamente)
+    area_requerida = (carga_kN * 1000) / ESFUERZO_ADMISIBLE  # mm²
+    diametro_requerido = redondear_valor_estandar(np.sqrt(4 * area_requerida / np.pi))
+    return np.where(diametro_aislador <= 0, diametro_requerido, diametro_aislador)
+
+
+@instrumentacion.medir("2. espesor de capa")
+def calcular_espesor_capa(diametro_aislador, relacion_forma=RELACION_FORMA):
+    # 2. Espesor de capa de caucho basado en la relación de forma
+    return diametro_aislador / (4 * relacion_forma)  # mm
+
+
+@instrumentacion.medir("3. número de capas")
+def calcular_capas(desplazamiento_max_mm, espesor_capa, altura_caucho):
+    # 3. Número de capas para el desplazamiento máximo; si se indica la altura de caucho
+    # se ajusta a un múltiplo del espesor de capa
+    capas_requeridas = np.ceil(desplazamiento_max_mm / (DEFORMACION_MAX_CAPA * espesor_capa))
+    capas_indicadas = np.ceil(altura_caucho / espesor_capa)
+    num_capas = np.where(altura_caucho <= 0, capas_requeridas, capas_indicadas).astype(np.int64)
+    return num_capas, num_capas * espesor_capa
+
+
+def calcular_area(diametro):
+    # Área en planta del aislador (mm²)
+    return np.pi * (diametro / 2)**2
+
+
+def calcular_relacion_forma(diametro, espesor_capa):
+    # Relación de forma S = D/(4t) de una capa de caucho
+    return diametro / (4 * espesor_capa)
+
+
+@instrumentacion.medir("4. altura total")
+def calcular_altura_total(num_capas, altura_caucho):
+    # 4. Altura total del aislador (caucho + placas de acero)
+    return altura_caucho + (num_capas + 1) * ESPESOR_PLACA_ACERO  # mm
+
+
+@instrumentacion.medir("5. núcleo de plomo")
+def calcular_nucleo(area_total, relacion_nucleo=RELACION_NUCLEO):
+    # 5. Área y diámetro del núcleo de plomo
+    area_nucleo = relacion_nucleo * area_total
+    return area_nucleo, np.sqrt(4 * area_nucleo / np.pi)
+
+
+@instrumentacion.medir("6. fuerza de fluencia")
+def calcular_fuerza_fluencia(area_nucleo, esfuerzo_fluencia_plomo=ESFUERZO_FLUENCIA_PLOMO):
+    # 6. Fuerza de fluencia del núcleo de plomo (Qd)
+    return (esfuerzo_fluencia_plomo * area_nucleo) / 1000  # kN
+
+
+@instrumentacion.medir("7. rigideces")
+def calcular_rigideces(area_total, altura_caucho, modulo_corte=MODULO_CORTE, relacion_forma=RELACION_FORMA):
+    # 7. Rigidez horizontal K_h = G·A/T_r y vertical K_v = E_c·A/T_r con E_c ≈ 6GS²
+    # (MPa·mm²/mm = N/mm = kN/m)
+    rigidez_horizontal_kNm = (modulo_corte * area_total) / altura_caucho
+    E_c = 6 * modulo_corte * relacion_forma**2  # MPa
+    rigidez_vertical_kNm = (E_c * area_total) / altura_caucho
+    return rigidez_horizontal_kNm, rigidez_vertical_kNm
+
+
+@instrumentacion.medir("8. periodo")
+def calcular_periodo(carga_kN, rigidez_horizontal_kNm):
+    # 8. Periodo del sistema aislado según ASCE 7-17.5.3.1
+    return 2 * np.pi * np.sqrt(carga_kN / (GRAVEDAD * rigidez_horizontal_kNm))
+
+
+@instrumentacion.medir("9. desplazamiento total")
+def calcular_desplazamiento_total(SD1, periodo_aislado, BD):
+    # 9. D_TD = (g / 4π²) * S_D1 * T_D / B_D según ASCE 7-17.5.3.2 (mm)
+    return (GRAVEDAD / (4 * np.pi**2)) * SD1 * periodo_aislado / BD * 1000
+
+
+@instrumentacion.medir("10. coeficiente B_D")
+def coeficiente_amortiguamiento(beta_porc):
+    # B_D por interpolación lineal en la Tabla 17.7-1 (constante fuera de 2%-50%)
+    return np.interp(beta_porc, TABLA_AMORTIGUAMIENTO, TABLA_COEFICIENTE_B)
+
+
+def propiedades_efectivas(carga_kN, rigidez_elastica, rigidez_post_fluencia, fuerza_caracteristica, desplazamiento):
+    # Rigidez efectiva, amortiguamiento efectivo (%) y periodo efectivo del modelo bilineal
+    # a un desplazamiento dado (m): K_eff = K2 + Qd/D, β = 4·Qd·(D - Dy) / (2π·K_eff·D²)
+    D = np.maximum(desplazamiento, 1e-12)
+    Dy = fuerza_caracteristica / (rigidez_elastica - rigidez_post_fluencia)
+    fluye = D > Dy
+    rigidez_efectiva = np.where(fluye, rigidez_post_fluencia + fuerza_caracteristica / D, rigidez_elastica)
+    beta = np.where(fluye, 2 * fuerza_caracteristica * (D - Dy) / (np.pi * rigidez_efectiva * D**2), 0.0) * 100
+    periodo = calcular_periodo(carga_kN, rigidez_efectiva)
+    return rigidez_efectiva, beta, periodo
+
+
+def resolver_periodo_lrb(carga_kN, rigidez_horizontal, fuerza_fluencia, SD1, desplazamiento_inicial=None):
+    # 8-10. Periodo, desplazamiento y amortiguamiento efectivos de un LRB (iteración con la
+    # Tabla 17.7-1). El caucho aporta la rigidez post-fluencia y el núcleo de plomo la resistencia Qd.
+    rigidez_elastica = rigidez_horizontal / RELACION_POST_FLUENCIA
+    return resolver_periodo_efectivo(carga_kN, rigidez_elastica, rigidez_horizontal, fuerza_fluencia, SD1,
+                                     desplazamiento_inicial)
+
+
+@instrumentacion.medir("8-10. iteración efectiva")
+def resolver_periodo_efectivo(carga_kN, rigidez_elastica, rigidez_post_fluencia, fuerza_caracteristica, SD1,
+                              desplazamiento_inicial=None, tolerancia=TOLERANCIA_ITERACION,
+                              max_iteraciones=MAX_ITERACIONES):
+    # Iteración de punto fijo D → (K_eff, β_eff, B_D, T_eff) → D = g·SD1·T_eff/(4π²·B_D)
+    # para todos los aisladores a la vez. Solo se actualizan los que aún no convergen.
+    # Si la corrección de un aislador cambia de signo, su paso se reduce a la mitad
+    # (relajación), lo que evita que oscile alrededor de la solución.
+    # desplazamiento_inicial (mm) permite arrancar desde un resultado previo; por defecto
+    # se parte del periodo con la rigidez post-fluencia y B_D = 1.
+    # Pasando SM1 en lugar de SD1 se obtiene D_M.
+    carga_kN, K1, K2, Qd, SD1 = (np.asarray(v, dtype=float) for v in np.broadcast_arrays(
+        carga_kN, rigidez_elastica, rigidez_post_fluencia, fuerza_caracteristica, SD1))
+    forma = carga_kN.shape
+    carga_kN, K1, K2, Qd, SD1 = (v.ravel() for v in (carga_kN, K1, K2, Qd, SD1))
+
+    if desplazamiento_inicial is None:
+        D = calcular_desplazamiento_total(SD1, calcular_periodo(carga_kN, K2), 1.0) / 1000
+    else:
+        D = np.broadcast_to(np.asarray(desplazamiento_inicial, dtype=float), forma).ravel() / 1000
+    D = np.array(D, dtype=float)
+    residuo = np.full(D.shape, np.inf)
+    iteraciones = np.zeros(D.shape, dtype=np.int64)
+    relajacion = np.ones(D.shape)
+    correccion_previa = np.zeros(D.shape)
+
+    activos = np.flatnonzero(np.isfinite(D))
+    for _ in range(max_iteraciones):
+        if activos.size == 0:
+            break
+        _, beta, periodo = propiedades_efectivas(carga_kN[activos], K1[activos], K2[activos], Qd[activos],
+                                                 D[activos])
+        D_nuevo = calcular_desplazamiento_total(SD1[activos], periodo, coeficiente_amortiguamiento(beta)) / 1000
+        correccion = D_nuevo - D[activos]
+        residuo[activos] = np.abs(correccion) / np.maximum(D_nuevo, 1e-12)
+        relajacion[activos] *= np.where(correccion * correccion_previa[activos] < 0, 0.5, 1.0)
+        correccion_previa[activos] = correccion
+        D[activos] += relajacion[activos] * correccion
+        iteraciones[activos] += 1
+        activos = activos[residuo[activos] > tolerancia]
+
+    rigidez_efectiva, beta, periodo = propiedades_efectivas(carga_kN, K1, K2, Qd, D)
+    return {
+        "desplazamiento": (D * 1000).reshape(forma),  # mm
+        "periodo": periodo.reshape(forma),
+        "amortiguamiento": beta.reshape(forma),  # %
+        "BD": coeficiente_amortiguamiento(beta).reshape(forma),
+        "rigidez_efectiva": rigidez_efectiva.reshape(forma),
+        "iteraciones": iteraciones.reshape(forma),
+        "residuo": residuo.reshape(forma),
+        "convergido": (residuo <= tolerancia).reshape(forma),
+    }
+
+
+@instrumentacion.medir("diseño")
+def disenar_aisladores(carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL,
+                       diametro_aislador=0.0, altura_caucho=0.0, desplazamiento_inicial=None):
+    # Cadena completa de dimensionamiento (pasos 1-10) para todos los aisladores a la vez.
+    # Las entradas se difunden entre sí (broadcasting), por lo que los parámetros sísmicos
+    # pueden ser escalares comunes a todo el edificio o un arreglo por aislador.
+    (carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL,
+     diametro_aislador, altura_caucho) = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL,
+                                                diametro_aislador, altura_caucho)))
+
+    carga_kN = carga_ton * GRAVEDAD
+
+    diametro = calcular_diametro(carga_kN, diametro_aislador)
+    espesor_capa = calcular_espesor_capa(diametro)
+    num_capas, _ = calcular_capas(desplazamiento_max_mm, espesor_capa, altura_caucho)
+
+    diseno = evaluar_geometria(carga_kN, desplazamiento_max_mm, SD1, diametro, espesor_capa, num_capas,
+                               desplazamiento_inicial=desplazamiento_inicial)
+    diseno.update({"S1": S1, "SDS": SDS, "SD1": SD1, "TL": TL})
+    return diseno
+
+
+@instrumentacion.medir("evaluar geometría")
+def evaluar_geometria(carga_kN, desplazamiento_max_mm, SD1, diametro, espesor_capa, num_capas,
+                      relacion_nucleo=RELACION_NUCLEO, desplazamiento_inicial=None,
+                      factor_rigidez=1.0, factor_resistencia=1.0):
+    # Pasos 4-10 para una geometría ya definida (diámetro, espesor y número de capas,
+    # fracción de núcleo de plomo). La relación de forma se deduce de la geometría.
+    # factor_rigidez y factor_resistencia (λ de Kd y Qd) multiplican el módulo de corte y
+    # la fluencia del plomo; se difunden con la geometría (ver analizar_limites).
+    area_total = calcular_area(diametro)
+    relacion_forma = calcular_relacion_forma(diametro, espesor_capa)
+    altura_caucho = num_capas * espesor_capa
+    altura_total = calcular_altura_total(num_capas, altura_caucho)
+    area_nucleo, diametro_nucleo = calcular_nucleo(area_total, relacion_nucleo)
+    fuerza_fluencia = calcular_fuerza_fluencia(area_nucleo, ESFUERZO_FLUENCIA_PLOMO * factor_resistencia)
+    rigidez_horizontal, rigidez_vertical = calcular_rigideces(area_total, altura_caucho,
+                                                              MODULO_CORTE * factor_rigidez, relacion_forma)
+    efectivo = resolver_periodo_lrb(carga_kN, rigidez_horizontal, fuerza_fluencia, SD1, desplazamiento_inicial)
+
+    return {
+        "carga_kN": carga_kN,
+        "desplazamiento_max_mm": desplazamiento_max_mm,
+        "diametro": diametro,
+        "area_total": area_total,
+        "espesor_capa": espesor_capa,
+        "num_capas": num_capas,
+        "altura_caucho": altura_caucho,
+        "altura_total": altura_total,
+        "relacion_nucleo": np.broadcast_to(relacion_nucleo, np.shape(area_total)),
+        "diametro_nucleo": diametro_nucleo,
+        "fuerza_fluencia": fuerza_fluencia,
+        "rigidez_horizontal": rigidez_horizontal,
+        "rigidez_vertical": rigidez_vertical,
+        "rigidez_efectiva": efectivo["rigidez_efectiva"],
+        "periodo_aislado": efectivo["periodo"],
+        "desplazamiento_total": efectivo["desplazamiento"],
+        "coef_amortiguamiento": efectivo["amortiguamiento"],
+        "BD": efectivo["BD"],
+        "iteraciones": efectivo["iteraciones"],
+        "residuo": efectivo["residuo"],
+    }
+
+
+def factores_limite(factores=FACTORES_LAMBDA):
+    # λ de Kd y de Qd para (nominal, superior, inferior), ASCE 7-16 ec. 17.2-1 y 17.2-2:
+    # λmax = (1 + 0.75·(λae,max − 1))·λtest,max·λspec,max
+    # λmin = (1 − 0.75·(1 − λae,min))·λtest,min·λspec,min
+    lambdas = {}
+    for propiedad, f in factores.items():
+        maximo = (1 + 0.75 * (f["ae_max"] - 1)) * f["test_max"] * f["spec_max"]
+        minimo = (1 - 0.75 * (1 - f["ae_min"])) * f["test_min"] * f["spec_min"]
+        lambdas[propiedad] = np.array([1.0, maximo, minimo])
+    return lambdas
+
+
+@instrumentacion.medir("límites de propiedades")
+def analizar_limites(diseno, factores=FACTORES_LAMBDA):
+    # Pasos 6-10 con propiedades nominales, de límite superior y de límite inferior en una
+    # sola pasada: los λ ocupan un eje nuevo al frente (forma (3,) + forma del diseño) sobre
+    # el que se difunde la geometría del diseño nominal. La iteración efectiva arranca del
+    # desplazamiento nominal.
+    lambdas = factores_limite(factores)
+    forma = (len(LIMITES),) + (1,) * np.ndim(diseno["diametro"])
+    return evaluar_geometria(diseno["carga_kN"], diseno["desplazamiento_max_mm"], diseno["SD1"],
+                             diseno["diametro"], diseno["espesor_capa"], diseno["num_capas"],
+                             diseno["relacion_nucleo"], diseno["desplazamiento_total"],
+                             factor_rigidez=lambdas["Kd"].reshape(forma),
+                             factor_resistencia=lambdas["Qd"].reshape(forma))
+
+
+@instrumentacion.medir("verificación")
+def verificar_aisladores(diseno):
+    # Verificaciones ASCE 7 sobre el resultado de disenar_aisladores (vectorizado)
+    area_total = calcular_area(diseno["diametro"])
+    esfuerzo_actual = (diseno["carga_kN"] * 1000) / area_total  # MPa
+    deformacion_por_capa = diseno["desplazamiento_max_mm"] / (diseno["num_capas"] * diseno["espesor_capa"])
+    relacion_altura_diametro = diseno["altura_total"] / diseno["diametro"]
+
+    cumple_esfuerzo = esfuerzo_actual <= ESFUERZO_ADMISIBLE
+    cumple_deformacion = deformacion_por_capa <= DEFORMACION_MAX_CAPA
+    cumple_estabilidad = relacion_altura_diametro <= RELACION_ESTABILIDAD
+    # Para aisladores circulares, generalmente no hay problema de volteo
+    cumple_volteo = np.ones_like(cumple_esfuerzo)
+    cumple_amortiguamiento = diseno["coef_amortiguamiento"] >= AMORTIGUAMIENTO_MIN
+
+    return {
+        "area_total": area_total,
+        "esfuerzo_actual": esfuerzo_actual,
+        "deformacion_por_capa": deformacion_por_capa,
+        "relacion_altura_diametro": relacion_altura_diametro,
+        "cumple_esfuerzo": cumple_esfuerzo,
+        "cumple_deformacion": cumple_deformacion,
+        "cumple_estabilidad": cumple_estabilidad,
+        "cumple_volteo": cumple_volteo,
+        "cumple_amortiguamiento": cumple_amortiguamiento,
+        "cumple_general": (cumple_esfuerzo & cumple_deformacion & cumple_estabilidad
+                           & cumple_volteo & cumple_amortiguamiento),
+    }
+
+
+@instrumentacion.medir("verificación por límites")
+def verificar_limites(limites):
+    # Verificaciones ASCE 7 sobre el resultado de analizar_limites. Cada comprobación cumple
+    # si cumple con los tres juegos de propiedades. La deformación por capa se evalúa con el
+    # D_TD de cada límite (el inferior, más flexible, suele gobernar); limite_deformacion y
+    # limite_amortiguamiento son el índice en LIMITES del que gobierna (mayor
+    # demanda/capacidad; ante empate, el nominal). El esfuerzo de compresión y la
+    # estabilidad solo dependen de la geometría, no de los λ, así que no tienen límite que
+    # gobierne (ver COMPROBACIONES_SIN_LIMITE).
+    # También se informan las demandas extremas: D_TD máximo, cortante máximo (K_eff·D_TD)
+    # y amortiguamiento mínimo, con el límite que las produce.
+    verificacion = verificar_aisladores(dict(limites, desplazamiento_max_mm=limites["desplazamiento_total"]))
+    forma = np.shape(limites["coef_amortiguamiento"])
+    utilizaciones = {
+        "deformacion": verificacion["deformacion_por_capa"] / DEFORMACION_MAX_CAPA,
+        "amortiguamiento": AMORTIGUAMIENTO_MIN / np.maximum(limites["coef_amortiguamiento"], 1e-12),
+    }
+    resultado = {}
+    for nombre, utilizacion in utilizaciones.items():
+        resultado["limite_" + nombre] = np.broadcast_to(utilizacion, forma).argmax(axis=0)
+    for nombre in tuple(utilizaciones) + COMPROBACIONES_SIN_LIMITE + ("volteo",):
+        resultado["cumple_" + nombre] = np.broadcast_to(verificacion["cumple_" + nombre], forma).all(axis=0)
+    resultado["cumple_general"] = np.broadcast_to(verificacion["cumple_general"], forma).all(axis=0)
+
+    desplazamiento = limites["desplazamiento_total"]
+    cortante = limites["rigidez_efectiva"] * desplazamiento / 1000  # kN
+    resultado["limite_desplazamiento"] = desplazamiento.argmax(axis=0)
+    resultado["desplazamiento_maximo"] = desplazamiento.max(axis=0)
+    resultado["limite_cortante"] = cortante.argmax(axis=0)
+    resultado["cortante_maximo"] = cortante.max(axis=0)
+    resultado["amortiguamiento_minimo"] = limites["coef_amortiguamiento"].min(axis=0)
+    return resultado
+
+
+def parametros_bilineales(diseno):
+    # Modelo bilineal del aislador para histéresis e historia de respuesta:
+    # masa (t), rigidez elástica y post-fluencia (kN/m) y fuerza de fluencia (kN).
+    # La rigidez post-fluencia es la del caucho (K_h) y Qd la resistencia del plomo.
+    masa = diseno["carga_kN"] / GRAVEDAD
+    rigidez_post_fluencia = diseno["rigidez_horizontal"]
+    rigidez_elastica = rigidez_post_fluencia / RELACION_POST_FLUENCIA
+    fuerza_fluencia = diseno["fuerza_fluencia"] / (1 - RELACION_POST_FLUENCIA)
+    return masa, rigidez_elastica, rigidez_post_fluencia, fuerza_fluencia
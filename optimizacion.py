@@ -0,0 +1,120 @@
+import numpy as np
+
+import motor_diseno
+
+# Búsqueda del aislador óptimo en el catálogo de diámetros estándar.
+# En lugar de tomar el primer diámetro que cumple el esfuerzo admisible (redondear_valor_estandar),
+# se enumeran todas las combinaciones diámetro × espesor de capa × número de capas × fracción de
+# núcleo de plomo y se elige, para cada aislador, la más económica que cumple todas las
+# verificaciones ASCE 7. El costo es el volumen del aislador (área × altura total).
+
+# Catálogos de fabricación
+ESPESORES_CAPA = np.array([5.0, 6.0, 8.0, 10.0, 12.0, 15.0, 20.0, 25.0])  # mm
+RELACIONES_NUCLEO = np.array([0.15, 0.20, 0.25])  # fracción del área total
+NUM_CAPAS_MAX = 100  # límite de fabricación
+
+TAMANO_BLOQUE = 4096
+
+
+def candidatos_catalogo(diametros=motor_diseno.DIAMETROS_ESTANDAR, espesores=ESPESORES_CAPA,
+                        relaciones_nucleo=RELACIONES_NUCLEO):
+    # Combinaciones (diámetro, espesor, núcleo) del catálogo. Se descartan las de relación de
+    # forma menor a la nominal, para no reducir la rigidez vertical supuesta en el diseño.
+    # Cada diámetro incluye también su espesor nominal D/(4S), de modo que el diseño de
+    # primer ajuste siempre forma parte de la búsqueda.
+    d, t, r = np.meshgrid(diametros, espesores, relaciones_nucleo, indexing='ij')
+    d, t, r = d.ravel(), t.ravel(), r.ravel()
+    validos = d / (4 * t) >= motor_diseno.RELACION_FORMA
+    dn, rn = (v.ravel() for v in np.meshgrid(diametros, relaciones_nucleo, indexing='ij'))
+    tn = motor_diseno.calcular_espesor_capa(dn)
+    return np.concatenate([d[validos], dn]), np.concatenate([t[validos], tn]), np.concatenate([r[validos], rn])
+
+
+def _optimizar_bloque(carga_kN, desplazamiento_max_mm, SD1, candidatos, num_capas_max):
+    cd, ct, cr = candidatos
+    n_aisladores = carga_kN.size
+
+    # Poda 1: esfuerzo de compresión (solo depende del diámetro)
+    area = np.pi * (cd / 2)**2
+    cumple_esfuerzo = (carga_kN[:, None] * 1000) / area[None, :] <= motor_diseno.ESFUERZO_ADMISIBLE
+
+    # Poda 2: rango de capas. Menos de n_min no cumple la deformación por cortante y más de
+    # n_max no cumple la estabilidad global, por lo que solo se enumera [n_min, n_max].
+    n_min = np.ceil(desplazamiento_max_mm[:, None] / (motor_diseno.DEFORMACION_MAX_CAPA * ct[None, :]))
+    n_max = np.floor((motor_diseno.RELACION_ESTABILIDAD * cd - motor_diseno.ESPESOR_PLACA_ACERO)
+                     / (ct + motor_diseno.ESPESOR_PLACA_ACERO))
+    n_max = np.minimum(n_max, num_capas_max)
+    factible = cumple_esfuerzo & (n_min <= n_max[None, :]) & (n_min >= 1)
+
+    aislador, candidato = np.nonzero(factible)
+    num_capas = n_min[aislador, candidato].astype(np.int64)
+    limite = n_max[candidato]
+    area_par, espesor_par = area[candidato], ct[candidato]
+
+    def _costo(pares, n):
+        # Volumen del aislador; desempate: la fracción de núcleo más cercana a la nominal
+        volumen = area_par[pares] * (n * espesor_par[pares] + (n + 1) * motor_diseno.ESPESOR_PLACA_ACERO)
+        return volumen * (1 + 1e-6 * np.abs(cr[candidato[pares]] - motor_diseno.RELACION_NUCLEO))
+
+    # Para cada par (aislador, candidato) el volumen crece con el número de capas, así que el
+    # primer número de capas que cumple todas las verificaciones es el óptimo del par.
+    # Se avanza una capa a la vez solo sobre los pares aún no resueltos, y se descartan
+    # (ramificación y acotamiento) los pares cuyo costo ya supera la mejor solución del aislador.
+    # El desplazamiento de cada par se usa como arranque de la iteración de la capa siguiente.
+    mejor_capas = np.zeros(aislador.size, dtype=np.int64)
+    mejor_costo = np.full(n_aisladores, np.inf)
+    desplazamiento = np.full(aislador.size, np.nan)
+    pendientes = np.arange(aislador.size)
+    while pendientes.size:
+        a, c, n = aislador[pendientes], candidato[pendientes], num_capas[pendientes]
+        inicial = desplazamiento[pendientes]
+        diseno = motor_diseno.evaluar_geometria(carga_kN[a], desplazamiento_max_mm[a], SD1[a],
+                                                cd[c], ct[c], n, cr[c],
+                                                desplazamiento_inicial=None if np.isnan(inicial).any() else inicial)
+        desplazamiento[pendientes] = diseno["desplazamiento_total"]
+        cumple = motor_diseno.verificar_aisladores(diseno)["cumple_general"]
+        mejor_capas[pendientes[cumple]] = n[cumple]
+        np.minimum.at(mejor_costo, a[cumple], _costo(pendientes[cumple], n[cumple]))
+        num_capas[pendientes] += 1
+        siguen = ~cumple & (num_capas[pendientes] <= limite[pendientes])
+        pendientes = pendientes[siguen]
+        pendientes = pendientes[_costo(pendientes, num_capas[pendientes]) < mejor_costo[aislador[pendientes]]]
+
+    resueltos = np.flatnonzero(mejor_capas)
+    costo = _costo(resueltos, mejor_capas[resueltos])
+    aislador, candidato, n = aislador[resueltos], candidato[resueltos], mejor_capas[resueltos]
+
+    orden = np.lexsort((costo, aislador))
+    primeros = orden[np.unique(aislador[orden], return_index=True)[1]]
+
+    eleccion_candidato = np.full(n_aisladores, -1)
+    eleccion_capas = np.ones(n_aisladores, dtype=np.int64)
+    eleccion_candidato[aislador[primeros]] = candidato[primeros]
+    eleccion_capas[aislador[primeros]] = n[primeros]
+    return eleccion_candidato, eleccion_capas
+
+
+def optimizar_aisladores(carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL,
+                         diametros=motor_diseno.DIAMETROS_ESTANDAR, espesores=ESPESORES_CAPA,
+                         relaciones_nucleo=RELACIONES_NUCLEO, num_capas_max=NUM_CAPAS_MAX,
+                         tamano_bloque=TAMANO_BLOQUE):
+    # Devuelve el mismo diccionario que motor_diseno.disenar_aisladores, más "factible"
+    # (False donde ninguna combinación del catálogo cumple; esos valores quedan en NaN).
+    carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL = (
+        np.ravel(v) for v in np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL))))
+    carga_kN = carga_ton * motor_diseno.GRAVEDAD
+    candidatos = candidatos_catalogo(diametros, espesores, relaciones_nucleo)
+
+    eleccion = np.empty(carga_kN.size, dtype=np.int64)
+    num_capas = np.empty(carga_kN.size, dtype=np.int64)
+    for inicio in range(0, carga_kN.size, tamano_bloque):
+        b = slice(inicio, inicio + tamano_bloque)
+        eleccion[b], num_capas[b] = _optimizar_bloque(carga_kN[b], desplazamiento_max_mm[b], SD1[b],
+                                                      candidatos, num_capas_max)
+
+    factible = eleccion >= 0
+    cd, ct, cr = (np.where(factible, c[np.maximum(eleccion, 0)], np.nan) for c in candidatos)
+    diseno = motor_diseno.evaluar_geometria(carga_kN, desplazamiento_max_mm, SD1, cd, ct, num_capas, cr)
+    diseno.update({"S1": S1, "SDS": SDS, "SD1": SD1, "TL": TL, "factible": factible})
+    return diseno
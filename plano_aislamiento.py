@@ -0,0 +1,158 @@
+import numpy as np
+
+import instrumentacion
+import motor_diseno
+
+# Análisis del plano de aislamiento completo como diafragma rígido de 3 grados de libertad
+# (u_x, u_y, θ) con torsión, según ASCE 7-16 §17.5.3.3.
+# Todos los aisladores se desplazan D_M en traslación, de modo que el sistema se resuelve
+# con la misma iteración de periodo efectivo del motor aplicada a las sumas de K1, K2 y Qd
+# del plano. Con la rigidez efectiva de cada aislador a ese desplazamiento se arma la
+# matriz de rigidez del diafragma, el centro de rigidez, la excentricidad (real + 5%
+# accidental) y D_TM = D_M·[1 + y·12e / (P_T²·(b² + d²))] en cada aislador (ec. 17.5-3).
+# La rigidez solo depende del tipo de aislador, así que la posición de los aisladores se
+# resume una vez en momentos geométricos por tipo (n, Σx, Σy, Σx², Σy²): cambiar las
+# propiedades de un tipo o el tipo de un aislador cuesta O(tipos), más una pasada
+# vectorizada para los D_TM por aislador.
+
+EXCENTRICIDAD_ACCIDENTAL = 0.05  # fracción de la dimensión en planta perpendicular al sismo
+RELACION_TORSION_MINIMA = 1.15  # D_TM ≥ 1.15·D_M
+PROPIEDADES_TIPO = ("rigidez_elastica", "rigidez_post_fluencia", "fuerza_caracteristica")
+
+
+class PlanoAislamiento:
+    def __init__(self, x, y, tipos, carga_kN, propiedades, SM1, dimensiones=None,
+                 excentricidad_accidental=EXCENTRICIDAD_ACCIDENTAL):
+        # x, y: coordenadas en planta de cada aislador (m); tipos: índice de tipo de cada
+        # aislador; carga_kN: carga sísmica tributaria de cada aislador (define masa y centro
+        # de masa); propiedades: arreglos por tipo con PROPIEDADES_TIPO (kN/m, kN/m, kN);
+        # dimensiones: (b, d) del plano en m, por defecto el rectángulo que contiene a los
+        # aisladores
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.tipos = np.asarray(tipos, dtype=np.int64).copy()
+        self.carga_kN = np.broadcast_to(np.asarray(carga_kN, dtype=float), self.x.shape)
+        if self.x.ndim != 1 or self.y.shape != self.x.shape or self.tipos.shape != self.x.shape:
+            raise ValueError("x, y y tipos deben ser arreglos 1-D del mismo largo")
+        faltantes = [p for p in PROPIEDADES_TIPO if p not in propiedades]
+        if faltantes:
+            raise ValueError(f"Faltan propiedades de tipo: {', '.join(faltantes)}")
+        self.propiedades = {p: np.array(propiedades[p], dtype=float) for p in PROPIEDADES_TIPO}
+        self.n_tipos = self.propiedades["rigidez_elastica"].size
+        if self.tipos.size and (self.tipos.min() < 0 or self.tipos.max() >= self.n_tipos):
+            raise ValueError(f"Tipo de aislador fuera de rango (0 a {self.n_tipos - 1})")
+        self.SM1 = float(SM1)
+        self.excentricidad_accidental = excentricidad_accidental
+
+        # Coordenadas relativas al centro de masa: sumas bien condicionadas aunque el
+        # edificio esté lejos del origen
+        self.peso = self.carga_kN.sum()
+        self.centro_masa = (float(np.dot(self.carga_kN, self.x) / self.peso),
+                            float(np.dot(self.carga_kN, self.y) / self.peso))
+        self._dx = self.x - self.centro_masa[0]
+        self._dy = self.y - self.centro_masa[1]
+        if dimensiones is None:
+            dimensiones = (np.ptp(self.x), np.ptp(self.y))
+        self.dimensiones = tuple(float(v) for v in dimensiones)
+
+        self._momentos = np.stack([np.bincount(self.tipos, pesos, minlength=self.n_tipos)
+                                   for pesos in (None, self._dx, self._dy, self._dx**2, self._dy**2)])
+        self._resultados = None
+
+    @classmethod
+    def desde_resultado(cls, x, y, tipos, carga_kN, resultado_tipos, SM1, **opciones):
+        # Propiedades de cada tipo desde un ResultadoDiseno por lotes (un elemento por tipo),
+        # con el modelo bilineal de motor_diseno.parametros_bilineales
+        _, K1, K2, Fy = resultado_tipos.parametros_bilineales()
+        propiedades = {"rigidez_elastica": np.ravel(K1), "rigidez_post_fluencia": np.ravel(K2),
+                       "fuerza_caracteristica": np.ravel(resultado_tipos.fuerza_fluencia)}
+        return cls(x, y, tipos, carga_kN, propiedades, SM1, **opciones)
+
+    def cambiar_tipo(self, tipo, **propiedades):
+        # Nuevas propiedades de un tipo (p. ej. rigidez_post_fluencia=...); O(tipos)
+        desconocidas = [p for p in propiedades if p not in PROPIEDADES_TIPO]
+        if desconocidas:
+            raise ValueError(f"Propiedades desconocidas: {', '.join(desconocidas)}")
+        for nombre, valor in propiedades.items():
+            self.propiedades[nombre][tipo] = valor
+        self._resultados = None
+
+    def asignar_tipo(self, indices, tipo):
+        # Cambia el tipo de uno o varios aisladores, actualizando los momentos por tipo.
+        # Los índices repetidos y los aisladores que ya son de ese tipo no aportan nada.
+        if not 0 <= tipo < self.n_tipos:
+            raise ValueError(f"Tipo de aislador fuera de rango (0 a {self.n_tipos - 1})")
+        indices = np.asarray(indices, dtype=np.int64)
+        if np.any((indices < -self.tipos.size) | (indices >= self.tipos.size)):
+            raise ValueError(f"Índice de aislador fuera de rango (hay {self.tipos.size})")
+        indices = np.unique(indices % self.tipos.size)  # índices negativos como en NumPy
+        indices = indices[self.tipos[indices] != tipo]
+        if indices.size == 0:
+            return
+        aportes = np.stack([np.ones(indices.size), self._dx[indices], self._dy[indices],
+                            self._dx[indices]**2, self._dy[indices]**2])
+        for k in range(aportes.shape[0]):
+            np.subtract.at(self._momentos[k], self.tipos[indices], aportes[k])
+        self._momentos[:, tipo] += aportes.sum(axis=1)
+        self.tipos[indices] = tipo
+        self._resultados = None
+
+    def resultados(self):
+        # Resultados vigentes (se recalculan solo después de un cambio)
+        if self._resultados is None:
+            self._resultados = self._calcular()
+        return self._resultados
+
+    @instrumentacion.medir("plano de aislamiento")
+    def _calcular(self):
+        n, sx, sy, sxx, syy = self._momentos
+        K1, K2, Qd = (self.propiedades[p] for p in PROPIEDADES_TIPO)
+
+        # Traslación: el plano completo como un aislador bilineal equivalente (D_M, T_M, β_M)
+        sistema = motor_diseno.resolver_periodo_efectivo(self.peso, np.dot(n, K1), np.dot(n, K2),
+                                                         np.dot(n, Qd), self.SM1)
+        D_M = float(sistema["desplazamiento"])  # mm
+
+        # Rigidez efectiva de cada tipo a D_M y matriz del diafragma respecto del centro de masa
+        k, _, _ = motor_diseno.propiedades_efectivas(1.0, K1, K2, Qd, D_M / 1000)
+        K = np.dot(k, n)
+        Kx_y, Ky_x = np.dot(k, sy), np.dot(k, sx)  # Σk·y, Σk·x
+        K_theta = np.dot(k, sxx + syy)
+        matriz = np.array([[K, 0.0, -Kx_y],
+                           [0.0, K, Ky_x],
+                           [-Kx_y, Ky_x, K_theta]])
+
+        # Centro de rigidez y excentricidad real (centro de masa − centro de rigidez)
+        xr, yr = float(Ky_x / K), float(Kx_y / K)
+        centro_rigidez = (self.centro_masa[0] + xr, self.centro_masa[1] + yr)
+        excentricidad = (-xr, -yr)
+
+        # P_T = T_traslación / T_torsión (ec. 17.5-4 ponderada por rigidez), no menor que 1
+        b, d = self.dimensiones
+        radio_giro2 = (b**2 + d**2) / 12
+        P_T = max(np.sqrt(K_theta / K / radio_giro2), 1.0) if radio_giro2 > 0 else 1.0
+
+        # D_TM por aislador: sismo en X (brazo en y, e_y) y en Y (brazo en x, e_x)
+        factor = 12 / (P_T**2 * max(b**2 + d**2, 1e-12))
+        e_y = abs(excentricidad[1]) + self.excentricidad_accidental * d
+        e_x = abs(excentricidad[0]) + self.excentricidad_accidental * b
+        D_TM_x = D_M * (1 + np.abs(self._dy - yr) * factor * e_y)
+        D_TM_y = D_M * (1 + np.abs(self._dx - xr) * factor * e_x)
+        D_TM = np.maximum(np.maximum(D_TM_x, D_TM_y), RELACION_TORSION_MINIMA * D_M)
+
+        return {
+            "desplazamiento_M": D_M,
+            "periodo_M": float(sistema["periodo"]),
+            "amortiguamiento_M": float(sistema["amortiguamiento"]),
+            "BM": float(sistema["BD"]),
+            "rigidez_efectiva_tipos": k,
+            "rigidez_efectiva_total": K,
+            "matriz_rigidez": matriz,
+            "centro_masa": self.centro_masa,
+            "centro_rigidez": centro_rigidez,
+            "excentricidad": excentricidad,
+            "P_T": P_T,
+            "D_TM_x": D_TM_x,
+            "D_TM_y": D_TM_y,
+            "D_TM": D_TM,
+        }
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from array import array
+
+import numpy as np
+
+# Lectura de registros de aceleración (PEER NGA .AT2 y texto plano) con caché binaria.
+# Cada registro se interpreta una sola vez, línea por línea, y se guarda como arreglo
+# binario crudo en el directorio de caché. Las lecturas posteriores lo abren con np.memmap
+# (sin copia), de modo que muchos procesos pueden compartir una suite de cientos de
+# registros. Los metadatos (dt, npts, PGA, ruta de origen) se guardan en un índice JSON y
+# se consultan sin tocar las muestras.
+
+DIRECTORIO_CACHE = os.environ.get(
+    "AISLADOR_CACHE_REGISTROS", os.path.join(os.path.expanduser("~"), ".aislador_sismico", "registros")
+)
+ARCHIVO_INDICE = "indice.json"
+TAMANO_BUFFER = 65536
+
+_PATRON_NUMERO = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_PATRON_NPTS_DT = re.compile(rf"NPTS\s*=\s*(\d+)\s*,?\s*DT\s*=\s*({_PATRON_NUMERO})", re.IGNORECASE)
+_PATRON_NPTS_DT_ANTIGUO = re.compile(rf"^\s*(\d+)\s+({_PATRON_NUMERO})\s+NPTS", re.IGNORECASE)
+
+
+def hash_archivo(ruta):
+    h = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def leer_encabezado_at2(ruta):
+    # Devuelve (npts, dt) de las 4 líneas de encabezado de un archivo PEER .AT2
+    with open(ruta, encoding="utf-8", errors="replace") as f:
+        encabezado = [f.readline() for _ in range(4)]
+    for patron in (_PATRON_NPTS_DT, _PATRON_NPTS_DT_ANTIGUO):
+        coincidencia = patron.search(encabezado[3])
+        if coincidencia:
+            return int(coincidencia.group(1)), float(coincidencia.group(2))
+    raise ValueError(f"Encabezado AT2 no reconocido en {ruta}: {encabezado[3].strip()!r}")
+
+
+def es_at2(ruta):
+    return os.path.splitext(ruta)[1].lower() == ".at2"
+
+
+def _valores_linea(linea):
+    # Valores de una línea de texto sin comentarios (#); las comas cuentan como separador
+    return linea.split("#", 1)[0].replace(",", " ").split()
+
+
+def tiene_columna_tiempo(ruta):
+    # Un archivo de texto plano es de dos columnas (tiempo, aceleración) si su primera
+    # línea de datos tiene exactamente dos valores. Se decide una vez por archivo: un
+    # registro de varias columnas cuya última línea queda con dos valores no lo es.
+    if es_at2(ruta):
+        return False
+    with open(ruta, encoding="utf-8", errors="replace") as f:
+        for linea in f:
+            valores = _valores_linea(linea)
+            if valores:
+                return len(valores) == 2
+    return False
+
+
+def iterar_valores(ruta, columna_tiempo=None):
+    # Generador de bloques de muestras (array('d')) leídos línea por línea.
+    # En texto plano se ignoran líneas vacías y comentarios (#); con columna_tiempo
+    # (por defecto, tiene_columna_tiempo) cada línea es (tiempo, aceleración) y se toma
+    # la segunda.
+    if columna_tiempo is None:
+        columna_tiempo = tiene_columna_tiempo(ruta)
+    with open(ruta, encoding="utf-8", errors="replace") as f:
+        if es_at2(ruta):
+            for _ in range(4):
+                f.readline()
+        bloque = array("d")
+        for numero, linea in enumerate(f, 1):
+            valores = _valores_linea(linea)
+            if not valores:
+                continue
+            if columna_tiempo:
+                if len(valores) != 2:
+                    raise ValueError(f"{ruta}, línea {numero}: se esperaban dos columnas (tiempo, aceleración)")
+                valores = valores[1:]
+            bloque.extend(float(v) for v in valores)
+            if len(bloque) >= TAMANO_BUFFER:
+                yield bloque
+                bloque = array("d")
+        if bloque:
+            yield bloque
+
+
+def dt_texto_plano(ruta):
+    # dt de un archivo de texto de dos columnas (tiempo, aceleración), o None
+    with open(ruta, encoding="utf-8", errors="replace") as f:
+        tiempos = []
+        for linea in f:
+            valores = _valores_linea(linea)
+            if valores:
+                if len(valores) != 2:
+                    return None
+                tiempos.append(float(valores[0]))
+                if len(tiempos) == 2:
+                    return tiempos[1] - tiempos[0]
+    return None
+
+
+class CacheRegistros:
+    def __init__(self, directorio=DIRECTORIO_CACHE, dtype=np.float64):
+        self.directorio = directorio
+        self.dtype = np.dtype(dtype)
+        os.makedirs(directorio, exist_ok=True)
+        self._indice = None
+
+    # --- índice de metadatos ---
+
+    @property
+    def ruta_indice(self):
+        return os.path.join(self.directorio, ARCHIVO_INDICE)
+
+    def indice(self):
+        if self._indice is None:
+            try:
+                with open(self.ruta_indice, encoding="utf-8") as f:
+                    self._indice = json.load(f)
+            except FileNotFoundError:
+                self._indice = {"registros": {}, "archivos": {}}
+        return self._indice
+
+    def _guardar_indice(self):
+        # Se combina con el índice en disco (otros procesos pueden haber agregado registros)
+        # y se escribe de forma atómica para que nunca se lea un índice a medias
+        try:
+            with open(self.ruta_indice, encoding="utf-8") as f:
+                en_disco = json.load(f)
+            for seccion in ("registros", "archivos"):
+                en_disco[seccion].update(self._indice[seccion])
+            self._indice = en_disco
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".json")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump(self._indice, f, indent=1, ensure_ascii=False)
+        os.replace(temporal, self.ruta_indice)
+
+    @staticmethod
+    def _firma(ruta):
+        estado = os.stat(ruta)
+        return f"{os.path.abspath(ruta)}|{estado.st_size}|{estado.st_mtime_ns}"
+
+    def _hash(self, ruta):
+        # El hash se recuerda por (ruta, tamaño, fecha de modificación) para no releer el archivo
+        firma = self._firma(ruta)
+        archivos = self.indice()["archivos"]
+        if firma not in archivos:
+            archivos[firma] = hash_archivo(ruta)
+            self._guardar_indice()
+        return self.indice()["archivos"][firma]
+
+    @staticmethod
+    def _dt(ruta, dt):
+        if es_at2(ruta):
+            dt = leer_encabezado_at2(ruta)[1] if dt is None else dt
+        elif dt is None:
+            dt = dt_texto_plano(ruta)
+            if dt is None:
+                raise ValueError(f"Debe indicar dt para el registro de texto {ruta}")
+        return float(dt)
+
+    def _clave(self, hash_registro, dt):
+        return f"{hash_registro[:20]}_{dt:g}_{self.dtype.name}"
+
+    def clave(self, ruta, dt=None):
+        dt = self._dt(ruta, dt)
+        return self._clave(self._hash(ruta), dt), dt
+
+    def metadatos(self, ruta=None, dt=None):
+        # Metadatos de un registro (o de todos) sin abrir las muestras. Solo se consulta
+        # el índice: si esta versión del archivo (ruta, tamaño, fecha) nunca se convirtió,
+        # no tiene hash recordado y se devuelve None sin leer el archivo completo.
+        registros = self.indice()["registros"]
+        if ruta is None:
+            return dict(registros)
+        hash_registro = self.indice()["archivos"].get(self._firma(ruta))
+        if hash_registro is None:
+            return None
+        return registros.get(self._clave(hash_registro, self._dt(ruta, dt)))
+
+    # --- datos ---
+
+    def cargar(self, ruta, dt=None):
+        # Devuelve (aceleraciones, metadatos); las aceleraciones son un np.memmap de solo lectura
+        clave, dt = self.clave(ruta, dt)
+        meta = self.indice()["registros"].get(clave)
+        archivo = os.path.join(self.directorio, clave + ".bin")
+        if meta is None or not os.path.exists(archivo):
+            meta = self._convertir(ruta, dt, clave, archivo)
+        if meta["npts"] == 0:
+            return np.zeros(0, dtype=self.dtype), meta
+        return np.memmap(archivo, dtype=self.dtype, mode="r", shape=(meta["npts"],)), meta
+
+    def cargar_suite(self, rutas, dt=None):
+        return [self.cargar(ruta, dt) for ruta in rutas]
+
+    def _convertir(self, ruta, dt, clave, archivo):
+        npts = 0
+        pga = 0.0
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".bin")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                for bloque in iterar_valores(ruta):
+                    valores = np.frombuffer(bloque, dtype=np.float64)
+                    pga = max(pga, float(np.abs(valores).max()))
+                    f.write(valores.astype(self.dtype, copy=False).tobytes())
+                    npts += valores.size
+            if es_at2(ruta):
+                npts_encabezado, _ = leer_encabezado_at2(ruta)
+                if npts_encabezado != npts:
+                    raise ValueError(f"{ruta}: el encabezado indica {npts_encabezado} puntos pero se leyeron {npts}")
+            os.replace(temporal, archivo)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+
+        meta = {
+            "ruta": os.path.abspath(ruta),
+            "hash": clave.split("_")[0],
+            "dt": dt,
+            "npts": npts,
+            "duracion": npts * dt,
+            "pga": pga,
+            "dtype": self.dtype.name,
+            "archivo": os.path.basename(archivo),
+        }
+        self.indice()["registros"][clave] = meta
+        self._guardar_indice()
+        return meta
@@ -0,0 +1,88 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+import motor_diseno
+
+# Registro tipado de resultados de diseño y verificación, en precisión completa.
+# Cada campo es un escalar (un aislador) o un arreglo de NumPy (muchos aisladores, con la
+# forma de las entradas del motor). La interfaz solo da formato a estos valores para
+# mostrarlos; la verificación, la histéresis y las exportaciones leen el registro directamente.
+
+# Tipos de los campos: escalar o arreglo por aislador
+Cantidad = float | np.ndarray
+Entero = int | np.ndarray
+Booleano = bool | np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class ResultadoDiseno:
+    # Entradas
+    carga_kN: Cantidad
+    desplazamiento_max_mm: Cantidad
+    S1: Cantidad
+    SDS: Cantidad
+    SD1: Cantidad
+    TL: Cantidad
+    # Geometría
+    diametro: Cantidad
+    area_total: Cantidad
+    espesor_capa: Cantidad
+    num_capas: Entero
+    altura_caucho: Cantidad
+    altura_total: Cantidad
+    relacion_nucleo: Cantidad
+    diametro_nucleo: Cantidad
+    # Propiedades mecánicas y respuesta
+    fuerza_fluencia: Cantidad
+    rigidez_horizontal: Cantidad
+    rigidez_vertical: Cantidad
+    rigidez_efectiva: Cantidad
+    periodo_aislado: Cantidad
+    desplazamiento_total: Cantidad
+    coef_amortiguamiento: Cantidad
+    BD: Cantidad
+    # Verificaciones ASCE 7
+    esfuerzo_actual: Cantidad
+    deformacion_por_capa: Cantidad
+    relacion_altura_diametro: Cantidad
+    cumple_esfuerzo: Booleano
+    cumple_deformacion: Booleano
+    cumple_estabilidad: Booleano
+    cumple_volteo: Booleano
+    cumple_amortiguamiento: Booleano
+    cumple_general: Booleano
+
+    @classmethod
+    def campos(cls):
+        return tuple(f.name for f in fields(cls))
+
+    @classmethod
+    def desde_valores(cls, valores):
+        # Desde cualquier mapeo que tenga todos los campos (p. ej. los valores del grafo de diseño)
+        return cls(**{nombre: valores[nombre] for nombre in cls.campos()})
+
+    @classmethod
+    def desde_diseno(cls, diseno, verificacion=None):
+        # Desde el diccionario de motor_diseno.disenar_aisladores (verificación opcional)
+        verificacion = motor_diseno.verificar_aisladores(diseno) if verificacion is None else verificacion
+        return cls.desde_valores({**diseno, **verificacion})
+
+    @property
+    def carga_ton(self):
+        return self.carga_kN / motor_diseno.GRAVEDAD
+
+    def __len__(self):
+        return int(np.size(self.diametro))
+
+    def aislador(self, i):
+        # Registro de un solo aislador (escalares de Python) de un registro por lotes
+        return ResultadoDiseno(**{nombre: np.asarray(getattr(self, nombre)).ravel()[i].item()
+                                  for nombre in self.campos()})
+
+    def como_dict(self):
+        return {nombre: getattr(self, nombre) for nombre in self.campos()}
+
+    def parametros_bilineales(self):
+        # (masa, K1, K2, Fy) del modelo bilineal, como motor_diseno.parametros_bilineales
+        return motor_diseno.parametros_bilineales(self.como_dict())
@@ -0,0 +1,121 @@
+import unittest
+
+import numpy as np
+
+import motor_diseno
+
+# Pruebas de regresión del motor de diseño (python -m unittest o python -m pytest).
+# Los diseños fijados se comprobaron a mano con las fórmulas de ASCE 7-16:
+#   K_h = G·A/T_r (kN/m), K2 = K_h, K1 = K2/0.1, Qd = σ_y,plomo·A_plomo,
+#   K_eff = K2 + Qd/D, β = 2·Qd·(D − Dy)/(π·K_eff·D²), B_D de la Tabla 17.7-1,
+#   T = 2π·√(W/(g·K_eff)), D = g·SD1·T/(4π²·B_D).
+# Ejemplo 1 (200 t, 250 mm, SD1 = 0.6): Ø500 mm, 32 capas de 15.625 mm (T_r = 500 mm),
+# A = 196 350 mm², K_h = 314.16 kN/m, K1 = 3141.6 kN/m, Qd = 392.70 kN, Dy = 138.9 mm;
+# en D = 198.39 mm: K_eff = 2293.6 kN/m, β = 16.48 %, B_D = 1.2 + 0.3·0.648 = 1.394,
+# T = 1.855 s y g·0.6·1.855/(4π²·1.394) = 198.39 mm.
+
+# (carga_ton, desplazamiento_max_mm, S1, SDS, SD1, TL) -> valores esperados
+DISENOS = [
+    ((200.0, 250.0, 0.6, 1.0, 0.6, 8.0),
+     {"diametro": 500.0, "num_capas": 32, "rigidez_horizontal": 314.15926535897927,
+      "rigidez_vertical": 120637.15789784807, "fuerza_fluencia": 392.6990816987241,
+      "periodo_aislado": 1.8554075651359432, "desplazamiento_total": 198.3923960215947,
+      "coef_amortiguamiento": 16.47864284813933, "BD": 1.39435928544418}),
+    ((80.0, 150.0, 0.9, 1.5, 0.9, 8.0),
+     {"diametro": 350.0, "num_capas": 28, "rigidez_horizontal": 251.32741228718345,
+      "rigidez_vertical": 96509.72631827845, "fuerza_fluencia": 192.42255003237483,
+      "periodo_aislado": 1.6727284567658833, "desplazamiento_total": 219.3036091517081,
+      "coef_amortiguamiento": 30.290661802706737, "BD": 1.7058132360541347}),
+    ((600.0, 400.0, 0.4, 0.8, 0.4, 8.0),
+     {"diametro": 850.0, "num_capas": 31, "rigidez_horizontal": 551.2988398557573,
+      "rigidez_vertical": 211698.7545046108, "fuerza_fluencia": 1134.9003461093127,
+      "periodo_aislado": 2.1255364390791365, "desplazamiento_total": 241.898997969628,
+      "coef_amortiguamiento": 3.1007127153964107, "BD": 0.8733808476930941}),
+]
+TOLERANCIA = 1e-6  # relativa; la iteración converge a 1e-6 en el desplazamiento
+
+
+class PruebaCoeficienteAmortiguamiento(unittest.TestCase):
+    def test_puntos_de_la_tabla(self):
+        np.testing.assert_allclose(motor_diseno.coeficiente_amortiguamiento([2, 5, 10, 20, 30, 40, 50]),
+                                   [0.8, 1.0, 1.2, 1.5, 1.7, 1.9, 2.0])
+
+    def test_interpolacion_y_extremos(self):
+        np.testing.assert_allclose(motor_diseno.coeficiente_amortiguamiento([15, 25, 1, 60]),
+                                   [1.35, 1.6, 0.8, 2.0])
+
+
+class PruebaPropiedades(unittest.TestCase):
+    def test_rigideces_en_kN_m(self):
+        # Ø500, T_r = 500 mm, S = 8: K_h = 0.8·π·250²/500, K_v = 6·0.8·8²·π·250²/500
+        area = np.pi * 250.0**2
+        K_h, K_v = motor_diseno.calcular_rigideces(area, 500.0, relacion_forma=8.0)
+        self.assertAlmostEqual(K_h, 0.8 * area / 500.0)
+        self.assertAlmostEqual(K_h, 314.159265, places=5)
+        self.assertAlmostEqual(K_v, 6 * 0.8 * 64 * area / 500.0)
+
+    def test_parametros_bilineales(self):
+        diseno = motor_diseno.disenar_aisladores(*DISENOS[0][0])
+        masa, K1, K2, Fy = motor_diseno.parametros_bilineales(diseno)
+        self.assertAlmostEqual(masa, 200.0)  # t
+        self.assertAlmostEqual(K2, diseno["rigidez_horizontal"])
+        self.assertAlmostEqual(K1, diseno["rigidez_horizontal"] / 0.1)
+        self.assertAlmostEqual(Fy, diseno["fuerza_fluencia"] / 0.9)
+
+
+class PruebaDisenos(unittest.TestCase):
+    def test_disenos_fijados(self):
+        for entradas, esperado in DISENOS:
+            diseno = motor_diseno.disenar_aisladores(*entradas)
+            for clave, valor in esperado.items():
+                with self.subTest(entradas=entradas, clave=clave):
+                    np.testing.assert_allclose(diseno[clave], valor, rtol=TOLERANCIA)
+
+    def test_ejemplo_a_mano(self):
+        # Ejemplo 1 del encabezado, recalculado con las fórmulas en lugar de los valores fijados
+        diseno = motor_diseno.disenar_aisladores(*DISENOS[0][0])
+        W = 200.0 * motor_diseno.GRAVEDAD
+        K2 = diseno["rigidez_horizontal"]
+        K1 = K2 / 0.1
+        Qd = diseno["fuerza_fluencia"]
+        D = diseno["desplazamiento_total"] / 1000
+        Dy = Qd / (K1 - K2)
+        K_eff = K2 + Qd / D
+        beta = 2 * Qd * (D - Dy) / (np.pi * K_eff * D**2) * 100
+        B_D = 1.2 + (1.5 - 1.2) * (beta - 10) / (20 - 10)
+        T = 2 * np.pi * np.sqrt(W / (motor_diseno.GRAVEDAD * K_eff))
+        np.testing.assert_allclose(diseno["rigidez_efectiva"], K_eff, rtol=1e-12)
+        np.testing.assert_allclose(diseno["coef_amortiguamiento"], beta, rtol=1e-12)
+        np.testing.assert_allclose(diseno["BD"], B_D, rtol=1e-12)
+        np.testing.assert_allclose(diseno["periodo_aislado"], T, rtol=1e-12)
+        np.testing.assert_allclose(motor_diseno.GRAVEDAD * 0.6 * T / (4 * np.pi**2 * B_D), D, rtol=TOLERANCIA)
+
+
+class PruebaPuntoFijo(unittest.TestCase):
+    def test_desplazamiento_consistente_con_periodo_y_BD(self):
+        # En un lote amplio, D recalculado con T y B_D devueltos coincide con D
+        rng = np.random.default_rng(7)
+        n = 500
+        diseno = motor_diseno.disenar_aisladores(rng.uniform(30, 1000, n), rng.uniform(100, 500, n),
+                                                 rng.uniform(0.2, 1.2, n), 1.0, rng.uniform(0.2, 1.2, n), 8.0)
+        self.assertTrue(np.all(diseno["residuo"] <= motor_diseno.TOLERANCIA_ITERACION))
+        D = motor_diseno.calcular_desplazamiento_total(diseno["SD1"], diseno["periodo_aislado"], diseno["BD"])
+        np.testing.assert_allclose(D, diseno["desplazamiento_total"], rtol=10 * motor_diseno.TOLERANCIA_ITERACION)
+        # T y B_D son los del modelo bilineal en el D devuelto
+        _, beta, T = motor_diseno.propiedades_efectivas(
+            diseno["carga_kN"], diseno["rigidez_horizontal"] / motor_diseno.RELACION_POST_FLUENCIA,
+            diseno["rigidez_horizontal"], diseno["fuerza_fluencia"], diseno["desplazamiento_total"] / 1000)
+        np.testing.assert_allclose(T, diseno["periodo_aislado"], rtol=1e-12)
+        np.testing.assert_allclose(motor_diseno.coeficiente_amortiguamiento(beta), diseno["BD"], rtol=1e-12)
+
+    def test_arranque_desde_un_resultado_previo(self):
+        diseno = motor_diseno.disenar_aisladores(*DISENOS[1][0])
+        efectivo = motor_diseno.resolver_periodo_lrb(diseno["carga_kN"], diseno["rigidez_horizontal"],
+                                                     diseno["fuerza_fluencia"], diseno["SD1"],
+                                                     diseno["desplazamiento_total"])
+        self.assertLessEqual(int(efectivo["iteraciones"]), 2)
+        np.testing.assert_allclose(efectivo["desplazamiento"], diseno["desplazamiento_total"], rtol=TOLERANCIA)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Ejecución de trabajos del motor fuera del hilo de la interfaz.
+# Los trabajos corren en un grupo de hilos (NumPy libera el GIL en los cálculos pesados)
+# y nunca tocan Tk: sus resultados, errores y avances se encolan y el hilo principal los
+# recoge con un sondeo periódico programado con root.after.
+# Los trabajos se agrupan por tipo ("diseno", "grafico", ...): mientras uno está en curso,
+# un envío nuevo del mismo tipo cancela al actual y queda en espera reemplazando a cualquier
+# otro que estuviera esperando, de modo que solo se calcula el último juego de entradas.
+
+INTERVALO_SONDEO_MS = 50
+TRABAJADORES = 2
+
+
+class TrabajoCancelado(Exception):
+    pass
+
+
+class Trabajo:
+    def __init__(self, tipo, funcion, al_terminar=None, al_error=None, descripcion=""):
+        self.tipo = tipo
+        self.funcion = funcion
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        self.descripcion = descripcion or tipo
+        self.progreso = None  # fracción 0-1, o None si el trabajo no informa avance
+        self._cancelado = threading.Event()
+        self._cola = None
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    def comprobar(self):
+        # Punto de cancelación cooperativa: los trabajos largos lo llaman entre etapas
+        if self._cancelado.is_set():
+            raise TrabajoCancelado()
+
+    def informar(self, fraccion):
+        # Avance desde el hilo de trabajo (también es un punto de cancelación)
+        self.comprobar()
+        self._cola.put((self, "progreso", float(fraccion)))
+
+
+class EjecutorTrabajos:
+    def __init__(self, programar, trabajadores=TRABAJADORES, al_cambiar_estado=None):
+        # programar: función con la firma de root.after(ms, funcion)
+        # al_cambiar_estado(trabajos_en_curso): se llama en el hilo principal
+        self._programar = programar
+        self._grupo = ThreadPoolExecutor(trabajadores, thread_name_prefix="trabajo")
+        self._cola = queue.Queue()
+        self._en_curso = {}
+        self._en_espera = {}
+        self._sondeo_programado = False
+        self.al_cambiar_estado = al_cambiar_estado
+
+    def enviar(self, tipo, funcion, al_terminar=None, al_error=None, descripcion=""):
+        # funcion(trabajo) corre en un hilo de trabajo; al_terminar(resultado) y
+        # al_error(excepcion) se llaman en el hilo principal
+        trabajo = Trabajo(tipo, funcion, al_terminar, al_error, descripcion)
+        trabajo._cola = self._cola
+        anterior = self._en_curso.get(tipo)
+        if anterior is None:
+            self._iniciar(trabajo)
+        else:
+            anterior.cancelar()
+            self._en_espera[tipo] = trabajo
+        self._notificar()
+        return trabajo
+
+    def cancelar(self, tipo=None):
+        for tipos in (self._en_curso, self._en_espera):
+            for t in [t for t in tipos if tipo is None or t == tipo]:
+                tipos[t].cancelar()
+        if tipo is None:
+            self._en_espera.clear()
+        else:
+            self._en_espera.pop(tipo, None)
+        self._notificar()
+
+    def en_curso(self):
+        return list(self._en_curso.values())
+
+    def cerrar(self):
+        self.cancelar()
+        self._grupo.shutdown(wait=False, cancel_futures=True)
+
+    def _iniciar(self, trabajo):
+        self._en_curso[trabajo.tipo] = trabajo
+        self._grupo.submit(self._ejecutar, trabajo)
+        if not self._sondeo_programado:
+            self._sondeo_programado = True
+            self._programar(INTERVALO_SONDEO_MS, self._sondear)
+
+    def _ejecutar(self, trabajo):
+        # Hilo de trabajo
+        try:
+            trabajo.comprobar()
+            self._cola.put((trabajo, "resultado", trabajo.funcion(trabajo)))
+        except TrabajoCancelado:
+            self._cola.put((trabajo, "cancelado", None))
+        except Exception as e:
+            self._cola.put((trabajo, "error", e))
+
+    def _sondear(self):
+        # Hilo principal: entrega resultados y arranca el trabajo en espera de cada tipo
+        self._sondeo_programado = False
+        while True:
+            try:
+                trabajo, evento, dato = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if evento == "progreso":
+                trabajo.progreso = dato
+                continue
+            del self._en_curso[trabajo.tipo]
+            if not trabajo.cancelado:
+                if evento == "resultado" and trabajo.al_terminar is not None:
+                    trabajo.al_terminar(dato)
+                elif evento == "error" and trabajo.al_error is not None:
+                    trabajo.al_error(dato)
+            siguiente = self._en_espera.pop(trabajo.tipo, None)
+            if siguiente is not None:
+                self._iniciar(siguiente)
+        if self._en_curso and not self._sondeo_programado:
+            self._sondeo_programado = True
+            self._programar(INTERVALO_SONDEO_MS, self._sondear)
+        self._notificar()
+
+    def _notificar(self):
+        if self.al_cambiar_estado is not None:
+            self.al_cambiar_estado(self.en_curso())